@@ -5,6 +5,7 @@ ARQV30 Enhanced v3.0 - Analysis Route
 Rota de análise atualizada para nova metodologia
 """
 
+import asyncio
 import logging
 import time
 import uuid
@@ -12,10 +13,27 @@ import random
 from datetime import datetime
 from flask import Blueprint, request, jsonify
 
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
 logger = logging.getLogger(__name__)
 
 analysis_bp = Blueprint('analysis', __name__)
 
+def _run_async(coro):
+    """Executa a corrotina até o fim num loop próprio (uvloop quando disponível).
+
+    Um loop por requisição de propósito: os serviços de análise ainda fazem chamadas
+    bloqueantes (LLM, requests), e um loop compartilhado enfileiraria as requisições
+    de todo o processo umas atrás das outras.
+    """
+    if HAS_UVLOOP:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
 # Lazy import functions to avoid blocking at module import time
 def get_master_analysis_orchestrator():
     from services.master_analysis_orchestrator import master_analysis_orchestrator
@@ -115,55 +133,37 @@ def execute_complete_analysis():
         logger.info(f"🎯 Segmento: {segmento} | Produto: {produto}")
 
         # Executa análise com novo sistema aprimorado
-        def execute_enhanced_analysis():
+        async def _execute_enhanced_analysis_async():
             try:
-                import asyncio
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
-                try:
-                    # ETAPA 1: Busca massiva real
-                    progress_callback(1, "🌊 Executando busca massiva real...")
-                    search_results = loop.run_until_complete(
-                        real_search_orchestrator.execute_massive_real_search(
-                            query=query,
-                            context=context,
-                            session_id=session_id
-                        )
-                    )
-                    
-                    # ETAPA 2: Análise de conteúdo viral
-                    progress_callback(2, "🔥 Analisando conteúdo viral...")
-                    viral_analysis = loop.run_until_complete(
-                        viral_content_analyzer.analyze_and_capture_viral_content(
-                            search_results=search_results,
-                            session_id=session_id
-                        )
-                    )
-                    
-                    # ETAPA 3: Síntese com IA ativa
-                    progress_callback(3, "🧠 Executando síntese com IA...")
-                    synthesis_result = loop.run_until_complete(
-                        enhanced_synthesis_engine.execute_enhanced_synthesis(session_id)
-                    )
-
-                    # ETAPA 3.5: Análise Preditiva Ultra-Avançada
-                    progress_callback(3.5, "🔮 Executando análise preditiva ultra-avançada...")
-                    predictive_engine = PredictiveAnalyticsEngine()
-                    predictive_insights = loop.run_until_complete(
-                        predictive_engine.analyze_session_data(session_id)
-                    )
-
-                    # ETAPA 4: Geração de módulos
-                    progress_callback(4, "📝 Gerando 16 módulos...")
-                    from services.enhanced_module_processor import enhanced_module_processor
-                    modules_result = loop.run_until_complete(
-                        enhanced_module_processor.generate_all_modules(session_id)
-                    )
-                    
-                finally:
-                    loop.close()
-                
+                # ETAPA 1: Busca massiva real
+                progress_callback(1, "🌊 Executando busca massiva real...")
+                search_results = await real_search_orchestrator.execute_massive_real_search(
+                    query=query,
+                    context=context,
+                    session_id=session_id
+                )
+
+                # ETAPA 2: Análise de conteúdo viral
+                progress_callback(2, "🔥 Analisando conteúdo viral...")
+                viral_analysis = await viral_content_analyzer.analyze_and_capture_viral_content(
+                    search_results=search_results,
+                    session_id=session_id
+                )
+
+                # ETAPA 3: Síntese com IA ativa
+                progress_callback(3, "🧠 Executando síntese com IA...")
+                synthesis_result = await enhanced_synthesis_engine.execute_enhanced_synthesis(session_id)
+
+                # ETAPA 3.5: Análise Preditiva Ultra-Avançada
+                progress_callback(3.5, "🔮 Executando análise preditiva ultra-avançada...")
+                predictive_engine = PredictiveAnalyticsEngine()
+                predictive_insights = await predictive_engine.analyze_session_data(session_id)
+
+                # ETAPA 4: Geração de módulos
+                progress_callback(4, "📝 Gerando 16 módulos...")
+                from services.enhanced_module_processor import enhanced_module_processor
+                modules_result = await enhanced_module_processor.generate_all_modules(session_id)
+
                 return {
                     "success": True,
                     "search_results": search_results,
@@ -173,16 +173,16 @@ def execute_complete_analysis():
                     "modules_result": modules_result,
                     "phases_completed": ["busca_massiva", "analise_viral", "sintese_ia", "analise_preditiva", "geracao_modulos"]
                 }
-                
+
             except Exception as e:
                 logger.error(f"❌ Erro na análise aprimorada: {e}")
                 return {
                     "success": False,
                     "error": str(e)
                 }
-        
-        # Executa análise
-        analysis_results = execute_enhanced_analysis()
+
+        # Executa análise (um único loop para todas as etapas)
+        analysis_results = _run_async(_execute_enhanced_analysis_async())
 
         # Finaliza progress tracker
         progress_tracker.complete_session(session_id)
@@ -352,19 +352,13 @@ def start_collection():
         from services.massive_data_collector import massive_data_collector
         
         # Executa coleta de forma assíncrona
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            result = loop.run_until_complete(
-                massive_data_collector.execute_massive_collection(
-                    query=data.get('query', data.get('segmento', 'análise de mercado')),
-                    context=data,
-                    session_id=session_id
-                )
+        result = _run_async(
+            massive_data_collector.execute_massive_collection(
+                query=data.get('query', data.get('segmento', 'análise de mercado')),
+                context=data,
+                session_id=session_id
             )
-        finally:
-            loop.close()
+        )
         
         return jsonify({
             "success": True,
@@ -396,15 +390,9 @@ def start_analysis():
         from services.ai_synthesis_engine import ai_synthesis_engine
         
         # Executa síntese
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            result = loop.run_until_complete(
-                ai_synthesis_engine.analyze_and_synthesize(session_id)
-            )
-        finally:
-            loop.close()
+        result = _run_async(
+            ai_synthesis_engine.analyze_and_synthesize(session_id)
+        )
         
         return jsonify({
             "success": True,
@@ -437,15 +425,9 @@ def start_generation():
         from services.comprehensive_report_generator_v3 import comprehensive_report_generator_v3
         
         # Executa geração de módulos
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            modules_result = loop.run_until_complete(
-                enhanced_module_processor.generate_all_modules(session_id)
-            )
-        finally:
-            loop.close()
+        modules_result = _run_async(
+            enhanced_module_processor.generate_all_modules(session_id)
+        )
         
         # Compila relatório final
         final_report = comprehensive_report_generator_v3.compile_final_markdown_report(session_id)
@@ -513,15 +495,9 @@ def analyze_data_endpoint():
         from services.ai_synthesis_engine import ai_synthesis_engine
         
         # Executa síntese com IA
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            result = loop.run_until_complete(
-                ai_synthesis_engine.analyze_and_synthesize(session_id)
-            )
-        finally:
-            loop.close()
+        result = _run_async(
+            ai_synthesis_engine.analyze_and_synthesize(session_id)
+        )
 
         return jsonify({
             "success": True,
@@ -622,15 +598,9 @@ def generate_report_endpoint():
         from services.comprehensive_report_generator_v3 import comprehensive_report_generator_v3
 
         # Executa geração de módulos de forma assíncrona
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            modules_result = loop.run_until_complete(
-                enhanced_module_processor.generate_all_modules(session_id)
-            )
-        finally:
-            loop.close()
+        modules_result = _run_async(
+            enhanced_module_processor.generate_all_modules(session_id)
+        )
         
         # Compila relatório final
         final_report = comprehensive_report_generator_v3.compile_final_markdown_report(session_id)
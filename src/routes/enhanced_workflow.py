@@ -7,53 +7,355 @@ Rotas para o workflow aprimorado em 3 etapas
 """
 
 import logging
+import socket
 import time
 import uuid
 import asyncio
+import importlib
 import os
-import glob
 import json
+import struct
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List
-from flask import Blueprint, request, jsonify, send_file
+from itertools import islice
+from typing import Dict, Any, List, Callable
+from flask import Blueprint, request, send_file, Response
 import threading
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
+
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
 # Import dos serviços necessários
 # services.auto_save_manager será importado diretamente para evitar circular imports
 
-def get_services():
-    """Lazy loading dos serviços para evitar problemas de inicialização"""
-    try:
-        from services.real_search_orchestrator import real_search_orchestrator
-        from services.massive_search_engine import massive_search_engine
-        from services.viral_content_analyzer import viral_content_analyzer
-        from services.enhanced_synthesis_engine import enhanced_synthesis_engine
-        from services.enhanced_module_processor import enhanced_module_processor
-        from services.comprehensive_report_generator_v3 import comprehensive_report_generator_v3
-        from services.viral_report_generator import ViralReportGenerator
-
-        return {
-            'real_search_orchestrator': real_search_orchestrator,
-            'massive_search_engine': massive_search_engine,
-            'viral_content_analyzer': viral_content_analyzer,
-            'enhanced_synthesis_engine': enhanced_synthesis_engine,
-            'enhanced_module_processor': enhanced_module_processor,
-            'comprehensive_report_generator_v3': comprehensive_report_generator_v3,
-            'ViralReportGenerator': ViralReportGenerator
-        }
-    except ImportError as e:
-        logger.error(f"❌ Erro ao importar serviços: {e}")
-        return None
+class _LazyService:
+    """Proxy que importa o serviço apenas no primeiro acesso (evita custo e ciclos de import)"""
+
+    __slots__ = ('_module_name', '_attr_name', '_target')
+
+    def __init__(self, module_name: str, attr_name: str):
+        self._module_name = module_name
+        self._attr_name = attr_name
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            self._target = getattr(importlib.import_module(self._module_name), self._attr_name)
+        return self._target
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+real_search_orchestrator = _LazyService('services.real_search_orchestrator', 'real_search_orchestrator')
+massive_search_engine = _LazyService('services.massive_search_engine', 'massive_search_engine')
+viral_content_analyzer = _LazyService('services.viral_content_analyzer', 'viral_content_analyzer')
+enhanced_synthesis_engine = _LazyService('services.enhanced_synthesis_engine', 'enhanced_synthesis_engine')
+enhanced_module_processor = _LazyService('services.enhanced_module_processor', 'enhanced_module_processor')
+comprehensive_report_generator_v3 = _LazyService('services.comprehensive_report_generator_v3', 'comprehensive_report_generator_v3')
+ViralReportGenerator = _LazyService('services.viral_report_generator', 'ViralReportGenerator')
 
 logger = logging.getLogger(__name__)
 
 enhanced_workflow_bp = Blueprint('enhanced_workflow', __name__)
 
+def _json_response(obj: Any, status: int = 200) -> Response:
+    """Resposta JSON serializada com orjson (fallback para json da stdlib)"""
+    if HAS_ORJSON:
+        body = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        body = json.dumps(obj, ensure_ascii=False)
+    return Response(body, status=status, mimetype='application/json')
+
+def _accepted_response(payload: Dict[str, Any], session_id: str) -> Response:
+    """Resposta 202 para etapas agendadas, apontando o endpoint de status no Location"""
+    response = _json_response(payload, 202)
+    response.headers['Location'] = payload.get("status_endpoint", f"/api/workflow/status/{session_id}")
+    response.headers['X-Session-Id'] = session_id
+    return response
+
+def _load_json_file(file_path: str) -> Any:
+    """Lê um arquivo JSON em modo binário e decodifica com orjson quando disponível"""
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+# Pool de I/O compartilhado para leitura de muitos JSONs pequenos (tarefas folha, nunca aninhadas)
+_IO_POOL = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4), thread_name_prefix="workflow-io")
+
+def _load_json_files(paths: List[str]) -> List[tuple]:
+    """Lê vários JSONs em paralelo; devolve (caminho, dados, erro) na ordem de entrada"""
+    def _safe_load(path):
+        try:
+            return path, _load_json_file(path), None
+        except Exception as e:
+            return path, None, e
+    return list(_IO_POOL.map(_safe_load, paths))
+
 # Instância global do AutoSaveManager para evitar circular imports e garantir consistência
-from services.auto_save_manager import AutoSaveManager
+from services.auto_save_manager import (
+    AutoSaveManager, aguardar_gravacoes, carregar_snapshot, expandir_snapshot, _FRAME_HEADER
+)
 auto_save_manager_instance = AutoSaveManager()
 salvar_etapa = auto_save_manager_instance.salvar_etapa
 
+# Snapshots binários das etapas: frames msgpack com prefixo de tamanho (>I).
+# Sem enc_hook: tipos que o msgpack não conhece falham e a etapa segue pelo JSON
+if HAS_MSGSPEC:
+    _ENC = msgspec.msgpack.Encoder()
+
+# Etapas em segundo plano: cada uma roda num loop próprio, numa thread de um pool limitado.
+# Os serviços ainda fazem chamadas bloqueantes (LLM, requests), então um loop único
+# serializaria todas as sessões. As threads do pool não são daemon: o processo aguarda
+# as etapas em andamento antes de encerrar.
+_MAX_ETAPAS_SIMULTANEAS = int(os.getenv('WORKFLOW_MAX_CONCURRENT_STAGES', '8'))
+_STAGE_POOL = ThreadPoolExecutor(max_workers=_MAX_ETAPAS_SIMULTANEAS, thread_name_prefix="enhanced-workflow-stage")
+
+def _run_stage(coro):
+    """Executa a corrotina da etapa num loop novo da thread atual (uvloop quando disponível)"""
+    if HAS_UVLOOP:
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    return asyncio.run(coro)
+
+# Tarefas em andamento por sessão neste processo
+_tarefas_ativas: Dict[str, set] = {}
+_tarefas_ativas_lock = threading.Lock()
+
+# Marcador em disco de etapa em execução (um por sessão e processo). Se o worker morre
+# (SIGTERM, OOM, reinício) o marcador fica para trás e o status registra a interrupção
+_HOST = socket.gethostname()
+_MARCADOR_TTL = int(os.getenv('WORKFLOW_STAGE_MAX_SECONDS', str(3 * 3600)))
+
+def _marcador_path(session_id: str) -> str:
+    return os.path.join("analyses_data", session_id, f"workflow_em_execucao_{_HOST}_{os.getpid()}.json")
+
+def _gravar_marcador(session_id: str) -> None:
+    path = _marcador_path(session_id)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"host": _HOST, "pid": os.getpid(), "inicio": datetime.now().isoformat()}, f)
+    except OSError as e:
+        logger.warning(f"⚠️ Não foi possível gravar marcador de execução - Sessão: {session_id}: {e}")
+
+def _remover_marcador(session_id: str) -> None:
+    try:
+        os.remove(_marcador_path(session_id))
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"⚠️ Não foi possível remover marcador de execução - Sessão: {session_id}: {e}")
+
+def _processo_vivo(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _marcador_abandonado(path: str) -> bool:
+    """Marcador de processo morto neste host, ou de outro host e mais velho que o limite da etapa"""
+    try:
+        marcador = _load_json_file(path)
+        if marcador.get("host") == _HOST:
+            return not _processo_vivo(int(marcador.get("pid", 0)))
+        return time.time() - os.path.getmtime(path) > _MARCADOR_TTL
+    except (OSError, ValueError, TypeError, AttributeError):
+        return False
+
+def _verificar_interrupcao(session_id: str) -> bool:
+    """Registra workflow_erro se algum marcador de execução da sessão ficou abandonado"""
+    session_dir = os.path.join("analyses_data", session_id)
+    try:
+        with os.scandir(session_dir) as entries:
+            abandonados = [entry.path for entry in entries
+                           if entry.name.startswith("workflow_em_execucao_") and _marcador_abandonado(entry.path)]
+    except FileNotFoundError:
+        return False
+    if not abandonados:
+        return False
+    for path in abandonados:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # Outro worker já registrou esta interrupção
+            return False
+    salvar_etapa("workflow_erro", {
+        "session_id": session_id,
+        "error": "Processo encerrado antes da conclusão do workflow",
+        "timestamp": datetime.now().isoformat()
+    }, categoria="workflow", session_id=session_id)
+    logger.warning(f"⚠️ Workflow interrompido pelo encerramento do processo - Sessão: {session_id}")
+    return True
+
+def _submit_workflow_task(coro, session_id: str):
+    """Agenda uma corrotina de etapa no pool de etapas sem bloquear a requisição"""
+    with _tarefas_ativas_lock:
+        # Uma sessão pode ter mais de uma etapa em andamento ao mesmo tempo
+        tarefas = _tarefas_ativas.setdefault(session_id, set())
+        if not tarefas:
+            _gravar_marcador(session_id)
+        future = _STAGE_POOL.submit(_run_stage, coro)
+        tarefas.add(future)
+
+    def _on_done(fut):
+        with _tarefas_ativas_lock:
+            tarefas = _tarefas_ativas.get(session_id)
+            if tarefas is not None:
+                tarefas.discard(fut)
+                if not tarefas:
+                    del _tarefas_ativas[session_id]
+                    _remover_marcador(session_id)
+        if not fut.cancelled() and fut.exception() is not None:
+            logger.error(f"❌ Tarefa do workflow falhou - Sessão: {session_id}: {fut.exception()}")
+
+    future.add_done_callback(_on_done)
+    return future
+
+def _etapa_bin_path(session_id: str, nome_etapa: str) -> str:
+    return os.path.join("analyses_data", session_id, f"{nome_etapa}.mpk")
+
+def salvar_etapa_bin(nome_etapa: str, dados: Dict[str, Any], session_id: str) -> str:
+    """Salva snapshot de etapa como frame msgpack; mantém registro JSON leve para compatibilidade"""
+    if not HAS_MSGSPEC:
+        return salvar_etapa(nome_etapa, dados, categoria="workflow", session_id=session_id)
+
+    try:
+        buf = _ENC.encode(dados)
+        path = _etapa_bin_path(session_id, nome_etapa)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(_FRAME_HEADER.pack(len(buf)))
+            f.write(buf)
+    except Exception as e:
+        logger.warning(f"⚠️ Falha ao salvar snapshot msgpack de {nome_etapa} ({e}), usando JSON")
+        return salvar_etapa(nome_etapa, dados, categoria="workflow", session_id=session_id)
+
+    salvar_etapa(nome_etapa, {
+        "session_id": session_id,
+        "snapshot": path,
+        "formato": "msgpack",
+        "tamanho_bytes": len(buf),
+        "timestamp": dados.get("timestamp") or datetime.now().isoformat()
+    }, categoria="workflow", session_id=session_id)
+    return path
+
+def carregar_etapa_bin(session_id: str, nome_etapa: str) -> Dict[str, Any]:
+    """Lê e decodifica o snapshot msgpack de uma etapa (dict vazio se ausente)"""
+    if not HAS_MSGSPEC:
+        return {}
+    try:
+        return carregar_snapshot(_etapa_bin_path(session_id, nome_etapa))
+    except (OSError, struct.error, msgspec.DecodeError):
+        return {}
+
+def _etapa_bin_concluida(session_id: str, *nomes_etapa: str) -> bool:
+    """Verifica pelo cabeçalho do frame se algum snapshot de etapa foi gravado por completo"""
+    for nome_etapa in nomes_etapa:
+        try:
+            with open(_etapa_bin_path(session_id, nome_etapa), 'rb') as f:
+                header = f.read(_FRAME_HEADER.size)
+                if len(header) == _FRAME_HEADER.size:
+                    (size,) = _FRAME_HEADER.unpack(header)
+                    if os.fstat(f.fileno()).st_size == _FRAME_HEADER.size + size:
+                        return True
+        except OSError:
+            continue
+    return False
+
+
+_QUERY_SUFFIX = " Brasil 2024 mercado"
+
+def _build_query(segmento: str, produto: str) -> str:
+    """Monta a query de pesquisa da Etapa 1 a partir de segmento e produto"""
+    return (f"{segmento} {produto}" if produto else segmento) + _QUERY_SUFFIX
+
+# Limite global de buscas massivas simultâneas no processo (back-pressure entre sessões).
+# Semáforo de threads: cada etapa tem seu próprio loop, e asyncio.Semaphore fica preso a um loop só.
+_SEARCH_CONCURRENCY = int(os.getenv('WORKFLOW_SEARCH_CONCURRENCY', '4'))
+_search_semaphore = threading.BoundedSemaphore(_SEARCH_CONCURRENCY)
+_SEARCH_POLL_INTERVAL = 0.05
+
+async def _com_limite_busca(coro):
+    """Aguarda uma vaga no semáforo de buscas antes de executar a corrotina"""
+    # Tentativa não bloqueante no próprio loop: se a tarefa for cancelada enquanto espera,
+    # nenhuma thread fica com a vaga presa
+    try:
+        while not _search_semaphore.acquire(blocking=False):
+            await asyncio.sleep(_SEARCH_POLL_INTERVAL)
+    except BaseException:
+        # A corrotina nunca será aguardada
+        coro.close()
+        raise
+    try:
+        return await coro
+    finally:
+        _search_semaphore.release()
+
+async def _executar_buscas_etapa1(query: str, context: Dict[str, Any], session_id: str):
+    """Executa em paralelo a busca real e a busca massiva da Etapa 1 (independentes entre si).
+
+    Retorna (search_results, massive_results, erros); uma busca que falha mantém o valor vazio.
+    """
+    search_results = {'web_results': [], 'social_results': [], 'youtube_results': []}
+    massive_results = {}
+
+    if hasattr(real_search_orchestrator, 'execute_massive_real_search'):
+        real_search = real_search_orchestrator.execute_massive_real_search(
+            query=query,
+            context=context,
+            session_id=session_id
+        )
+    else:
+        logger.error("❌ Método execute_massive_real_search não encontrado")
+        real_search = asyncio.sleep(0, result=search_results)
+
+    massive_search = massive_search_engine.execute_massive_search(
+        produto=context.get('segmento', context.get('produto', query)),
+        publico_alvo=context.get('publico', context.get('publico_alvo', 'público brasileiro')),
+        session_id=session_id
+    )
+
+    real_result, massive_result = await asyncio.gather(
+        _com_limite_busca(real_search),
+        _com_limite_busca(massive_search),
+        return_exceptions=True
+    )
+
+    errors = []
+    if isinstance(real_result, BaseException):
+        logger.error(f"❌ Erro na busca massiva real - Sessão: {session_id}: {real_result}")
+        errors.append(real_result)
+    else:
+        search_results = real_result
+    if isinstance(massive_result, BaseException):
+        logger.error(f"❌ Erro na busca ALIBABA WebSailor - Sessão: {session_id}: {massive_result}")
+        errors.append(massive_result)
+    else:
+        massive_results = massive_result
+
+    return search_results, massive_results, errors
 
 @enhanced_workflow_bp.route('/workflow/step1/start', methods=['POST'])
 def start_step1_collection():
@@ -61,8 +363,9 @@ def start_step1_collection():
     try:
         data = request.get_json()
 
-        # Gera session_id único
-        session_id = f"session_{int(time.time() * 1000)}_{uuid.uuid4().hex[:8]}"
+        # Gera session_id único (mesma leitura do relógio usada no registro de início)
+        inicio = time.time()
+        session_id = f"session_{int(inicio * 1000)}_{uuid.uuid4().hex[:8]}"
 
         # Extrai parâmetros
         segmento = data.get('segmento', '').strip()
@@ -71,15 +374,10 @@ def start_step1_collection():
 
         # Validação
         if not segmento:
-            return jsonify({"error": "Segmento é obrigatório"}), 400
+            return _json_response({"error": "Segmento é obrigatório"}, 400)
 
         # Constrói query de pesquisa
-        query_parts = [segmento]
-        if produto:
-            query_parts.append(produto)
-        query_parts.extend(["Brasil", "2024", "mercado"])
-
-        query = " ".join(query_parts)
+        query = _build_query(segmento, produto)
 
         # Contexto da análise
         context = {
@@ -95,122 +393,93 @@ def start_step1_collection():
         logger.info(f"🔍 Query: {query}")
 
         # Salva início da etapa 1
+        _registrar_sessao(session_id)
         salvar_etapa("etapa1_iniciada", {
             "session_id": session_id,
             "query": query,
             "context": context,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.fromtimestamp(inicio).isoformat()
         }, categoria="workflow", session_id=session_id)
 
-        # Executa coleta massiva em thread separada
-        def execute_collection_thread():
-            logger.info(f"🚀 INICIANDO THREAD DE COLETA - Sessão: {session_id}")
+        # Executa coleta massiva em segundo plano
+        async def execute_collection():
+            logger.info(f"🚀 INICIANDO COLETA - Sessão: {session_id}")
             try:
-                # Carrega serviços de forma lazy
-                services = get_services()
-                if not services:
-                    logger.error("❌ Falha ao carregar serviços necessários")
-                    salvar_etapa("etapa1_erro", {
-                        "session_id": session_id,
-                        "error": "Falha ao carregar serviços",
-                        "timestamp": datetime.now().isoformat()
-                    }, categoria="workflow", session_id=session_id)
-                    return
-
-                async def async_collection_tasks():
-                    search_results = {'web_results': [], 'social_results': [], 'youtube_results': []}
-                    massive_results = {}
-                    viral_analysis = {}
-
-                    try:
-                        logger.info(f"🔍 Executando busca massiva - Sessão: {session_id}")
-                        real_search_orch = services['real_search_orchestrator']
-                        if hasattr(real_search_orch, 'execute_massive_real_search'):
-                            search_results = await real_search_orch.execute_massive_real_search(
-                                query=query,
-                                context=context,
-                                session_id=session_id
-                            )
-                        else:
-                            logger.error("❌ Método execute_massive_real_search não encontrado")
-                        logger.info(f"✅ Busca massiva concluída - Sessão: {session_id}")
-
-                        logger.info(f"🌐 Executando busca ALIBABA WebSailor - Sessão: {session_id}")
-                        massive_results = await services['massive_search_engine'].execute_massive_search(
-                            produto=context.get('segmento', context.get('produto', query)),
-                            publico_alvo=context.get('publico', context.get('publico_alvo', 'público brasileiro')),
-                            session_id=session_id
-                        )
-                        logger.info(f"✅ Busca ALIBABA WebSailor concluída - Sessão: {session_id}")
-
-                        logger.info(f"🔥 Analisando e capturando conteúdo viral - Sessão: {session_id}")
-                        viral_analysis = await services['viral_content_analyzer'].analyze_and_capture_viral_content(
-                            search_results=search_results,
-                            session_id=session_id,
-                            max_captures=15
-                        )
-                        logger.info(f"✅ Análise viral concluída - Sessão: {session_id}")
-
-                    except Exception as e:
-                        logger.error(f"❌ Erro durante as operações assíncronas da Etapa 1: {e}")
-                        # Continua mesmo com erro para tentar gerar o relatório com o que foi coletado
-
-                    # INTEGRAÇÃO DE DADOS VIRAIS
-                    logger.info("🔥 Integrando dados virais para segunda etapa...")
-                    try:
-                        from services.viral_integration_service import ViralIntegrationService
-                        viral_integration = ViralIntegrationService(session_id)
-                        integration_result = viral_integration.process_and_integrate()
-                        
-                        if integration_result.get("success"):
-                            logger.info(f"✅ Integração viral concluída: {integration_result['total_content_pieces']} peças processadas")
-                        else:
-                            logger.warning("⚠️ Integração viral parcialmente concluída")
-                    except Exception as e:
-                        logger.error(f"❌ Erro na integração viral: {e}")
-
-                    # GERA RELATÓRIO VIRAL AUTOMATICAMENTE
-                    logger.info("🔥 Gerando relatório viral automático...")
-                    try:
-                        viral_report_generator = services['ViralReportGenerator']()
-                        viral_report_success = viral_report_generator.generate_viral_report(session_id)
-                        if viral_report_success:
-                            logger.info("✅ Relatório viral gerado e salvo automaticamente")
-                        else:
-                            logger.warning("⚠️ Falha ao gerar relatório viral automático")
-                    except Exception as e:
-                        logger.error(f"❌ Erro ao gerar relatório viral: {e}")
-
-                    # GERA CONSOLIDAÇÃO FINAL COMPLETA
-                    logger.info("🔗 CONSOLIDANDO TODOS OS DADOS DA ETAPA 1...")
-                    consolidacao_final = _gerar_consolidacao_final_etapa1(
-                        session_id, search_results, viral_analysis, massive_results
+                search_results = {'web_results': [], 'social_results': [], 'youtube_results': []}
+                massive_results = {}
+                viral_analysis = {}
+
+                try:
+                    logger.info(f"🔍 Executando busca massiva + ALIBABA WebSailor em paralelo - Sessão: {session_id}")
+                    search_results, massive_results, _ = await _executar_buscas_etapa1(
+                        query, context, session_id
                     )
+                    logger.info(f"✅ Buscas da Etapa 1 concluídas - Sessão: {session_id}")
 
-                    # Gera relatório de coleta
-                    collection_report = _generate_collection_report(
-                        search_results, viral_analysis, session_id, context
+                    logger.info(f"🔥 Analisando e capturando conteúdo viral - Sessão: {session_id}")
+                    viral_analysis = await viral_content_analyzer.analyze_and_capture_viral_content(
+                        search_results=search_results,
+                        session_id=session_id,
+                        max_captures=15
                     )
-
-                    # Salva relatório
-                    _save_collection_report(collection_report, session_id)
-
-                    # Salva resultado da etapa 1 COM CONSOLIDAÇÃO
-                    salvar_etapa("etapa1_concluida", {
-                        "session_id": session_id,
-                        "search_results": search_results,
-                        "viral_analysis": viral_analysis,
-                        "massive_results": massive_results,
-                        "consolidacao_final": consolidacao_final,
-                        "collection_report_generated": True,
-                        "timestamp": datetime.now().isoformat(),
-                        "estatisticas_finais": consolidacao_final.get("estatisticas", {})
-                    }, categoria="workflow", session_id=session_id)
-
-                    logger.info(f"✅ ETAPA 1 CONCLUÍDA - Sessão: {session_id}")
-                    logger.info(f"📊 CONSOLIDAÇÃO: {consolidacao_final.get('estatisticas', {}).get('total_dados_coletados', 0)} dados únicos")
-
-                asyncio.run(async_collection_tasks())
+                    logger.info(f"✅ Análise viral concluída - Sessão: {session_id}")
+
+                except Exception as e:
+                    logger.error(f"❌ Erro durante as operações assíncronas da Etapa 1: {e}")
+                    # Continua mesmo com erro para tentar gerar o relatório com o que foi coletado
+
+                # INTEGRAÇÃO DE DADOS VIRAIS
+                logger.info("🔥 Integrando dados virais para segunda etapa...")
+                try:
+                    from services.viral_integration_service import ViralIntegrationService
+                    viral_integration = ViralIntegrationService(session_id)
+                    integration_result = await asyncio.to_thread(viral_integration.process_and_integrate)
+                        
+                    if integration_result.get("success"):
+                        logger.info(f"✅ Integração viral concluída: {integration_result['total_content_pieces']} peças processadas")
+                    else:
+                        logger.warning("⚠️ Integração viral parcialmente concluída")
+                except Exception as e:
+                    logger.error(f"❌ Erro na integração viral: {e}")
+
+                # GERA RELATÓRIO VIRAL AUTOMATICAMENTE
+                logger.info("🔥 Gerando relatório viral automático...")
+                try:
+                    viral_report_generator = ViralReportGenerator()
+                    viral_report_success = await asyncio.to_thread(viral_report_generator.generate_viral_report, session_id)
+                    if viral_report_success:
+                        logger.info("✅ Relatório viral gerado e salvo automaticamente")
+                    else:
+                        logger.warning("⚠️ Falha ao gerar relatório viral automático")
+                except Exception as e:
+                    logger.error(f"❌ Erro ao gerar relatório viral: {e}")
+
+                # GERA CONSOLIDAÇÃO FINAL COMPLETA
+                logger.info("🔗 CONSOLIDANDO TODOS OS DADOS DA ETAPA 1...")
+                consolidacao_final = await asyncio.to_thread(
+                    _gerar_consolidacao_final_etapa1, session_id, search_results, viral_analysis, massive_results
+                )
+
+                # Gera e salva relatório de coleta direto em disco
+                await asyncio.to_thread(
+                    _stream_collection_report, search_results, viral_analysis, session_id, context
+                )
+
+                # Salva resultado da etapa 1 COM CONSOLIDAÇÃO
+                await asyncio.to_thread(salvar_etapa_bin, "etapa1_concluida", {
+                    "session_id": session_id,
+                    "search_results": search_results,
+                    "viral_analysis": viral_analysis,
+                    "massive_results": massive_results,
+                    "consolidacao_final": consolidacao_final,
+                    "collection_report_generated": True,
+                    "timestamp": datetime.now().isoformat(),
+                    "estatisticas_finais": consolidacao_final.get("estatisticas", {})
+                }, session_id=session_id)
+
+                _atualizar_estado_sessao(session_id, etapa="step1")
+                logger.info(f"✅ ETAPA 1 CONCLUÍDA - Sessão: {session_id}")
+                logger.info(f"📊 CONSOLIDAÇÃO: {consolidacao_final.get('estatisticas', {}).get('total_dados_coletados', 0)} dados únicos")
 
             except Exception as e:
                 logger.error(f"❌ Erro na execução da Etapa 1: {e}")
@@ -219,12 +488,12 @@ def start_step1_collection():
                     "error": str(e),
                     "timestamp": datetime.now().isoformat()
                 }, categoria="workflow", session_id=session_id)
+                _atualizar_estado_sessao(session_id, falha="etapa1_erro")
 
-        # Inicia a thread para a coleta
-        thread = threading.Thread(target=execute_collection_thread)
-        thread.start()
+        # Submete a coleta ao pool de etapas do workflow
+        _submit_workflow_task(execute_collection(), session_id)
 
-        return jsonify({
+        return _accepted_response({
             "success": True,
             "session_id": session_id,
             "message": "Etapa 1 iniciada: Coleta massiva de dados em segundo plano",
@@ -232,15 +501,15 @@ def start_step1_collection():
             "estimated_duration": "3-5 minutos",
             "next_step": "/api/workflow/step2/start",
             "status_endpoint": f"/api/workflow/status/{session_id}"
-        }), 200
+        }, session_id)
 
     except Exception as e:
         logger.error(f"❌ Erro ao iniciar Etapa 1: {e}")
-        return jsonify({
+        return _json_response({
             "success": False,
             "error": str(e),
             "message": "Falha ao iniciar coleta de dados"
-        }), 500
+        }, 500)
 
 @enhanced_workflow_bp.route('/workflow/step2/start', methods=['POST'])
 def start_step2_synthesis():
@@ -250,59 +519,49 @@ def start_step2_synthesis():
         session_id = data.get('session_id')
 
         if not session_id:
-            return jsonify({"error": "session_id é obrigatório"}), 400
+            return _json_response({"error": "session_id é obrigatório"}, 400)
 
         logger.info(f"🧠 ETAPA 2 INICIADA - Síntese para sessão: {session_id}")
 
         # Salva início da etapa 2
+        _registrar_sessao(session_id)
         salvar_etapa("etapa2_iniciada", {
             "session_id": session_id,
             "timestamp": datetime.now().isoformat()
         }, categoria="workflow", session_id=session_id)
 
-        # Executa síntese em thread separada
-        def execute_synthesis_thread():
+        # Executa síntese em segundo plano
+        async def execute_synthesis():
             try:
-                # Carrega serviços de forma lazy
-                services = get_services()
-                if not services:
-                    logger.error("❌ Falha ao carregar serviços necessários")
-                    salvar_etapa("etapa2_erro", {
-                        "session_id": session_id,
-                        "error": "Falha ao carregar serviços",
-                        "timestamp": datetime.now().isoformat()
-                    }, categoria="workflow", session_id=session_id)
-                    return
-
-                async def async_synthesis_tasks():
-                    synthesis_result = {}
-                    behavioral_result = {}
-                    market_result = {}
-                    try:
-                        # Executa síntese master com busca ativa
-                        synthesis_result = await services['enhanced_synthesis_engine'].execute_enhanced_synthesis(
-                            session_id=session_id,
-                            synthesis_type="master_synthesis"
-                        )
-
-                        # Executa síntese comportamental
-                        behavioral_result = await services['enhanced_synthesis_engine'].execute_behavioral_synthesis(session_id)
-
-                        # Executa síntese de mercado
-                        market_result = await services['enhanced_synthesis_engine'].execute_market_synthesis(session_id)
-                    except Exception as e:
-                        logger.error(f"❌ Erro durante as operações assíncronas da Etapa 2: {e}")
-
-                    # Salva resultado da etapa 2
-                    salvar_etapa("etapa2_concluida", {
-                        "session_id": session_id,
-                        "synthesis_result": synthesis_result,
-                        "behavioral_result": behavioral_result,
-                        "market_result": market_result,
-                        "timestamp": datetime.now().isoformat()
-                    }, categoria="workflow", session_id=session_id)
+                synthesis_result = {}
+                behavioral_result = {}
+                market_result = {}
+                try:
+                    # Executa síntese master com busca ativa
+                    synthesis_result = await enhanced_synthesis_engine.execute_enhanced_synthesis(
+                        session_id=session_id,
+                        synthesis_type="master_synthesis"
+                    )
+
+                    # Executa síntese comportamental
+                    behavioral_result = await enhanced_synthesis_engine.execute_behavioral_synthesis(session_id)
+
+                    # Executa síntese de mercado
+                    market_result = await enhanced_synthesis_engine.execute_market_synthesis(session_id)
+                except Exception as e:
+                    logger.error(f"❌ Erro durante as operações assíncronas da Etapa 2: {e}")
+
+                # Salva resultado da etapa 2
+                await asyncio.to_thread(salvar_etapa_bin, "etapa2_concluida", {
+                    "session_id": session_id,
+                    "synthesis_result": synthesis_result,
+                    "behavioral_result": behavioral_result,
+                    "market_result": market_result,
+                    "timestamp": datetime.now().isoformat()
+                }, session_id=session_id)
 
-                    logger.info(f"✅ ETAPA 2 CONCLUÍDA - Sessão: {session_id}")
+                _atualizar_estado_sessao(session_id, etapa="step2")
+                logger.info(f"✅ ETAPA 2 CONCLUÍDA - Sessão: {session_id}")
 
             except Exception as e:
                 logger.error(f"❌ Erro na execução da Etapa 2: {e}")
@@ -311,27 +570,27 @@ def start_step2_synthesis():
                     "error": str(e),
                     "timestamp": datetime.now().isoformat()
                 }, categoria="workflow", session_id=session_id)
+                _atualizar_estado_sessao(session_id, falha="etapa2_erro")
 
-        # Inicia a thread para a síntese
-        thread = threading.Thread(target=execute_synthesis_thread)
-        thread.start()
+        # Submete a síntese ao pool de etapas do workflow
+        _submit_workflow_task(execute_synthesis(), session_id)
 
-        return jsonify({
+        return _accepted_response({
             "success": True,
             "session_id": session_id,
             "message": "Etapa 2 iniciada: Síntese com IA e busca ativa em segundo plano",
             "estimated_duration": "2-4 minutos",
             "next_step": "/api/workflow/step3/start",
             "status_endpoint": f"/api/workflow/status/{session_id}"
-        }), 200
+        }, session_id)
 
     except Exception as e:
         logger.error(f"❌ Erro ao iniciar Etapa 2: {e}")
-        return jsonify({
+        return _json_response({
             "success": False,
             "error": str(e),
             "message": "Falha ao iniciar síntese"
-        }), 500
+        }, 500)
 
 @enhanced_workflow_bp.route('/workflow/step3/start', methods=['POST'])
 def start_step3_generation():
@@ -341,52 +600,44 @@ def start_step3_generation():
         session_id = data.get('session_id')
 
         if not session_id:
-            return jsonify({"error": "session_id é obrigatório"}), 400
+            return _json_response({"error": "session_id é obrigatório"}, 400)
 
         logger.info(f"📝 ETAPA 3 INICIADA - Geração para sessão: {session_id}")
 
         # Salva início da etapa 3
+        _registrar_sessao(session_id)
         salvar_etapa("etapa3_iniciada", {
             "session_id": session_id,
             "timestamp": datetime.now().isoformat()
         }, categoria="workflow", session_id=session_id)
 
-        # Executa geração em thread separada
-        def execute_generation_thread():
+        # Executa geração em segundo plano
+        async def execute_generation():
             try:
-                # Carrega serviços de forma lazy
-                services = get_services()
-                if not services:
-                    logger.error("❌ Falha ao carregar serviços necessários")
-                    salvar_etapa("etapa3_erro", {
-                        "session_id": session_id,
-                        "error": "Falha ao carregar serviços",
-                        "timestamp": datetime.now().isoformat()
-                    }, categoria="workflow", session_id=session_id)
-                    return
-
-                async def async_generation_tasks():
-                    modules_result = {}
-                    final_report = ""
-                    try:
-                        # Gera todos os 16 módulos
-                        modules_result = await services['enhanced_module_processor'].generate_all_modules(session_id)
-
-                        # Compila relatório final
-                        final_report = services['comprehensive_report_generator_v3'].compile_final_markdown_report(session_id)
-                    except Exception as e:
-                        logger.error(f"❌ Erro durante as operações assíncronas da Etapa 3: {e}")
-
-                    # Salva resultado da etapa 3
-                    salvar_etapa("etapa3_concluida", {
-                        "session_id": session_id,
-                        "modules_result": modules_result,
-                        "final_report": final_report,
-                        "timestamp": datetime.now().isoformat()
-                    }, categoria="workflow", session_id=session_id)
+                modules_result = {}
+                final_report = ""
+                try:
+                    # Gera todos os 16 módulos
+                    modules_result = await enhanced_module_processor.generate_all_modules(session_id)
+
+                    # Compila relatório final
+                    final_report = await asyncio.to_thread(
+                        comprehensive_report_generator_v3.compile_final_markdown_report, session_id
+                    )
+                except Exception as e:
+                    logger.error(f"❌ Erro durante as operações assíncronas da Etapa 3: {e}")
+
+                # Salva resultado da etapa 3
+                await asyncio.to_thread(salvar_etapa_bin, "etapa3_concluida", {
+                    "session_id": session_id,
+                    "modules_result": modules_result,
+                    "final_report": final_report,
+                    "timestamp": datetime.now().isoformat()
+                }, session_id=session_id)
 
-                    logger.info(f"✅ ETAPA 3 CONCLUÍDA - Sessão: {session_id}")
-                    logger.info(f"📊 {modules_result.get('successful_modules', 0)}/16 módulos gerados")
+                _atualizar_estado_sessao(session_id, etapa="step3")
+                logger.info(f"✅ ETAPA 3 CONCLUÍDA - Sessão: {session_id}")
+                logger.info(f"📊 {modules_result.get('successful_modules', 0)}/16 módulos gerados")
 
             except Exception as e:
                 logger.error(f"❌ Erro na execução da Etapa 3: {e}")
@@ -395,27 +646,27 @@ def start_step3_generation():
                     "error": str(e),
                     "timestamp": datetime.now().isoformat()
                 }, categoria="workflow", session_id=session_id)
+                _atualizar_estado_sessao(session_id, falha="etapa3_erro")
 
-        # Inicia a thread para a geração
-        thread = threading.Thread(target=execute_generation_thread)
-        thread.start()
+        # Submete a geração ao pool de etapas do workflow
+        _submit_workflow_task(execute_generation(), session_id)
 
-        return jsonify({
+        return _accepted_response({
             "success": True,
             "session_id": session_id,
             "message": "Etapa 3 iniciada: Geração dos 16 módulos e relatório final em segundo plano",
             "estimated_duration": "4-6 minutos",
             "next_step": "/api/workflow/results", # Ou um endpoint para o relatório final
             "status_endpoint": f"/api/workflow/status/{session_id}"
-        }), 200
+        }, session_id)
 
     except Exception as e:
         logger.error(f"❌ Erro ao iniciar Etapa 3: {e}")
-        return jsonify({
+        return _json_response({
             "success": False,
             "error": str(e),
             "message": "Falha ao iniciar geração"
-        }), 500
+        }, 500)
 
 
 @enhanced_workflow_bp.route('/workflow/full_workflow/start', methods=['POST'])
@@ -424,8 +675,9 @@ def start_full_workflow():
     try:
         data = request.get_json()
 
-        # Gera session_id único
-        session_id = f"session_{int(time.time() * 1000)}_{uuid.uuid4().hex[:8]}"
+        # Gera session_id único (mesma leitura do relógio usada no registro de início)
+        inicio = time.time()
+        session_id = f"session_{int(inicio * 1000)}_{uuid.uuid4().hex[:8]}"
 
         # Extrai parâmetros
         segmento = data.get('segmento', '').strip()
@@ -434,15 +686,10 @@ def start_full_workflow():
 
         # Validação
         if not segmento:
-            return jsonify({"error": "Segmento é obrigatório"}), 400
+            return _json_response({"error": "Segmento é obrigatório"}, 400)
 
         # Constrói query de pesquisa
-        query_parts = [segmento]
-        if produto:
-            query_parts.append(produto)
-        query_parts.extend(["Brasil", "2024", "mercado"])
-
-        query = " ".join(query_parts)
+        query = _build_query(segmento, produto)
 
         # Contexto da análise
         context = {
@@ -457,157 +704,143 @@ def start_full_workflow():
         logger.info(f"🔍 Query: {query}")
 
         # Salva início do workflow completo
+        _registrar_sessao(session_id)
         salvar_etapa("workflow_completo_iniciado", {
             "session_id": session_id,
             "query": query,
             "context": context,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.fromtimestamp(inicio).isoformat()
         }, categoria="workflow", session_id=session_id)
 
-        def execute_full_workflow_thread():
+        async def execute_full_workflow():
             try:
-                services = get_services()
-                if not services:
-                    logger.error("❌ Falha ao carregar serviços necessários para workflow completo")
-                    salvar_etapa("workflow_erro", {
+                search_results = {'web_results': [], 'social_results': [], 'youtube_results': []}
+                massive_results = {}
+                viral_analysis = {}
+                synthesis_result = {}
+                behavioral_result = {}
+                market_result = {}
+                modules_result = {}
+                final_report = ""
+
+                # ETAPA 1: Coleta Massiva de Dados
+                logger.info(f"🚀 INICIANDO ETAPA 1 (Workflow Completo) - Sessão: {session_id}")
+                try:
+                    search_results, massive_results, search_errors = await _executar_buscas_etapa1(
+                        query, context, session_id
+                    )
+                    if search_errors:
+                        raise search_errors[0]
+
+                    viral_analysis = await viral_content_analyzer.analyze_and_capture_viral_content(
+                        search_results=search_results,
+                        session_id=session_id,
+                        max_captures=15
+                    )
+
+                    # GERA RELATÓRIO VIRAL AUTOMATICAMENTE
+                    viral_report_generator = ViralReportGenerator()
+                    await asyncio.to_thread(viral_report_generator.generate_viral_report, session_id)
+
+                    # GERA CONSOLIDAÇÃO FINAL COMPLETA
+                    consolidacao_final = await asyncio.to_thread(
+                        _gerar_consolidacao_final_etapa1, session_id, search_results, viral_analysis, massive_results
+                    )
+
+                    # Gera e salva relatório de coleta direto em disco
+                    await asyncio.to_thread(
+                        _stream_collection_report, search_results, viral_analysis, session_id, context
+                    )
+
+                    await asyncio.to_thread(salvar_etapa_bin, "etapa1_concluida_full_workflow", {
                         "session_id": session_id,
-                        "error": "Falha ao carregar serviços para workflow completo",
+                        "search_results": search_results,
+                        "viral_analysis": viral_analysis,
+                        "massive_results": massive_results,
+                        "consolidacao_final": consolidacao_final,
+                        "collection_report_generated": True,
+                        "timestamp": datetime.now().isoformat(),
+                        "estatisticas_finais": consolidacao_final.get("estatisticas", {})
+                    }, session_id=session_id)
+                    _atualizar_estado_sessao(session_id, etapa="step1")
+                    logger.info(f"✅ ETAPA 1 (Workflow Completo) CONCLUÍDA - Sessão: {session_id}")
+                except Exception as e:
+                    logger.error(f"❌ Erro na Etapa 1 (Workflow Completo): {e}")
+                    salvar_etapa("etapa1_erro_full_workflow", {
+                        "session_id": session_id,
+                        "error": str(e),
                         "timestamp": datetime.now().isoformat()
                     }, categoria="workflow", session_id=session_id)
-                    return
-
-                async def async_full_workflow_tasks():
-                    search_results = {'web_results': [], 'social_results': [], 'youtube_results': []}
-                    massive_results = {}
-                    viral_analysis = {}
-                    synthesis_result = {}
-                    behavioral_result = {}
-                    market_result = {}
-                    modules_result = {}
-                    final_report = ""
-
-                    # ETAPA 1: Coleta Massiva de Dados
-                    logger.info(f"🚀 INICIANDO ETAPA 1 (Workflow Completo) - Sessão: {session_id}")
-                    try:
-                        real_search_orch = services['real_search_orchestrator']
-                        if hasattr(real_search_orch, 'execute_massive_real_search'):
-                            search_results = await real_search_orch.execute_massive_real_search(
-                                query=query,
-                                context=context,
-                                session_id=session_id
-                            )
-                        else:
-                            logger.error("❌ Método execute_massive_real_search não encontrado na Etapa 1 (Workflow Completo)")
-
-                        massive_results = await services['massive_search_engine'].execute_massive_search(
-                            produto=context.get('segmento', context.get('produto', query)),
-                            publico_alvo=context.get('publico', context.get('publico_alvo', 'público brasileiro')),
-                            session_id=session_id
-                        )
-                        viral_analysis = await services['viral_content_analyzer'].analyze_and_capture_viral_content(
-                            search_results=search_results,
-                            session_id=session_id,
-                            max_captures=15
-                        )
-
-                        # GERA RELATÓRIO VIRAL AUTOMATICAMENTE
-                        viral_report_generator = services['ViralReportGenerator']()
-                        viral_report_generator.generate_viral_report(session_id)
-
-                        # GERA CONSOLIDAÇÃO FINAL COMPLETA
-                        consolidacao_final = _gerar_consolidacao_final_etapa1(
-                            session_id, search_results, viral_analysis, massive_results
-                        )
-
-                        # Gera e salva relatório de coleta
-                        collection_report = _generate_collection_report(
-                            search_results, viral_analysis, session_id, context
-                        )
-                        _save_collection_report(collection_report, session_id)
-
-                        salvar_etapa("etapa1_concluida_full_workflow", {
-                            "session_id": session_id,
-                            "search_results": search_results,
-                            "viral_analysis": viral_analysis,
-                            "massive_results": massive_results,
-                            "consolidacao_final": consolidacao_final,
-                            "collection_report_generated": True,
-                            "timestamp": datetime.now().isoformat(),
-                            "estatisticas_finais": consolidacao_final.get("estatisticas", {})
-                        }, categoria="workflow", session_id=session_id)
-                        logger.info(f"✅ ETAPA 1 (Workflow Completo) CONCLUÍDA - Sessão: {session_id}")
-                    except Exception as e:
-                        logger.error(f"❌ Erro na Etapa 1 (Workflow Completo): {e}")
-                        salvar_etapa("etapa1_erro_full_workflow", {
-                            "session_id": session_id,
-                            "error": str(e),
-                            "timestamp": datetime.now().isoformat()
-                        }, categoria="workflow", session_id=session_id)
-                        return # Aborta o workflow se a primeira etapa falhar
-
-                    # ETAPA 2: Síntese com IA e Busca Ativa
-                    logger.info(f"🧠 INICIANDO ETAPA 2 (Workflow Completo) - Sessão: {session_id}")
-                    try:
-                        synthesis_result = await services['enhanced_synthesis_engine'].execute_enhanced_synthesis(
-                            session_id=session_id,
-                            synthesis_type="master_synthesis"
-                        )
-                        behavioral_result = await services['enhanced_synthesis_engine'].execute_behavioral_synthesis(session_id)
-                        market_result = await services['enhanced_synthesis_engine'].execute_market_synthesis(session_id)
-
-                        salvar_etapa("etapa2_concluida_full_workflow", {
-                            "session_id": session_id,
-                            "synthesis_result": synthesis_result,
-                            "behavioral_result": behavioral_result,
-                            "market_result": market_result,
-                            "timestamp": datetime.now().isoformat()
-                        }, categoria="workflow", session_id=session_id)
-                        logger.info(f"✅ ETAPA 2 (Workflow Completo) CONCLUÍDA - Sessão: {session_id}")
-                    except Exception as e:
-                        logger.error(f"❌ Erro na Etapa 2 (Workflow Completo): {e}")
-                        salvar_etapa("etapa2_erro_full_workflow", {
-                            "session_id": session_id,
-                            "error": str(e),
-                            "timestamp": datetime.now().isoformat()
-                        }, categoria="workflow", session_id=session_id)
-                        return # Aborta o workflow se a segunda etapa falhar
-
-                    # ETAPA 3: Geração dos 16 Módulos e Relatório Final
-                    logger.info(f"📝 INICIANDO ETAPA 3 (Workflow Completo) - Sessão: {session_id}")
-                    try:
-                        modules_result = await services['enhanced_module_processor'].generate_all_modules(session_id)
-                        final_report = services['comprehensive_report_generator_v3'].compile_final_markdown_report(session_id)
-
-                        salvar_etapa("etapa3_concluida_full_workflow", {
-                            "session_id": session_id,
-                            "modules_result": modules_result,
-                            "final_report": final_report,
-                            "timestamp": datetime.now().isoformat()
-                        }, categoria="workflow", session_id=session_id)
-                        logger.info(f"✅ ETAPA 3 (Workflow Completo) CONCLUÍDA - Sessão: {session_id}")
-                    except Exception as e:
-                        logger.error(f"❌ Erro na Etapa 3 (Workflow Completo): {e}")
-                        salvar_etapa("etapa3_erro_full_workflow", {
-                            "session_id": session_id,
-                            "error": str(e),
-                            "timestamp": datetime.now().isoformat()
-                        }, categoria="workflow", session_id=session_id)
-                        return # Aborta o workflow se a terceira etapa falhar
-
-                    # Salva resultado final do workflow completo
-                    salvar_etapa("workflow_completo_concluido", {
+                    _atualizar_estado_sessao(session_id, falha="etapa1_erro")
+                    return # Aborta o workflow se a primeira etapa falhar
+
+                # ETAPA 2: Síntese com IA e Busca Ativa
+                logger.info(f"🧠 INICIANDO ETAPA 2 (Workflow Completo) - Sessão: {session_id}")
+                try:
+                    synthesis_result = await enhanced_synthesis_engine.execute_enhanced_synthesis(
+                        session_id=session_id,
+                        synthesis_type="master_synthesis"
+                    )
+                    behavioral_result = await enhanced_synthesis_engine.execute_behavioral_synthesis(session_id)
+                    market_result = await enhanced_synthesis_engine.execute_market_synthesis(session_id)
+
+                    await asyncio.to_thread(salvar_etapa_bin, "etapa2_concluida_full_workflow", {
                         "session_id": session_id,
-                        "search_results": search_results,
-                        "viral_analysis": viral_analysis,
                         "synthesis_result": synthesis_result,
+                        "behavioral_result": behavioral_result,
+                        "market_result": market_result,
+                        "timestamp": datetime.now().isoformat()
+                    }, session_id=session_id)
+                    _atualizar_estado_sessao(session_id, etapa="step2")
+                    logger.info(f"✅ ETAPA 2 (Workflow Completo) CONCLUÍDA - Sessão: {session_id}")
+                except Exception as e:
+                    logger.error(f"❌ Erro na Etapa 2 (Workflow Completo): {e}")
+                    salvar_etapa("etapa2_erro_full_workflow", {
+                        "session_id": session_id,
+                        "error": str(e),
+                        "timestamp": datetime.now().isoformat()
+                    }, categoria="workflow", session_id=session_id)
+                    _atualizar_estado_sessao(session_id, falha="etapa2_erro")
+                    return # Aborta o workflow se a segunda etapa falhar
+
+                # ETAPA 3: Geração dos 16 Módulos e Relatório Final
+                logger.info(f"📝 INICIANDO ETAPA 3 (Workflow Completo) - Sessão: {session_id}")
+                try:
+                    modules_result = await enhanced_module_processor.generate_all_modules(session_id)
+                    final_report = await asyncio.to_thread(
+                        comprehensive_report_generator_v3.compile_final_markdown_report, session_id
+                    )
+
+                    await asyncio.to_thread(salvar_etapa_bin, "etapa3_concluida_full_workflow", {
+                        "session_id": session_id,
                         "modules_result": modules_result,
                         "final_report": final_report,
                         "timestamp": datetime.now().isoformat()
+                    }, session_id=session_id)
+                    _atualizar_estado_sessao(session_id, etapa="step3")
+                    logger.info(f"✅ ETAPA 3 (Workflow Completo) CONCLUÍDA - Sessão: {session_id}")
+                except Exception as e:
+                    logger.error(f"❌ Erro na Etapa 3 (Workflow Completo): {e}")
+                    salvar_etapa("etapa3_erro_full_workflow", {
+                        "session_id": session_id,
+                        "error": str(e),
+                        "timestamp": datetime.now().isoformat()
                     }, categoria="workflow", session_id=session_id)
+                    _atualizar_estado_sessao(session_id, falha="etapa3_erro")
+                    return # Aborta o workflow se a terceira etapa falhar
 
-                    logger.info(f"✅ WORKFLOW COMPLETO CONCLUÍDO - Sessão: {session_id}")
+                # Salva resultado final do workflow completo
+                await asyncio.to_thread(salvar_etapa_bin, "workflow_completo_concluido", {
+                    "session_id": session_id,
+                    "search_results": search_results,
+                    "viral_analysis": viral_analysis,
+                    "synthesis_result": synthesis_result,
+                    "modules_result": modules_result,
+                    "final_report": final_report,
+                    "timestamp": datetime.now().isoformat()
+                }, session_id=session_id)
 
-                asyncio.run(async_full_workflow_tasks())
+                logger.info(f"✅ WORKFLOW COMPLETO CONCLUÍDO - Sessão: {session_id}")
 
             except Exception as e:
                 logger.error(f"❌ Erro no workflow completo: {e}")
@@ -616,12 +849,12 @@ def start_full_workflow():
                     "error": str(e),
                     "timestamp": datetime.now().isoformat()
                 }, categoria="workflow", session_id=session_id)
+                _atualizar_estado_sessao(session_id, falha="workflow_erro")
 
-        # Inicia a thread para o workflow completo
-        thread = threading.Thread(target=execute_full_workflow_thread)
-        thread.start()
+        # Submete o workflow completo ao pool de etapas do workflow
+        _submit_workflow_task(execute_full_workflow(), session_id)
 
-        return jsonify({
+        return _accepted_response({
             "success": True,
             "session_id": session_id,
             "message": "Workflow completo iniciado em segundo plano",
@@ -632,18 +865,115 @@ def start_full_workflow():
                 "Etapa 3: Geração de módulos (4-6 min)"
             ],
             "status_endpoint": f"/api/workflow/status/{session_id}"
-        }), 200
+        }, session_id)
 
     except Exception as e:
         logger.error(f"❌ Erro ao iniciar workflow completo: {e}")
-        return jsonify({
+        return _json_response({
             "success": False,
             "error": str(e)
-        }), 500
+        }, 500)
+
+# Memo curto do status: o frontend faz polling e cada consulta tocaria o disco várias vezes
+_STATUS_CACHE_TTL = 0.5
+_status_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_status_cache_lock = threading.Lock()
+
+# Limite de sessões mantidas em memória (LRU); as demais voltam a ser lidas do disco
+_SESSION_CACHE_MAX = int(os.getenv('WORKFLOW_SESSION_CACHE_MAX', '1024'))
+
+
+_ERROR_PREFIXES = ("etapa1_erro", "etapa2_erro", "etapa3_erro", "workflow_erro")
+
+# Estado das etapas conhecido por este processo. Com vários workers cada um vê só as
+# etapas que executou, então enquanto houver etapa pendente o status volta a olhar o disco
+_session_state: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_session_state_lock = threading.Lock()
+
+
+def _scan_error_prefixes(session_id: str, prefixes: tuple) -> set:
+    """Lista de uma vez os prefixos de erro presentes nos diretórios da sessão"""
+    found = set()
+    for base_dir in (f"relatorios_intermediarios/workflow/{session_id}",
+                     f"analyses_data/workflow/{session_id}"):
+        try:
+            with os.scandir(base_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    # startswith com tupla descarta a maioria das entradas em uma única chamada C
+                    if name.startswith(prefixes):
+                        found.update(prefix for prefix in prefixes if name.startswith(prefix))
+                        if len(found) == len(prefixes):
+                            return found
+        except FileNotFoundError:
+            continue
+    return found
+
+
+def _estado_do_disco(session_id: str) -> Dict[str, Any]:
+    """Reconstrói o estado das etapas a partir dos arquivos gravados (ex.: após reinício)"""
+    return {
+        "step1": _etapa_bin_concluida(session_id, "etapa1_concluida", "etapa1_concluida_full_workflow") or
+                 os.path.exists(f"analyses_data/{session_id}/relatorio_coleta.md") or
+                 os.path.exists(f"analyses_data/workflow/{session_id}/etapa1_concluida_full_workflow.json"),
+        "step2": _etapa_bin_concluida(session_id, "etapa2_concluida", "etapa2_concluida_full_workflow") or
+                 os.path.exists(f"analyses_data/workflow/{session_id}/etapa2_concluida_full_workflow.json"),
+        "step3": _etapa_bin_concluida(session_id, "etapa3_concluida", "etapa3_concluida_full_workflow") or
+                 os.path.exists(f"analyses_data/{session_id}/relatorio_final.md") or
+                 os.path.exists(f"analyses_data/workflow/{session_id}/etapa3_concluida_full_workflow.json"),
+        "falhas": _scan_error_prefixes(session_id, _ERROR_PREFIXES)
+    }
+
+
+def _mesclar_estado(session_id: str, novo: Dict[str, Any]) -> Dict[str, Any]:
+    """Incorpora um estado ao registro em memória (LRU); chamar com _session_state_lock"""
+    estado = _session_state.get(session_id)
+    if estado is None:
+        estado = _session_state[session_id] = novo
+        while len(_session_state) > _SESSION_CACHE_MAX:
+            _session_state.popitem(last=False)
+    else:
+        for etapa in ("step1", "step2", "step3"):
+            estado[etapa] = estado[etapa] or novo[etapa]
+        estado["falhas"].update(novo["falhas"])
+        _session_state.move_to_end(session_id)
+    return estado
+
+
+def _registrar_sessao(session_id: str) -> None:
+    """Garante entrada no registro em memória, semeada pelo disco na primeira vez"""
+    with _session_state_lock:
+        if session_id in _session_state:
+            _session_state.move_to_end(session_id)
+            return
+    estado = _estado_do_disco(session_id)
+    with _session_state_lock:
+        _mesclar_estado(session_id, estado)
+
+
+def _atualizar_estado_sessao(session_id: str, etapa: str = None, falha: str = None) -> None:
+    """Marca etapa concluída ou prefixo de erro no registro e invalida o memo de status"""
+    _registrar_sessao(session_id)
+    with _session_state_lock:
+        # A entrada pode ter saído do LRU entre as duas chamadas
+        estado = _mesclar_estado(session_id, {"step1": False, "step2": False, "step3": False, "falhas": set()})
+        if etapa:
+            estado[etapa] = True
+        if falha:
+            estado["falhas"].add(falha)
+    with _status_cache_lock:
+        _status_cache.pop(session_id, None)
+
 
 @enhanced_workflow_bp.route('/workflow/status/<session_id>', methods=['GET'])
 def get_workflow_status(session_id):
     """Obtém status do workflow"""
+    now = time.monotonic()
+    with _status_cache_lock:
+        cached = _status_cache.get(session_id)
+    if cached and now - cached[0] < _STATUS_CACHE_TTL:
+        return _json_response(cached[1], 200)
+
     try:
         status = {
             "session_id": session_id,
@@ -658,52 +988,62 @@ def get_workflow_status(session_id):
             "last_update": datetime.now().isoformat()
         }
 
+        with _session_state_lock:
+            estado = _session_state.get(session_id)
+            if estado is not None:
+                estado = dict(estado, falhas=set(estado["falhas"]))
+        if estado is None or not (estado["step3"] or estado["falhas"]):
+            # Etapa pendente: outro worker pode tê-la concluído ou ter morrido no meio, então confere o disco
+            if _verificar_interrupcao(session_id):
+                _atualizar_estado_sessao(session_id, falha="workflow_erro")
+            disco = _estado_do_disco(session_id)
+            with _session_state_lock:
+                estado = _mesclar_estado(session_id, disco)
+                estado = dict(estado, falhas=set(estado["falhas"]))
+
         # Verifica se etapa 1 foi concluída
-        if os.path.exists(f"analyses_data/{session_id}/relatorio_coleta.md") or \
-           os.path.exists(f"analyses_data/workflow/{session_id}/etapa1_concluida_full_workflow.json"):
+        if estado["step1"]:
             status["step_status"]["step1"] = "completed"
             status["current_step"] = 1
             status["progress_percentage"] = 33
 
         # Verifica se etapa 2 foi concluída
-        if os.path.exists(f"analyses_data/workflow/{session_id}/etapa2_concluida_full_workflow.json"):
+        if estado["step2"]:
             status["step_status"]["step2"] = "completed"
             status["current_step"] = 2
             status["progress_percentage"] = 66
 
         # Verifica se etapa 3 foi concluída
-        if os.path.exists(f"analyses_data/{session_id}/relatorio_final.md") or \
-           os.path.exists(f"analyses_data/workflow/{session_id}/etapa3_concluida_full_workflow.json"):
+        if estado["step3"]:
             status["step_status"]["step3"] = "completed"
             status["current_step"] = 3
             status["progress_percentage"] = 100
             status["estimated_remaining"] = "Concluído"
 
         # Verifica se há erros
-        error_files_patterns = [
-            f"analyses_data/workflow/{session_id}/etapa1_erro*",
-            f"analyses_data/workflow/{session_id}/etapa2_erro*",
-            f"analyses_data/workflow/{session_id}/etapa3_erro*",
-            f"analyses_data/workflow/{session_id}/workflow_erro*"
-        ]
-
-        for pattern in error_files_patterns:
-            if glob.glob(pattern):
+        for prefix in _ERROR_PREFIXES:
+            if prefix in estado["falhas"]:
                 status["error"] = "Erro detectado em uma das etapas do workflow."
-                status["step_status"]["step1"] = "failed" if "etapa1_erro" in pattern else status["step_status"]["step1"]
-                status["step_status"]["step2"] = "failed" if "etapa2_erro" in pattern else status["step_status"]["step2"]
-                status["step_status"]["step3"] = "failed" if "etapa3_erro" in pattern else status["step_status"]["step3"]
+                status["step_status"]["step1"] = "failed" if prefix == "etapa1_erro" else status["step_status"]["step1"]
+                status["step_status"]["step2"] = "failed" if prefix == "etapa2_erro" else status["step_status"]["step2"]
+                status["step_status"]["step3"] = "failed" if prefix == "etapa3_erro" else status["step_status"]["step3"]
                 break
 
-        return jsonify(status), 200
+        with _status_cache_lock:
+            _status_cache[session_id] = (now, status)
+            _status_cache.move_to_end(session_id)
+            while len(_status_cache) > _SESSION_CACHE_MAX:
+                _status_cache.popitem(last=False)
+
+        return _json_response(status, 200)
 
     except Exception as e:
         logger.error(f"❌ Erro ao obter status: {e}")
-        return jsonify({
+        return _json_response({
             "session_id": session_id,
             "error": str(e),
             "status": "error"
-        }), 500
+        }, 500)
 
 @enhanced_workflow_bp.route('/workflow/results/<session_id>', methods=['GET'])
 def get_workflow_results(session_id):
@@ -723,42 +1063,61 @@ def get_workflow_results(session_id):
             results["final_report_available"] = True
             results["final_report_path"] = final_report_path
 
+        # Lista todos os arquivos disponíveis (um único scandir por diretório; stat vem do DirEntry)
+        session_dir = f"analyses_data/{session_id}"
+        modules_dir = os.path.join(session_dir, "modules")
+        modules = None
+        stack = [session_dir]
+        while stack:
+            current_dir = stack.pop()
+            try:
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            if entry.path == modules_dir:
+                                modules = []
+                            stack.append(entry.path)
+                            continue
+                        name = entry.name
+                        if modules is not None and current_dir == modules_dir and name.endswith('.md'):
+                            modules.append(name)
+                        results["available_files"].append({
+                            "name": name,
+                            "path": os.path.relpath(entry.path, session_dir),
+                            "size": entry.stat().st_size,
+                            "type": name.rsplit('.', 1)[-1] if '.' in name else 'unknown'
+                        })
+            except FileNotFoundError:
+                continue
+
         # Conta módulos gerados
-        modules_dir = f"analyses_data/{session_id}/modules"
-        if os.path.exists(modules_dir):
-            modules = [f for f in os.listdir(modules_dir) if f.endswith('.md')]
+        if modules is not None:
             results["modules_generated"] = len(modules)
             results["modules_list"] = modules
 
         # Conta screenshots
         files_dir = f"analyses_data/files/{session_id}"
-        if os.path.exists(files_dir):
-            screenshots = [f for f in os.listdir(files_dir) if f.endswith('.png')]
+        try:
+            with os.scandir(files_dir) as entries:
+                screenshots = [entry.name for entry in entries if entry.name.endswith('.png')]
             results["screenshots_captured"] = len(screenshots)
             results["screenshots_list"] = screenshots
+        except FileNotFoundError:
+            pass
 
-        # Lista todos os arquivos disponíveis
-        session_dir = f"analyses_data/{session_id}"
-        if os.path.exists(session_dir):
-            for root, dirs, files in os.walk(session_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(file_path, session_dir)
-                    results["available_files"].append({
-                        "name": file,
-                        "path": relative_path,
-                        "size": os.path.getsize(file_path),
-                        "type": file.split('.')[-1] if '.' in file else 'unknown'
-                    })
-
-        return jsonify(results), 200
+        return _json_response(results, 200)
 
     except Exception as e:
         logger.error(f"❌ Erro ao obter resultados: {e}")
-        return jsonify({
+        return _json_response({
             "session_id": session_id,
             "error": str(e)
-        }), 500
+        }, 500)
+
+_DOWNLOAD_NAMES = {
+    "final_report": "relatorio_final_{session_id}.md",
+    "complete_report": "relatorio_completo_{session_id}.md"
+}
 
 @enhanced_workflow_bp.route('/workflow/download/<session_id>/<file_type>', methods=['GET'])
 def download_workflow_file(session_id, file_type):
@@ -771,151 +1130,386 @@ def download_workflow_file(session_id, file_type):
             file_path = os.path.join(base_path, "relatorio_final.md")
             if not os.path.exists(file_path):
                 file_path = os.path.join(base_path, "relatorio_final_completo.md")
-            filename = f"relatorio_final_{session_id}.md"
+            filename_tpl = _DOWNLOAD_NAMES["final_report"]
         elif file_type == "complete_report":
             file_path = os.path.join(base_path, "relatorio_final_completo.md")
-            filename = f"relatorio_completo_{session_id}.md"
+            filename_tpl = _DOWNLOAD_NAMES["complete_report"]
         else:
-            return jsonify({"error": "Tipo de relatório inválido"}), 400
+            return _json_response({"error": "Tipo de relatório inválido"}, 400)
 
-        if not os.path.exists(file_path):
-            return jsonify({"error": "Arquivo não encontrado"}), 404
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            return _json_response({"error": "Arquivo não encontrado"}, 404)
 
+        # ETag derivado do stat permite responder 304 sem reler o arquivo
         return send_file(
             file_path,
+            mimetype="text/markdown",
             as_attachment=True,
-            download_name=filename
+            download_name=filename_tpl.format(session_id=session_id),
+            conditional=True,
+            etag=f"{st.st_mtime_ns:x}-{st.st_size:x}",
+            last_modified=st.st_mtime
         )
 
     except Exception as e:
         logger.error(f"❌ Erro no download: {e}")
-        return jsonify({"error": str(e)}), 500
+        return _json_response({"error": str(e)}, 500)
 
 # --- Funções auxiliares ---
-def _generate_collection_report(
+# Templates estáticos do relatório de coleta (montados uma única vez na importação)
+_REPORT_HEADER = (
+    "# RELATÓRIO CONSOLIDADO ULTRA-COMPLETO - ARQV30 Enhanced v3.0\n\n"
+    "**🎯 DADOS 100% REAIS - ZERO SIMULAÇÃO - TUDO UNIFICADO**\n\n"
+    "**Sessão:** {session_id}  \n"
+    "**Query:** {query}  \n"
+    "**Iniciado em:** {started}  \n"
+    "**Duração:** {duration:.2f} segundos\n\n"
+    "---\n\n"
+    "## 📊 RESUMO EXECUTIVO DA COLETA MASSIVA\n\n"
+    "### Estatísticas Completas:\n"
+    "- **Total de Fontes:** {total_sources}\n"
+    "- **URLs Únicas:** {unique_urls}\n"
+    "- **Trechos Salvos:** {excerpts}\n"
+    "- **Dados Virais:** {viral}\n"
+    "- **Dados Massive Search:** {massive}\n"
+    "- **Screenshots:** {screenshots}\n\n"
+    "---\n\n"
+    "## TRECHOS DE CONTEÚDO EXTRAÍDO\n\n"
+    "*Amostras do conteúdo real coletado durante a busca massiva*\n\n"
+)
+
+_YOUTUBE_ITEM_TPL = (
+    "### YouTube {i}: {title}\n\n"
+    "**Canal:** {channel}  \n"
+    "**Views:** {views}  \n"
+    "**Likes:** {likes}  \n"
+    "**Comentários:** {comments}  \n"
+    "**Score Viral:** {viral_score:.2f}/10  \n"
+    "**URL:** {url}  \n"
+    "{description}"
+    "\n---\n\n"
+)
+
+_SOCIAL_ITEM_TPL = (
+    "### Social {i}: {title}\n\n"
+    "**Plataforma:** {platform}  \n"
+    "**Autor:** {author}  \n"
+    "**Engajamento:** {viral_score:.2f}/10  \n"
+    "**URL:** {url}  \n"
+    "{content}"
+    "\n---\n\n"
+)
+
+_SCREENSHOT_ITEM_TPL = (
+    "### Screenshot {i}: {title}\n\n"
+    "**Plataforma:** {platform}  \n"
+    "**Score Viral:** {viral_score:.2f}/10  \n"
+    "**URL Original:** {url}  \n"
+    "{metrics}"
+    "{arquivo}"
+    "\n---\n\n"
+)
+
+_REPORT_FOOTER = (
+    "\n\n---\n\n"
+    "## 📊 ESTATÍSTICAS FINAIS CONSOLIDADAS\n\n"
+    "- **Total de Trechos Extraídos:** {excerpts}\n"
+    "- **Total de Dados Virais:** {viral}\n"
+    "- **Total de Dados Massive Search:** {massive}\n"
+    "- **Total de Caracteres de Conteúdo:** {total_chars:,}\n"
+    "- **Total de Screenshots:** {screenshots}\n"
+    "- **Total de Resultados Web:** {web}\n"
+    "- **Total de Resultados YouTube:** {youtube}\n"
+    "- **Total de Resultados Sociais:** {social}\n\n"
+    "**🔥 GARANTIA: 100% DADOS REAIS - ZERO SIMULAÇÃO - TUDO CONSOLIDADO**\n\n"
+    "---\n\n"
+    "*Relatório ultra-consolidado gerado automaticamente em {generated_at}*\n"
+    "*Pronto para análise profunda pela IA QWEN via OpenRouter*\n"
+)
+
+# Conteúdo social acima deste tamanho entra só como prévia; a íntegra já está no snapshot da Etapa 1
+_INLINE_CONTENT_LIMIT = 2000
+
+def _social_content_line(content: str) -> str:
+    """Linha de conteúdo do post social, truncada quando excede o limite inline"""
+    if not content:
+        return ""
+    if len(content) <= _INLINE_CONTENT_LIMIT:
+        return f"**CONTEÚDO COMPLETO:** {content}  \n"
+    return (f"**CONTEÚDO (prévia):** {content[:_INLINE_CONTENT_LIMIT]}...  \n"
+            f"*Íntegra ({len(content):,} caracteres) salva nos resultados da Etapa 1 desta sessão (etapa1_concluida).*  \n")
+
+def _safe_format_int(value) -> str:
+    """Formata números com separador de milhar; valores não numéricos saem como texto"""
+    if isinstance(value, int):
+        return f"{value:,}"
+    if value is None:
+        return 'N/A'
+    # Strings sem dígitos (ex.: 'N/A') não passam pelo int() só para cair na exceção
+    if isinstance(value, str) and not value.strip().lstrip('+-').isdigit():
+        return value
+    try:
+        return f"{int(value):,}"
+    except (ValueError, TypeError):
+        return str(value)
+
+def _render_collection_report(
+    write: Callable[[str], Any],
     search_results: Dict[str, Any],
     viral_analysis: Dict[str, Any],
     session_id: str,
     context: Dict[str, Any]
-) -> str:
-    """Gera relatório consolidado com dados extraídos"""
-
-    # Função auxiliar para formatar números com segurança
-    def safe_format_int(value):
-        try:
-            return f"{int(value):,}"
-        except (ValueError, TypeError):
-            return str(value) if value is not None else 'N/A'
-
-    # Carrega dados salvos de forma simplificada
-    all_saved_excerpts = _load_all_saved_excerpts(session_id)
-    all_viral_data = _load_all_viral_data(session_id)
-    massive_search_data = _load_massive_search_data(session_id)
+) -> None:
+    """Emite o relatório consolidado, fragmento a fragmento, pela função write"""
+
+    # Carrega dados salvos em paralelo (três leituras de disco independentes)
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="collection-report-load") as executor:
+        all_saved_excerpts, all_viral_data, massive_search_data = executor.map(
+            lambda loader: loader(session_id),
+            (_load_all_saved_excerpts, _load_all_viral_data, _load_massive_search_data)
+        )
 
-    report = f"""# RELATÓRIO CONSOLIDADO ULTRA-COMPLETO - ARQV30 Enhanced v3.0\n\n**🎯 DADOS 100% REAIS - ZERO SIMULAÇÃO - TUDO UNIFICADO**\n\n**Sessão:** {session_id}  \n**Query:** {search_results.get('query', 'N/A')}  \n**Iniciado em:** {search_results.get('statistics', {}).get('search_started', 'N/A')}  \n**Duração:** {search_results.get('statistics', {}).get('search_duration', 0):.2f} segundos\n\n---\n\n## 📊 RESUMO EXECUTIVO DA COLETA MASSIVA\n\n### Estatísticas Completas:\n- **Total de Fontes:** {search_results.get('statistics', {}).get('total_sources', 0)}\n- **URLs Únicas:** {search_results.get('statistics', {}).get('unique_urls', 0)}\n- **Trechos Salvos:** {len(all_saved_excerpts)}\n- **Dados Virais:** {len(all_viral_data)}\n- **Dados Massive Search:** {len(massive_search_data)}\n- **Screenshots:** {len(viral_analysis.get('screenshots_captured', []))}\n\n---\n\n## TRECHOS DE CONTEÚDO EXTRAÍDO\n\n*Amostras do conteúdo real coletado durante a busca massiva*\n\n"""
+    stats = search_results.get('statistics', {})
+    write(_REPORT_HEADER.format(
+        session_id=session_id,
+        query=search_results.get('query', 'N/A'),
+        started=stats.get('search_started', 'N/A'),
+        duration=stats.get('search_duration', 0),
+        total_sources=stats.get('total_sources', 0),
+        unique_urls=stats.get('unique_urls', 0),
+        excerpts=len(all_saved_excerpts),
+        viral=len(all_viral_data),
+        massive=len(massive_search_data),
+        screenshots=len(viral_analysis.get('screenshots_captured', []))
+    ))
 
     # Adiciona trechos de conteúdo
-    report += _generate_content_excerpts_section(search_results, viral_analysis)
+    write(_generate_content_excerpts_section(search_results, viral_analysis))
 
     # Adiciona dados virais completos
-    report += _incorporate_viral_data(session_id, viral_analysis)
+    write(_incorporate_viral_data(session_id, viral_analysis))
 
     # Adiciona resultados do Massive Search Engine
     if massive_search_data:
-        report += "## 🚀 DADOS DO MASSIVE SEARCH ENGINE\n\n"
+        write("## 🚀 DADOS DO MASSIVE SEARCH ENGINE\n\n")
         for i, massive_item in enumerate(massive_search_data, 1):
-            report += f"### Massive Search Result {i}\n\n"
-            if isinstance(massive_item, dict):
-                produto = massive_item.get('produto', 'N/A')
-                publico_alvo = massive_item.get('publico_alvo', 'N/A')
-                report += f"**Produto:** {produto}\n"
-                report += f"**Público Alvo:** {publico_alvo}\n"
-                busca_massiva = massive_item.get('busca_massiva', {})
-                if busca_massiva:
-                    alibaba_results = busca_massiva.get('alibaba_websailor_results', [])
-                    real_search_results = busca_massiva.get('real_search_orchestrator_results', [])
-                    report += f"**Resultados Alibaba WebSailor:** {len(alibaba_results)}\n"
-                    report += f"**Resultados Real Search:** {len(real_search_results)}\n"
-                    for j, alibaba_result in enumerate(alibaba_results[:3], 1):
-                        if isinstance(alibaba_result, dict):
-                            report += f"  - Alibaba {j}: {alibaba_result.get('query', 'N/A')}\n"
-                metadata = massive_item.get('metadata', {})
-                if metadata:
-                    report += f"**Total de Buscas:** {metadata.get('total_searches', 0)}\n"
-                    report += f"**Tamanho Final:** {metadata.get('size_kb', 0):.1f} KB\n"
-                    report += f"**APIs Utilizadas:** {len(metadata.get('apis_used', []))}\n"
-            report += "\n---\n\n"
+            if not isinstance(massive_item, dict):
+                write(f"### Massive Search Result {i}\n\n\n---\n\n")
+                continue
+            g = massive_item.get
+            write(f"### Massive Search Result {i}\n\n"
+                f"**Produto:** {g('produto', 'N/A')}\n"
+                f"**Público Alvo:** {g('publico_alvo', 'N/A')}\n")
+            busca_massiva = g('busca_massiva', {})
+            if busca_massiva:
+                alibaba_results = busca_massiva.get('alibaba_websailor_results', [])
+                real_search_results = busca_massiva.get('real_search_orchestrator_results', [])
+                write(f"**Resultados Alibaba WebSailor:** {len(alibaba_results)}\n"
+                    f"**Resultados Real Search:** {len(real_search_results)}\n")
+                for j, alibaba_result in enumerate(islice(alibaba_results, 3), 1):
+                    if isinstance(alibaba_result, dict):
+                        write(f"  - Alibaba {j}: {alibaba_result.get('query', 'N/A')}\n")
+            metadata = g('metadata', {})
+            if metadata:
+                write(f"**Total de Buscas:** {metadata.get('total_searches', 0)}\n"
+                    f"**Tamanho Final:** {metadata.get('size_kb', 0):.1f} KB\n"
+                    f"**APIs Utilizadas:** {len(metadata.get('apis_used', []))}\n")
+            write("\n---\n\n")
 
     # Adiciona resultados do YouTube
     youtube_results = search_results.get('youtube_results', [])
     if youtube_results:
-        report += "## 📺 RESULTADOS COMPLETOS DO YOUTUBE\n\n"
+        write("## 📺 RESULTADOS COMPLETOS DO YOUTUBE\n\n")
         for i, result in enumerate(youtube_results, 1):
-            report += f"### YouTube {i}: {result.get('title', 'Sem título')}\n\n"
-            report += f"**Canal:** {result.get('channel', 'N/A')}  \n"
-            report += f"**Views:** {safe_format_int(result.get('view_count', 'N/A'))}  \n"
-            report += f"**Likes:** {safe_format_int(result.get('like_count', 'N/A'))}  \n"
-            report += f"**Comentários:** {safe_format_int(result.get('comment_count', 'N/A'))}  \n"
-            report += f"**Score Viral:** {result.get('viral_score', 0):.2f}/10  \n"
-            report += f"**URL:** {result.get('url', 'N/A')}  \n"
-            description = result.get('description', '')
-            if description:
-                report += f"**Descrição:** {description}  \n"
-            report += "\n---\n\n"
+            g = result.get
+            description = g('description', '')
+            write(_YOUTUBE_ITEM_TPL.format(
+                i=i,
+                title=g('title', 'Sem título'),
+                channel=g('channel', 'N/A'),
+                views=_safe_format_int(g('view_count', 'N/A')),
+                likes=_safe_format_int(g('like_count', 'N/A')),
+                comments=_safe_format_int(g('comment_count', 'N/A')),
+                viral_score=g('viral_score', 0),
+                url=g('url', 'N/A'),
+                description=f"**Descrição:** {description}  \n" if description else ""
+            ))
 
     # Adiciona resultados de Redes Sociais
     social_results = search_results.get('social_results', [])
     if social_results:
-        report += "## 📱 RESULTADOS COMPLETOS DE REDES SOCIAIS\n\n"
+        write("## 📱 RESULTADOS COMPLETOS DE REDES SOCIAIS\n\n")
         for i, result in enumerate(social_results, 1):
-            report += f"### Social {i}: {result.get('title', 'Sem título')}\n\n"
-            report += f"**Plataforma:** {result.get('platform', 'N/A').title()}  \n"
-            report += f"**Autor:** {result.get('author', 'N/A')}  \n"
-            report += f"**Engajamento:** {result.get('viral_score', 0):.2f}/10  \n"
-            report += f"**URL:** {result.get('url', 'N/A')}  \n"
-            content = result.get('content', '')
-            if content:
-                report += f"**CONTEÚDO COMPLETO:** {content}  \n"
-            report += "\n---\n\n"
+            g = result.get
+            content = g('content', '')
+            write(_SOCIAL_ITEM_TPL.format(
+                i=i,
+                title=g('title', 'Sem título'),
+                platform=g('platform', 'N/A').title(),
+                author=g('author', 'N/A'),
+                viral_score=g('viral_score', 0),
+                url=g('url', 'N/A'),
+                content=_social_content_line(content)
+            ))
 
     # Adiciona Screenshots e Evidências Visuais
     screenshots = viral_analysis.get('screenshots_captured', [])
     if screenshots:
-        report += "## 📸 EVIDÊNCIAS VISUAIS COMPLETAS\n\n"
+        write("## 📸 EVIDÊNCIAS VISUAIS COMPLETAS\n\n")
         for i, screenshot in enumerate(screenshots, 1):
-            report += f"### Screenshot {i}: {screenshot.get('title', 'Sem título')}\n\n"
-            report += f"**Plataforma:** {screenshot.get('platform', 'N/A').title()}  \n"
-            report += f"**Score Viral:** {screenshot.get('viral_score', 0):.2f}/10  \n"
-            report += f"**URL Original:** {screenshot.get('url', 'N/A')}  \n"
-            metrics = screenshot.get('content_metrics', {})
+            g = screenshot.get
+            metrics = g('content_metrics', {})
+            metrics_lines = ""
             if metrics:
                 if 'views' in metrics:
-                    report += f"**Views:** {safe_format_int(metrics['views'])}  \n"
+                    metrics_lines += f"**Views:** {_safe_format_int(metrics['views'])}  \n"
                 if 'likes' in metrics:
-                    report += f"**Likes:** {safe_format_int(metrics['likes'])}  \n"
+                    metrics_lines += f"**Likes:** {_safe_format_int(metrics['likes'])}  \n"
                 if 'comments' in metrics:
-                    report += f"**Comentários:** {safe_format_int(metrics['comments'])}  \n"
-            img_path = screenshot.get('relative_path', '')
-            if img_path:
-                report += f"**Arquivo:** {img_path}  \n"
-            report += "\n---\n\n"
-
-    # Adiciona Contexto da Análise
-    report += "## 🎯 CONTEXTO COMPLETO DA ANÁLISE\n\n"
-    for key, value in context.items():
-        if value:
-            report += f"**{key.replace('_', ' ').title()}:** {value}  \n"
+                    metrics_lines += f"**Comentários:** {_safe_format_int(metrics['comments'])}  \n"
+            img_path = g('relative_path', '')
+            write(_SCREENSHOT_ITEM_TPL.format(
+                i=i,
+                title=g('title', 'Sem título'),
+                platform=g('platform', 'N/A').title(),
+                viral_score=g('viral_score', 0),
+                url=g('url', 'N/A'),
+                metrics=metrics_lines,
+                arquivo=f"**Arquivo:** {img_path}  \n" if img_path else ""
+            ))
+
+    # Adiciona Contexto da Análise (seção omitida quando não há nenhum valor preenchido)
+    context_items = [(key, value) for key, value in context.items() if value]
+    if context_items:
+        write("## 🎯 CONTEXTO COMPLETO DA ANÁLISE\n\n")
+        for key, value in context_items:
+            write(f"**{key.replace('_', ' ').title()}:** {value}  \n")
 
     # Estatísticas Finais
     total_content_chars = sum(len(str(excerpt.get('conteudo', ''))) for excerpt in all_saved_excerpts)
 
-    report += f"""
+    write(_REPORT_FOOTER.format(
+        excerpts=len(all_saved_excerpts),
+        viral=len(all_viral_data),
+        massive=len(massive_search_data),
+        total_chars=total_content_chars,
+        screenshots=len(screenshots),
+        web=len(search_results.get('web_results', [])),
+        youtube=len(search_results.get('youtube_results', [])),
+        social=len(search_results.get('social_results', [])),
+        generated_at=time.strftime('%d/%m/%Y %H:%M:%S')
+    ))
+
+def _generate_collection_report(
+    search_results: Dict[str, Any],
+    viral_analysis: Dict[str, Any],
+    session_id: str,
+    context: Dict[str, Any]
+) -> str:
+    """Gera relatório consolidado com dados extraídos"""
+    parts = []
+    _render_collection_report(parts.append, search_results, viral_analysis, session_id, context)
+    return "".join(parts)
+
+def _stream_collection_report(
+    search_results: Dict[str, Any],
+    viral_analysis: Dict[str, Any],
+    session_id: str,
+    context: Dict[str, Any]
+) -> str:
+    """Gera o relatório de coleta gravando direto em disco, sem montar a string inteira"""
+    session_dir = f"analyses_data/{session_id}"
+    os.makedirs(session_dir, exist_ok=True)
+    report_path = f"{session_dir}/relatorio_coleta.md"
+    # Grava em .tmp e renomeia: o status trata relatorio_coleta.md como etapa 1 concluída
+    tmp_path = f"{report_path}.tmp"
+
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            _render_collection_report(f.write, search_results, viral_analysis, session_id, context)
+        os.replace(tmp_path, report_path)
+    except OSError as e:
+        logger.error(f"❌ Erro ao salvar relatório de coleta: {e}")
+        _remove_silently(tmp_path)
+        return ""
+    except Exception:
+        _remove_silently(tmp_path)
+        raise
+
+    logger.info(f"✅ Relatório de coleta salvo: {report_path}")
+    return report_path
+
+def _remove_silently(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+_ETAPA1_PREFIXES = ("viral_results_", "trechos", "RES_BUSCA_", "consolidado", "etapa1_concluida_")
+_ETAPA1_TREE_PREFIXES = ("RES_BUSCA_", "consolidado")
 
----\n
-## 📊 ESTATÍSTICAS FINAIS CONSOLIDADAS\n
-- **Total de Trechos Extraídos:** {len(all_saved_excerpts)}\n- **Total de Dados Virais:** {len(all_viral_data)}\n- **Total de Dados Massive Search:** {len(massive_search_data)}\n- **Total de Caracteres de Conteúdo:** {total_content_chars:,}\n- **Total de Screenshots:** {len(screenshots)}\n- **Total de Resultados Web:** {len(search_results.get('web_results', []))}\n- **Total de Resultados YouTube:** {len(search_results.get('youtube_results', []))}\n- **Total de Resultados Sociais:** {len(search_results.get('social_results', []))}\n\n**🔥 GARANTIA: 100% DADOS REAIS - ZERO SIMULAÇÃO - TUDO CONSOLIDADO**\n\n---\n\n*Relatório ultra-consolidado gerado automaticamente em {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}*\n*Pronto para análise profunda pela IA QWEN via OpenRouter*\n"""
+def _listar_arquivos_etapa1(session_dir: str, workflow_dir: str) -> tuple:
+    """Agrupa por prefixo os JSONs da sessão, do workflow e de toda a árvore analyses_data"""
+    session_hits = {prefix: [] for prefix in _ETAPA1_PREFIXES}
+    workflow_hits = {prefix: [] for prefix in _ETAPA1_PREFIXES}
+    tree_hits = {prefix: [] for prefix in _ETAPA1_TREE_PREFIXES}
 
-    return report
+    try:
+        with os.scandir(workflow_dir) as entries:
+            for entry in entries:
+                prefix = _prefixo_json(entry.name, _ETAPA1_PREFIXES)
+                if prefix:
+                    workflow_hits[prefix].append(entry.path)
+    except FileNotFoundError:
+        pass
+
+    # os.walk percorre a raiz antes dos subdiretórios, como os globs raiz + ** faziam
+    for dirpath, dirnames, filenames in os.walk("analyses_data"):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        na_sessao = dirpath == session_dir
+        for name in filenames:
+            prefix = _prefixo_json(name, _ETAPA1_PREFIXES)
+            if not prefix:
+                continue
+            path = os.path.join(dirpath, name)
+            if na_sessao:
+                session_hits[prefix].append(path)
+            if prefix in tree_hits:
+                tree_hits[prefix].append(path)
+
+    return session_hits, workflow_hits, tree_hits
+
+def _prefixo_json(name: str, prefixes: tuple):
+    """Retorna o prefixo conhecido de um arquivo .json (None se não casar)"""
+    if name.endswith('.json') and name.startswith(prefixes):
+        for prefix in prefixes:
+            if name.startswith(prefix):
+                return prefix
+    return None
+
+def _sem_duplicatas(paths: List[str]) -> List[str]:
+    """Remove caminhos repetidos preservando a ordem"""
+    return list(dict.fromkeys(paths))
+
+# session_id fica entre as primeiras chaves dos JSONs de busca; 512 bytes bastam
+_HEAD_PEEK_BYTES = 512
+
+def _de_outra_sessao(path: str, session_id: str) -> bool:
+    """Lê só o cabeçalho do arquivo e indica se ele declara outra sessão"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(_HEAD_PEEK_BYTES)
+    except OSError:
+        return False
+    return b'"session_id"' in head and session_id.encode() not in head
+
+def _da_sessao(proprios: List[str], arvore: List[str], session_id: str) -> List[str]:
+    """Junta os arquivos da sessão aos da árvore, descartando os de outras sessões"""
+    caminhos = _sem_duplicatas(proprios + arvore)
+    vistos = set(proprios)
+    return [p for p in caminhos if p in vistos or not _de_outra_sessao(p, session_id)]
 
 def _gerar_consolidacao_final_etapa1(session_id: str, search_results: Dict, viral_analysis: Dict, massive_results: Dict) -> Dict[str, Any]:
     """Gera consolidação final de TODOS os dados coletados na Etapa 1"""
@@ -1001,98 +1595,50 @@ def _gerar_consolidacao_final_etapa1(session_id: str, search_results: Dict, vira
         }
 
         # BUSCAR E INCLUIR TODOS OS ARQUIVOS GERADOS NA ETAPA 1
-        import os
-        import glob
-        import json
-        
         # Diretório da sessão
         session_dir = f"analyses_data/{session_id}"
         workflow_dir = f"relatorios_intermediarios/workflow/{session_id}"
-        
-        # Buscar viral_results_*.json
+
+        # consolidado.json da sessão é gerado sob demanda a partir do consolidado.jsonl
         try:
-            viral_files = glob.glob(f"{session_dir}/viral_results_*.json") + glob.glob(f"{workflow_dir}/viral_results_*.json")
-            for file_path in viral_files:
-                if os.path.exists(file_path):
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        viral_data = json.load(f)
-                        consolidacao["viral_results_files"].append({
-                            "arquivo": os.path.basename(file_path),
-                            "caminho": file_path,
-                            "dados": viral_data
-                        })
+            aguardar_gravacoes(session_id)
+            auto_save_manager_instance.materializar_consolidado(session_id)
         except Exception as e:
-            logger.warning(f"⚠️ Erro ao carregar viral_results: {e}")
+            logger.warning(f"⚠️ Erro ao materializar consolidado: {e}")
+
+        # Uma única varredura por árvore no lugar de um glob por padrão
+        session_hits, workflow_hits, tree_hits = _listar_arquivos_etapa1(session_dir, workflow_dir)
+
+        def _incluir(destino: str, caminhos: List[str], rotulo: str):
+            # Leitura em lote no pool de I/O; para no primeiro erro como antes
+            for file_path, dados, erro in _load_json_files(caminhos):
+                if erro is not None:
+                    logger.warning(f"⚠️ Erro ao carregar {rotulo}: {erro}")
+                    break
+                consolidacao[destino].append({
+                    "arquivo": os.path.basename(file_path),
+                    "caminho": file_path,
+                    "dados": expandir_snapshot(dados)
+                })
+
+        # Buscar viral_results_*.json
+        _incluir("viral_results_files", session_hits["viral_results_"] + workflow_hits["viral_results_"], "viral_results")
 
         # Buscar trechos.json
-        try:
-            trechos_files = glob.glob(f"{session_dir}/trechos*.json") + glob.glob(f"{workflow_dir}/trechos*.json")
-            for file_path in trechos_files:
-                if os.path.exists(file_path):
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        trechos_data = json.load(f)
-                        consolidacao["trechos_extraidos"].append({
-                            "arquivo": os.path.basename(file_path),
-                            "caminho": file_path,
-                            "dados": trechos_data
-                        })
-        except Exception as e:
-            logger.warning(f"⚠️ Erro ao carregar trechos: {e}")
+        _incluir("trechos_extraidos", session_hits["trechos"] + workflow_hits["trechos"], "trechos")
 
-        # Buscar RES_BUSCA_*.json (incluindo diretório analyses_data raiz)
-        try:
-            res_busca_files = (
-                glob.glob(f"{session_dir}/RES_BUSCA_*.json") + 
-                glob.glob(f"{workflow_dir}/RES_BUSCA_*.json") +
-                glob.glob("analyses_data/RES_BUSCA_*.json") +
-                glob.glob(f"analyses_data/**/RES_BUSCA_*.json", recursive=True)
-            )
-            for file_path in res_busca_files:
-                if os.path.exists(file_path):
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        res_data = json.load(f)
-                        consolidacao["res_busca_files"].append({
-                            "arquivo": os.path.basename(file_path),
-                            "caminho": file_path,
-                            "dados": res_data
-                        })
-        except Exception as e:
-            logger.warning(f"⚠️ Erro ao carregar RES_BUSCA: {e}")
+        # Buscar RES_BUSCA_*.json (incluindo diretório analyses_data raiz e subdiretórios)
+        _incluir("res_busca_files", _da_sessao(
+            session_hits["RES_BUSCA_"] + workflow_hits["RES_BUSCA_"], tree_hits["RES_BUSCA_"], session_id
+        ), "RES_BUSCA")
 
         # Buscar consolidado.json (incluindo subdiretórios de analyses_data)
-        try:
-            consolidado_files = (
-                glob.glob(f"{session_dir}/consolidado*.json") + 
-                glob.glob(f"{workflow_dir}/consolidado*.json") +
-                glob.glob("analyses_data/consolidado*.json") +
-                glob.glob(f"analyses_data/**/consolidado*.json", recursive=True)
-            )
-            for file_path in consolidado_files:
-                if os.path.exists(file_path):
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        cons_data = json.load(f)
-                        consolidacao["consolidado_files"].append({
-                            "arquivo": os.path.basename(file_path),
-                            "caminho": file_path,
-                            "dados": cons_data
-                        })
-        except Exception as e:
-            logger.warning(f"⚠️ Erro ao carregar consolidado: {e}")
+        _incluir("consolidado_files", _da_sessao(
+            session_hits["consolidado"] + workflow_hits["consolidado"], tree_hits["consolidado"], session_id
+        ), "consolidado")
 
         # Buscar etapa1_concluida_*.json
-        try:
-            etapa1_files = glob.glob(f"{session_dir}/etapa1_concluida_*.json") + glob.glob(f"{workflow_dir}/etapa1_concluida_*.json")
-            for file_path in etapa1_files:
-                if os.path.exists(file_path):
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        etapa_data = json.load(f)
-                        consolidacao["etapa1_concluida_files"].append({
-                            "arquivo": os.path.basename(file_path),
-                            "caminho": file_path,
-                            "dados": etapa_data
-                        })
-        except Exception as e:
-            logger.warning(f"⚠️ Erro ao carregar etapa1_concluida: {e}")
+        _incluir("etapa1_concluida_files", session_hits["etapa1_concluida_"] + workflow_hits["etapa1_concluida_"], "etapa1_concluida")
 
         # Buscar relatorio_coleta.md
         try:
@@ -1136,224 +1682,251 @@ def _gerar_consolidacao_final_etapa1(session_id: str, search_results: Dict, vira
         return {"error": str(e), "session_id": session_id}
 
 
+# Quebras de linha viram espaço e \r é descartado em uma única passada
+_CLEAN_TABLE = str.maketrans({'\n': ' ', '\r': None})
+
+def _clean_text(text: str) -> str:
+    """Achata quebras de linha do texto para exibição em bloco de código"""
+    # translate só tem caminho rápido para texto ASCII; com acentos, replace encadeado é bem mais rápido
+    if text.isascii():
+        return text.translate(_CLEAN_TABLE).strip()
+    return text.replace('\n', ' ').replace('\r', '').strip()
+
 def _generate_content_excerpts_section(search_results: Dict[str, Any], viral_analysis: Dict[str, Any]) -> str:
     """Gera seção com trechos de conteúdo extraído das fontes coletadas"""
 
-    section = ""
+    parts = []
+    add = parts.append
 
     content_found = False
 
     # Extrai trechos dos resultados web
     web_results = search_results.get('web_results', [])
     if web_results:
-        section += "### Conteúdo Web Extraído:\n\n"
+        add("### Conteúdo Web Extraído:\n\n")
 
-        for i, result in enumerate(web_results[:10], 1):  # Limita a 10 resultados
-            content = result.get('content', '')
-            snippet = result.get('snippet', '')
-            title = result.get('title', 'Sem título')
-            url = result.get('url', 'N/A')
+        for i, result in enumerate(islice(web_results, 10), 1):  # Limita a 10 resultados
+            g = result.get
+            content = g('content', '')
+            snippet = g('snippet', '')
+            title = g('title', 'Sem título')
+            url = g('url', 'N/A')
 
             if content or snippet:
                 content_found = True
-                section += f"**{i}. {title}**\n"
-                section += f"*Fonte: {url}*\n\n"
-
-                # Usa conteúdo completo se disponível, senão usa snippet
-                text_to_show = content if content else snippet
-                if text_to_show:
-                    # Limpa e formata o texto
-                    clean_text = text_to_show.replace('\n', ' ').replace('\r', '').strip()
-                    # Mostra até 800 caracteres
-                    preview = clean_text[:800]
-                    section += f"```\n{preview}{'...' if len(clean_text) > 800 else ''}\n```\n\n"
+                # Usa conteúdo completo se disponível, senão usa snippet; mostra até 800 caracteres
+                clean_text = _clean_text(content or snippet)
+                add(f"**{i}. {title}**\n"
+                    f"*Fonte: {url}*\n\n"
+                    f"```\n{clean_text[:800]}{'...' if len(clean_text) > 800 else ''}\n```\n\n")
 
     # Extrai trechos dos resultados do YouTube
     youtube_results = search_results.get('youtube_results', [])
     if youtube_results:
-        section += "### Conteúdo YouTube Extraído:\n\n"
+        add("### Conteúdo YouTube Extraído:\n\n")
 
-        for i, result in enumerate(youtube_results[:5], 1):  # Limita a 5 resultados
-            description = result.get('description', '')
-            title = result.get('title', 'Sem título')
-            url = result.get('url', 'N/A')
+        for i, result in enumerate(islice(youtube_results, 5), 1):  # Limita a 5 resultados
+            g = result.get
+            description = g('description', '')
+            title = g('title', 'Sem título')
+            url = g('url', 'N/A')
 
             if description:
                 content_found = True
-                section += f"**{i}. {title}**\n"
-                section += f"*Fonte: {url}*\n\n"
-
                 # Limpa e formata a descrição
-                clean_desc = description.replace('\n', ' ').replace('\r', '').strip()
-                preview = clean_desc[:400]
-                section += f"```\n{preview}{'...' if len(clean_desc) > 400 else ''}\n```\n\n"
+                clean_desc = _clean_text(description)
+                add(f"**{i}. {title}**\n"
+                    f"*Fonte: {url}*\n\n"
+                    f"```\n{clean_desc[:400]}{'...' if len(clean_desc) > 400 else ''}\n```\n\n")
 
     # Extrai trechos dos resultados sociais
     social_results = search_results.get('social_results', [])
     if social_results:
-        section += "### Conteúdo Social Media Extraído:\n\n"
+        add("### Conteúdo Social Media Extraído:\n\n")
 
-        for i, result in enumerate(social_results[:5], 1):  # Limita a 5 resultados
-            content = result.get('content', '')
-            snippet = result.get('snippet', '')
-            title = result.get('title', 'Sem título')
-            url = result.get('url', 'N/A')
+        for i, result in enumerate(islice(social_results, 5), 1):  # Limita a 5 resultados
+            g = result.get
+            content = g('content', '')
+            snippet = g('snippet', '')
+            title = g('title', 'Sem título')
+            url = g('url', 'N/A')
 
             if content or snippet:
                 content_found = True
-                section += f"**{i}. {title}**\n"
-                section += f"*Fonte: {url}*\n\n"
-
-                text_to_show = content if content else snippet
-                if text_to_show:
-                    clean_text = text_to_show.replace('\n', ' ').replace('\r', '').strip()
-                    preview = clean_text[:600]
-                    section += f"```\n{preview}{'...' if len(clean_text) > 600 else ''}\n```\n\n"
+                clean_text = _clean_text(content or snippet)
+                add(f"**{i}. {title}**\n"
+                    f"*Fonte: {url}*\n\n"
+                    f"```\n{clean_text[:600]}{'...' if len(clean_text) > 600 else ''}\n```\n\n")
 
     if not content_found:
-        section += "⚠️ **Nenhum trecho de conteúdo extraído encontrado nos dados da sessão.**\n\n"
-        section += "*Nota: O sistema coletou metadados (títulos, URLs, estatísticas) mas não extraiu o conteúdo completo das páginas.*\n\n"
+        add("⚠️ **Nenhum trecho de conteúdo extraído encontrado nos dados da sessão.**\n\n"
+            "*Nota: O sistema coletou metadados (títulos, URLs, estatísticas) mas não extraiu o conteúdo completo das páginas.*\n\n")
+
+    return "".join(parts)
+
+_VIRAL_PREFIX = "viral_results_"
+_VIRAL_SUFFIX = ".json"
 
-    return section
+def _viral_result_entries() -> list:
+    """Lista os viral_results_*.json de viral_images_data com um único scandir"""
+    try:
+        with os.scandir("viral_images_data") as entries:
+            return [entry for entry in entries
+                    if entry.name.startswith(_VIRAL_PREFIX) and entry.name.endswith(_VIRAL_SUFFIX)]
+    except FileNotFoundError:
+        return []
+
+def _viral_paths_for_session(entries: list, session_id: str) -> List[str]:
+    """Equivale ao glob viral_results_*<sid[:8]>*.json sobre entradas já listadas"""
+    token = session_id[:8]
+    start, end = len(_VIRAL_PREFIX), -len(_VIRAL_SUFFIX)
+    return [entry.path for entry in entries if token in entry.name[start:end]]
 
 def _incorporate_viral_data(session_id: str, viral_analysis: Dict[str, Any]) -> str:
     """Incorpora automaticamente dados virais completos do arquivo viral_results_*.json"""
-    import glob
-    import json
-
-    viral_section = ""
+    parts = []
+    add = parts.append
 
     try:
-        # Procura arquivo viral_results na pasta viral_images_data
-        viral_files = glob.glob(f"viral_images_data/viral_results_*{session_id[:8]}*.json")
-        if not viral_files:
-            # Procura por qualquer arquivo viral recente
-            viral_files = glob.glob("viral_images_data/viral_results_*.json")
-            viral_files.sort(key=os.path.getmtime, reverse=True)
-            viral_files = viral_files[:1]  # Pega o mais recente
+        # Procura arquivo viral_results na pasta viral_images_data (uma única leitura do diretório)
+        all_viral_entries = _viral_result_entries()
+        viral_files = _viral_paths_for_session(all_viral_entries, session_id)
+        if not viral_files and all_viral_entries:
+            # Procura por qualquer arquivo viral recente (um stat por arquivo, sem ordenar tudo)
+            viral_files = [max(all_viral_entries, key=lambda entry: entry.stat().st_mtime).path]
 
         if viral_files:
-            with open(viral_files[0], 'r', encoding='utf-8') as f:
-                viral_data = json.load(f)
+            viral_data = _load_json_file(viral_files[0])
 
-            viral_section += "---\n\n## ANÁLISE DE CONTEÚDO VIRAL COMPLETA\n\n"
+            add("---\n\n## ANÁLISE DE CONTEÚDO VIRAL COMPLETA\n\n")
 
             # Estatísticas gerais
             stats = viral_data.get('statistics', {})
-            viral_section += "### Métricas de Engajamento:\n"
-            viral_section += f"- **Total de Conteúdo Analisado:** {stats.get('total_content_analyzed', 0)} posts\n"
-            viral_section += f"- **Conteúdo Viral Identificado:** {stats.get('viral_content_count', 0)} posts\n"
-            viral_section += f"- **Score Total de Engajamento:** {stats.get('total_engagement_score', 0)} pontos\n"
-            viral_section += f"- **Engajamento Médio:** {stats.get('average_engagement', 0):.1f} pontos\n"
-            viral_section += f"- **Maior Engajamento:** {stats.get('max_engagement', 0)} pontos\n"
-            viral_section += f"- **Visualizações Estimadas:** {stats.get('total_views', 0):,}\n"
-            viral_section += f"- **Likes Estimados:** {stats.get('total_likes', 0):,}\n\n"
+            g = stats.get
+            add("### Métricas de Engajamento:\n"
+                f"- **Total de Conteúdo Analisado:** {g('total_content_analyzed', 0)} posts\n"
+                f"- **Conteúdo Viral Identificado:** {g('viral_content_count', 0)} posts\n"
+                f"- **Score Total de Engajamento:** {g('total_engagement_score', 0)} pontos\n"
+                f"- **Engajamento Médio:** {g('average_engagement', 0):.1f} pontos\n"
+                f"- **Maior Engajamento:** {g('max_engagement', 0)} pontos\n"
+                f"- **Visualizações Estimadas:** {g('total_views', 0):,}\n"
+                f"- **Likes Estimados:** {g('total_likes', 0):,}\n\n")
 
             # Distribuição por plataforma
             platform_stats = viral_data.get('platform_distribution', {})
             if platform_stats:
-                viral_section += "### Distribuição por Plataforma:\n"
+                add("### Distribuição por Plataforma:\n")
                 for platform, data in platform_stats.items():
-                    viral_section += f"- **{platform.title()}:** {data.get('count', 0)} posts "
-                    viral_section += f"({data.get('engagement', 0)} engajamento, "
-                    viral_section += f"{data.get('views', 0):,} views, "
-                    viral_section += f"{data.get('likes', 0):,} likes)\n"
-                viral_section += "\n"
+                    g = data.get
+                    add(f"- **{platform.title()}:** {g('count', 0)} posts "
+                        f"({g('engagement', 0)} engajamento, "
+                        f"{g('views', 0):,} views, "
+                        f"{g('likes', 0):,} likes)\n")
+                add("\n")
 
             # Insights de conteúdo viral
             insights = viral_data.get('viral_insights', [])
             if insights:
-                viral_section += "### Insights de Conteúdo Viral:\n"
+                add("### Insights de Conteúdo Viral:\n")
                 for insight in insights:
-                    viral_section += f"- {insight}\n"
-                viral_section += "\n"
+                    add(f"- {insight}\n")
+                add("\n")
 
             # Imagens extraídas
             images = viral_data.get('images_extracted', [])
             if images:
-                viral_section += f"### Imagens Extraídas ({len(images)} total):\n"
-                for i, img in enumerate(images[:10], 1):  # Mostra até 10 imagens
-                    viral_section += f"**{i}.** {img.get('title', 'Sem título')} "
-                    viral_section += f"(Score: {img.get('viral_score', 0):.1f}) - "
-                    viral_section += f"{img.get('platform', 'N/A')}\n"
-                viral_section += "\n"
+                add(f"### Imagens Extraídas ({len(images)} total):\n")
+                for i, img in enumerate(islice(images, 10), 1):  # Mostra até 10 imagens
+                    g = img.get
+                    add(f"**{i}.** {g('title', 'Sem título')} "
+                        f"(Score: {g('viral_score', 0):.1f}) - "
+                        f"{g('platform', 'N/A')}\n")
+                add("\n")
 
             # Screenshots capturados
             screenshots = viral_data.get('screenshots_captured', [])
             if screenshots:
-                viral_section += f"### Screenshots Capturados ({len(screenshots)} total):\n"
-                for i, shot in enumerate(screenshots[:10], 1):  # Mostra até 10 screenshots
-                    viral_section += f"**{i}.** {shot.get('title', 'Sem título')} "
-                    viral_section += f"(Score: {shot.get('viral_score', 0):.1f}) - "
-                    viral_section += f"{shot.get('platform', 'N/A')}\n"
-                viral_section += "\n"
+                add(f"### Screenshots Capturados ({len(screenshots)} total):\n")
+                for i, shot in enumerate(islice(screenshots, 10), 1):  # Mostra até 10 screenshots
+                    g = shot.get
+                    add(f"**{i}.** {g('title', 'Sem título')} "
+                        f"(Score: {g('viral_score', 0):.1f}) - "
+                        f"{g('platform', 'N/A')}\n")
+                add("\n")
 
             logger.info(f"✅ Dados virais incorporados automaticamente do arquivo: {viral_files[0]}")
 
         else:
-            viral_section += "---\n\n## ANÁLISE DE CONTEÚDO VIRAL\n\n"
-            viral_section += "*Nenhum arquivo de dados virais encontrado para incorporação automática.*\n\n"
+            add("---\n\n## ANÁLISE DE CONTEÚDO VIRAL\n\n"
+                "*Nenhum arquivo de dados virais encontrado para incorporação automática.*\n\n")
             logger.warning("⚠️ Nenhum arquivo viral_results_*.json encontrado para incorporação")
 
     except Exception as e:
         logger.error(f"❌ Erro ao incorporar dados virais: {e}")
-        viral_section += "---\n\n## ANÁLISE DE CONTEÚDO VIRAL\n\n"
-        viral_section += "*Erro ao carregar dados virais automaticamente.*\n\n"
+        add("---\n\n## ANÁLISE DE CONTEÚDO VIRAL\n\n"
+            "*Erro ao carregar dados virais automaticamente.*\n\n")
 
-    return viral_section
-
-def _save_collection_report(report_content: str, session_id: str):
-    """Salva relatório de coleta"""
-    try:
-        session_dir = f"analyses_data/{session_id}"
-        os.makedirs(session_dir, exist_ok=True)
-
-        report_path = f"{session_dir}/relatorio_coleta.md"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(report_content)
-
-        logger.info(f"✅ Relatório de coleta salvo: {report_path}")
-
-    except Exception as e:
-        logger.error(f"❌ Erro ao salvar relatório de coleta: {e}")
+    return "".join(parts)
 
 
 # --- Funções para carregar todos os dados salvos ---
 
+def _ler_manifesto(session_id: str) -> Dict[str, List[str]]:
+    """Lê analyses_data/<sid>/manifest.jsonl e agrupa os caminhos por tipo (vazio se não houver)"""
+    manifesto: Dict[str, List[str]] = {}
+    try:
+        with open(os.path.join("analyses_data", session_id, "manifest.jsonl"), 'rb') as f:
+            linhas = f.read().splitlines()
+    except OSError:
+        return manifesto
+    loads = orjson.loads if HAS_ORJSON else json.loads
+    for linha in linhas:
+        try:
+            item = loads(linha)
+            manifesto.setdefault(item['tipo'], []).append(item['caminho'])
+        except Exception:
+            continue
+    # Um arquivo regravado aparece uma vez só
+    return {tipo: list(dict.fromkeys(caminhos)) for tipo, caminhos in manifesto.items()}
+
 def _load_all_saved_excerpts(session_id: str) -> List[Dict[str, Any]]:
     """Carrega TODOS os trechos de pesquisa web salvos para a sessão com CONSOLIDAÇÃO MÁXIMA"""
     excerpts = []
     urls_processadas = set()
 
     try:
-        # 1. Carrega arquivo consolidado primeiro (prioridade)
-        consolidado_path = os.path.join("analyses_data", "pesquisa_web", session_id, "consolidado.json")
-        if os.path.exists(consolidado_path):
-            try:
-                with open(consolidado_path, 'r', encoding='utf-8') as f:
-                    consolidado = json.load(f)
-                    for trecho in consolidado.get('trechos', []):
-                        if trecho.get('url') not in urls_processadas:
-                            excerpts.append(trecho)
-                            urls_processadas.add(trecho.get('url'))
+        # Trechos ainda na fila de gravação do AutoSaveManager precisam estar em disco
+        aguardar_gravacoes(session_id)
+
+        # 1. Carrega arquivo consolidado primeiro (prioridade), gerado a partir do log de trechos
+        try:
+            consolidado = auto_save_manager_instance.materializar_consolidado(session_id)
+            if consolidado:
+                for trecho in consolidado.get('trechos', []):
+                    if trecho.get('url') not in urls_processadas:
+                        excerpts.append(trecho)
+                        urls_processadas.add(trecho.get('url'))
                 logger.info(f"✅ {len(excerpts)} trechos carregados do arquivo consolidado")
-            except Exception as e:
-                logger.error(f"❌ Erro ao carregar arquivo consolidado: {e}")
+        except Exception as e:
+            logger.error(f"❌ Erro ao carregar arquivo consolidado: {e}")
 
-        # 2. Diretório de trechos da sessão
+        # 2. Trechos da sessão: manifesto quando existir, senão varredura do diretório
         excerpts_dir = os.path.join("analyses_data", "pesquisa_web", session_id)
-        if os.path.exists(excerpts_dir):
-            for filename in os.listdir(excerpts_dir):
-                if filename.startswith('trecho_') and filename.endswith('.json') and filename != 'consolidado.json':
-                    file_path = os.path.join(excerpts_dir, filename)
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            excerpt_data = json.load(f)
-                            if excerpt_data.get('url') not in urls_processadas:
-                                excerpts.append(excerpt_data)
-                                urls_processadas.add(excerpt_data.get('url'))
-                    except Exception as e:
-                        logger.warning(f"⚠️ Erro ao carregar trecho {filename}: {e}")
+        paths = _ler_manifesto(session_id).get('pesquisa_web')
+        if paths is None and os.path.exists(excerpts_dir):
+            with os.scandir(excerpts_dir) as entries:
+                paths = [entry.path for entry in entries
+                         if entry.name.startswith('trecho_') and entry.name.endswith('.json')]
+        if paths:
+            for file_path, excerpt_data, error in _load_json_files(paths):
+                try:
+                    if error is not None:
+                        raise error
+                    if excerpt_data.get('url') not in urls_processadas:
+                        excerpts.append(excerpt_data)
+                        urls_processadas.add(excerpt_data.get('url'))
+                except Exception as e:
+                    logger.warning(f"⚠️ Erro ao carregar trecho {os.path.basename(file_path)}: {e}")
 
     except Exception as e:
         logger.error(f"❌ Erro ao carregar todos os trechos salvos: {e}")
@@ -1364,13 +1937,12 @@ def _load_all_viral_data(session_id: str) -> List[Dict[str, Any]]:
     """Carrega TODOS os dados virais salvos para a sessão"""
     viral_data = []
     try:
-        viral_files = glob.glob(f"viral_images_data/viral_results_*{session_id[:8]}*.json")
-        for file_path in viral_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    viral_data.append(json.load(f))
-            except Exception as e:
-                logger.warning(f"⚠️ Erro ao carregar arquivo viral {file_path}: {e}")
+        viral_files = _viral_paths_for_session(_viral_result_entries(), session_id)
+        for file_path, data, error in _load_json_files(viral_files):
+            if error is not None:
+                logger.warning(f"⚠️ Erro ao carregar arquivo viral {file_path}: {error}")
+            else:
+                viral_data.append(data)
     except Exception as e:
         logger.error(f"❌ Erro ao carregar todos os dados virais: {e}")
     return viral_data
@@ -1382,14 +1954,13 @@ def _load_massive_search_data(session_id: str) -> List[Dict[str, Any]]:
         # Assume que os resultados do massive search engine são salvos em analyses_data/massive_search/{session_id}/...
         massive_search_dir = os.path.join("analyses_data", "massive_search", session_id)
         if os.path.exists(massive_search_dir):
-            for filename in os.listdir(massive_search_dir):
-                if filename.endswith('.json'):
-                    file_path = os.path.join(massive_search_dir, filename)
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            massive_data.append(json.load(f))
-                    except Exception as e:
-                        logger.warning(f"⚠️ Erro ao carregar arquivo massive search {file_path}: {e}")
+            with os.scandir(massive_search_dir) as entries:
+                paths = [entry.path for entry in entries if entry.name.endswith('.json')]
+            for file_path, data, error in _load_json_files(paths):
+                if error is not None:
+                    logger.warning(f"⚠️ Erro ao carregar arquivo massive search {file_path}: {error}")
+                else:
+                    massive_data.append(data)
     except Exception as e:
         logger.error(f"❌ Erro ao carregar todos os dados do massive search: {e}")
     return massive_data
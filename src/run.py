@@ -45,6 +45,9 @@ def create_app():
     app.config['DEBUG'] = debug
     app.config['TESTING'] = False
 
+    # Entrega de arquivos via X-Sendfile (só quando há proxy reverso que honre o cabeçalho)
+    app.config['USE_X_SENDFILE'] = os.getenv('USE_X_SENDFILE', 'false').lower() == 'true'
+
     # Configuração de logging para produção
     if FLASK_ENV == 'production':
         logging.basicConfig(
@@ -15,10 +15,12 @@ import re
 import asyncio
 import ssl
 import hashlib
+import importlib.util
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 from urllib.parse import quote_plus, urljoin, urlparse, parse_qs, unquote
 from dataclasses import dataclass, asdict
+from contextlib import asynccontextmanager
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from bs4 import BeautifulSoup
@@ -43,12 +45,9 @@ except ImportError:
     HAS_GEMINI = False
     logger.warning("google-generativeai não encontrado.")
 
-# Import condicional do Playwright
-try:
-    from playwright.async_api import async_playwright, Page, Browser, BrowserContext
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+# Playwright é pesado de importar: aqui só verifica se está instalado; o import acontece no uso
+PLAYWRIGHT_AVAILABLE = importlib.util.find_spec('playwright') is not None
+if not PLAYWRIGHT_AVAILABLE:
     logger.warning("Playwright não encontrado. Instale com 'pip install playwright' para funcionalidades avançadas.")
 
 # Imports assíncronos
@@ -75,6 +74,57 @@ except ImportError:
     logger.warning("BeautifulSoup4 não encontrado.")
 
 
+# Padrões de URL pré-compilados (usados por ViralImageFinder a cada resultado de busca)
+_URL_SOCIAL_VALIDA = re.compile('|'.join([
+    r'instagram\.com/(p|reel)/',
+    r'facebook\.com/.+/posts/',
+    r'facebook\.com/.+/photos/',
+    r'm\.facebook\.com/',
+    r'youtube\.com/watch',
+    r'instagram\.com/[^/]+/$'  # Perfis do Instagram
+]))
+
+# URLs que claramente não são imagens
+_URL_NAO_IMAGEM = re.compile('|'.join([
+    r'instagram\.com/accounts/login',
+    r'facebook\.com/login',
+    r'login\.php',
+    r'/login/',
+    r'/auth/',
+    r'accounts/login',
+    r'\.html$',
+    r'\.php$',
+    r'\.jsp$',
+    r'\.asp$'
+]), re.IGNORECASE)
+
+# URLs que provavelmente são imagens
+_URL_IMAGEM = re.compile('|'.join([
+    r'\.(jpg|jpeg|png|gif|webp|bmp|svg)(\?|$)',
+    r'scontent.*\.jpg',
+    r'scontent.*\.png',
+    r'cdninstagram\.com',
+    r'fbcdn\.net',
+    r'instagram\.com.*\.(jpg|png|webp)',
+    r'facebook\.com.*\.(jpg|png|webp)',
+    r'lookaside\.instagram\.com',  # URLs de widget/crawler do Instagram
+    r'instagram\.com/seo/',        # URLs SEO do Instagram
+    r'media_id=\d+',              # URLs com media_id (Instagram)
+    r'graph\.instagram\.com',     # Graph API do Instagram
+    r'img\.youtube\.com',         # Thumbnails do YouTube
+    r'i\.ytimg\.com',            # Thumbnails alternativos do YouTube
+    r'youtube\.com.*\.(jpg|png|webp)',  # Imagens do YouTube
+    r'googleusercontent\.com',    # Imagens do Google
+    r'ggpht\.com',               # Google Photos/YouTube
+    r'ytimg\.com',               # YouTube images
+    r'licdn\.com',               # LinkedIn CDN
+    r'linkedin\.com.*\.(jpg|png|webp)',  # LinkedIn images
+    r'sssinstagram\.com',        # SSS Instagram downloader
+    r'scontent-.*\.cdninstagram\.com',  # Instagram CDN específico
+    r'scontent\..*\.fbcdn\.net'  # Facebook CDN específico
+]), re.IGNORECASE)
+
+
 @dataclass
 class ViralImage:
     """Estrutura de dados para imagem viral"""
@@ -111,6 +161,12 @@ class ViralImageFinder:
         self.failed_apis = set()  # APIs que falharam recentemente
         self.instagram_session_cookie = self.config.get('instagram_session_cookie')
         self.playwright_enabled = self.config.get('playwright_enabled', True) and PLAYWRIGHT_AVAILABLE
+        # Recursos compartilhados por loop, só dentro de `async with finder:` (fora dele cada chamada abre e fecha os seus)
+        self._recursos_por_loop: Dict[Any, Dict[str, Any]] = {}
+        # URLs já baixadas nesta execução -> caminho local (a mesma imagem de CDN aparece em várias buscas)
+        self._downloaded_images: Dict[str, str] = {}
+        # Subpastas de images_dir já criadas (evita makedirs repetido)
+        self._image_shards = set()
         # Configurar diretórios necessários
         self._ensure_directories()
         # Configurar sessão HTTP síncrona para fallbacks
@@ -282,6 +338,11 @@ class ViralImageFinder:
 
     async def search_images(self, query: str) -> List[Dict]:
         """Busca imagens usando múltiplos provedores com estratégia aprimorada"""
+        # Escopo da busca: sessão de download e Chromium são compartilhados e fechados ao final
+        async with self:
+            return await self._search_images(query)
+
+    async def _search_images(self, query: str) -> List[Dict]:
         all_results = []
         # Queries mais específicas e eficazes para conteúdo educacional
         queries = [
@@ -402,29 +463,22 @@ class ViralImageFinder:
             elif 'linkedin.com' in page_url:
                 linkedin_urls.append(page_url)
 
-        # Extração direta do Instagram
-        for insta_url in list(set(instagram_urls))[:5]:  # Limitar a 5 URLs
-            try:
-                direct_results = await self._extract_instagram_direct(insta_url)
-                direct_extraction_results.extend(direct_results)
-            except Exception as e:
-                logger.warning(f"Erro extração direta Instagram {insta_url}: {e}")
+        # Extração direta em paralelo (limitada por semáforo), preservando a ordem Instagram → Facebook → LinkedIn
+        sem = asyncio.Semaphore(8)
 
-        # Extração direta do Facebook
-        for fb_url in list(set(facebook_urls))[:3]:  # Limitar a 3 URLs
-            try:
-                direct_results = await self._extract_facebook_direct(fb_url)
-                direct_extraction_results.extend(direct_results)
-            except Exception as e:
-                logger.warning(f"Erro extração direta Facebook {fb_url}: {e}")
+        async def _extrair(extrator, url: str, rede: str) -> List[Dict]:
+            async with sem:
+                try:
+                    return await extrator(url)
+                except Exception as e:
+                    logger.warning(f"Erro extração direta {rede} {url}: {e}")
+                    return []
 
-        # Extração direta do LinkedIn
-        for li_url in list(set(linkedin_urls))[:3]:  # Limitar a 3 URLs
-            try:
-                direct_results = await self._extract_linkedin_direct(li_url)
-                direct_extraction_results.extend(direct_results)
-            except Exception as e:
-                logger.warning(f"Erro extração direta LinkedIn {li_url}: {e}")
+        tarefas = [_extrair(self._extract_instagram_direct, u, 'Instagram') for u in list(set(instagram_urls))[:5]]  # Limitar a 5 URLs
+        tarefas += [_extrair(self._extract_facebook_direct, u, 'Facebook') for u in list(set(facebook_urls))[:3]]  # Limitar a 3 URLs
+        tarefas += [_extrair(self._extract_linkedin_direct, u, 'LinkedIn') for u in list(set(linkedin_urls))[:3]]  # Limitar a 3 URLs
+        for direct_results in await asyncio.gather(*tarefas):
+            direct_extraction_results.extend(direct_results)
 
         # Adicionar resultados de extração direta
         all_results.extend(direct_extraction_results)
@@ -442,15 +496,7 @@ class ViralImageFinder:
 
     def _is_valid_social_url(self, url: str) -> bool:
         """Verifica se é uma URL válida de rede social"""
-        valid_patterns = [
-            r'instagram\.com/(p|reel)/',
-            r'facebook\.com/.+/posts/',
-            r'facebook\.com/.+/photos/',
-            r'm\.facebook\.com/',
-            r'youtube\.com/watch',
-            r'instagram\.com/[^/]+/$'  # Perfis do Instagram
-        ]
-        return any(re.search(pattern, url) for pattern in valid_patterns)
+        return _URL_SOCIAL_VALIDA.search(url) is not None
 
     def _is_valid_image_url(self, url: str) -> bool:
         """Verifica se a URL parece ser de uma imagem real"""
@@ -458,49 +504,11 @@ class ViralImageFinder:
             return False
 
         # URLs que claramente não são imagens
-        invalid_patterns = [
-            r'instagram\.com/accounts/login',
-            r'facebook\.com/login',
-            r'login\.php',
-            r'/login/',
-            r'/auth/',
-            r'accounts/login',
-            r'\.html$',
-            r'\.php$',
-            r'\.jsp$',
-            r'\.asp$'
-        ]
-
-        if any(re.search(pattern, url, re.IGNORECASE) for pattern in invalid_patterns):
+        if _URL_NAO_IMAGEM.search(url):
             return False
 
         # URLs que provavelmente são imagens
-        valid_patterns = [
-            r'\.(jpg|jpeg|png|gif|webp|bmp|svg)(\?|$)',
-            r'scontent.*\.jpg',
-            r'scontent.*\.png',
-            r'cdninstagram\.com',
-            r'fbcdn\.net',
-            r'instagram\.com.*\.(jpg|png|webp)',
-            r'facebook\.com.*\.(jpg|png|webp)',
-            r'lookaside\.instagram\.com',  # URLs de widget/crawler do Instagram
-            r'instagram\.com/seo/',        # URLs SEO do Instagram
-            r'media_id=\d+',              # URLs com media_id (Instagram)
-            r'graph\.instagram\.com',     # Graph API do Instagram
-            r'img\.youtube\.com',         # Thumbnails do YouTube
-            r'i\.ytimg\.com',            # Thumbnails alternativos do YouTube
-            r'youtube\.com.*\.(jpg|png|webp)',  # Imagens do YouTube
-            r'googleusercontent\.com',    # Imagens do Google
-            r'ggpht\.com',               # Google Photos/YouTube
-            r'ytimg\.com',               # YouTube images
-            r'licdn\.com',               # LinkedIn CDN
-            r'linkedin\.com.*\.(jpg|png|webp)',  # LinkedIn images
-            r'sssinstagram\.com',        # SSS Instagram downloader
-            r'scontent-.*\.cdninstagram\.com',  # Instagram CDN específico
-            r'scontent\..*\.fbcdn\.net'  # Facebook CDN específico
-        ]
-
-        return any(re.search(pattern, url, re.IGNORECASE) for pattern in valid_patterns)
+        return _URL_IMAGEM.search(url) is not None
 
     async def _search_serper_advanced(self, query: str) -> List[Dict]:
         """Busca avançada usando Serper com rotação automática de APIs"""
@@ -1340,6 +1348,11 @@ class ViralImageFinder:
 
     async def analyze_post_engagement(self, post_url: str, platform: str) -> Dict:
         """Analisa engajamento com estratégia corrigida e rotação de APIs"""
+        # Escopo da análise: o Chromium do fallback Playwright é reaproveitado e fechado ao final
+        async with self:
+            return await self._analyze_post_engagement(post_url, platform)
+
+    async def _analyze_post_engagement(self, post_url: str, platform: str) -> Dict:
         # Para Instagram, tentar Apify primeiro com rotação automática
         if platform == 'instagram' and ('/p/' in post_url or '/reel/' in post_url):
             try:
@@ -1590,20 +1603,7 @@ class ViralImageFinder:
             return None
         logger.info(f"🎭 Análise Playwright robusta para {post_url}")
         try:
-            async with async_playwright() as p:
-                # Configuração mais agressiva do browser
-                browser = await p.chromium.launch(
-                    headless=self.config['headless'],
-                    args=[
-                        '--no-sandbox',
-                        '--disable-setuid-sandbox',
-                        '--disable-web-security',
-                        '--disable-features=VizDisplayCompositor',
-                        '--disable-extensions',
-                        '--no-first-run',
-                        '--disable-default-apps'
-                    ]
-                )
+            async with self._navegador() as browser:
                 # Context com configurações específicas para redes sociais
                 context = await browser.new_context(
                     user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/53.36',
@@ -1617,79 +1617,81 @@ class ViralImageFinder:
                         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
                     }
                 )
-                page = await context.new_page()
-                page.set_default_timeout(12000)  # 12 segundos timeout fixo
-                # Bloquear requests desnecessários que causam popups
-                await page.route('**/*', lambda route: (
-                    route.abort() if any(blocked in route.request.url for blocked in [
-                        'login', 'signin', 'signup', 'auth', 'oauth',
-                        'tracking', 'analytics', 'ads', 'advertising'
-                    ]) else route.continue_()
-                ))
-                # Navegar com estratégia específica por plataforma
-                if platform == 'instagram':
-                    # Para Instagram, múltiplas estratégias para evitar login
-                    navigation_success = False
-                    strategies = [
-                        # Estratégia 1: Embed (sem login)
-                        lambda url: url + 'embed/' if ('/p/' in url or '/reel/' in url) else url,
-                        # Estratégia 2: URL normal com parâmetros para evitar login
-                        lambda url: url + '?__a=1&__d=dis',
-                        # Estratégia 3: URL normal
-                        lambda url: url
-                    ]
-
-                    for i, strategy in enumerate(strategies):
-                        try:
-                            target_url = strategy(post_url)
-                            await page.goto(target_url, wait_until='domcontentloaded', timeout=15000)
-                            logger.info(f"✅ Instagram navegação estratégia {i+1}: {target_url}")
-                            navigation_success = True
-                            break
-                        except Exception as e:
-                            logger.warning(f"Estratégia {i+1} falhou: {e}")
-                            continue
-
-                    if not navigation_success:
-                        logger.error("❌ Todas as estratégias de navegação falharam")
-                        return None
-                else:
-                    # Para outras plataformas, acesso normal
-                    await page.goto(post_url, wait_until='domcontentloaded', timeout=15000)
-                # Aguardar carregamento inicial
-                await asyncio.sleep(3)
-                # Múltiplas tentativas de fechar popups
-                for attempt in range(3):
-                    await self._close_common_popups(page, platform)
-                    await asyncio.sleep(1)
-                    # Verificar se ainda há popups visíveis
-                    popup_indicators = [
-                        'div[role="dialog"]',
-                        '[data-testid="loginForm"]',
-                        'form[method="post"]',
-                        'input[name="username"]',
-                        'input[name="email"]'
-                    ]
-                    has_popup = False
-                    for indicator in popup_indicators:
-                        try:
-                            element = await page.query_selector(indicator)
-                            if element and await element.is_visible():
-                                has_popup = True
+                try:
+                    page = await context.new_page()
+                    page.set_default_timeout(12000)  # 12 segundos timeout fixo
+                    # Bloquear requests desnecessários que causam popups e mídia pesada (só lemos texto/atributos)
+                    await page.route('**/*', lambda route: (
+                        route.abort() if route.request.resource_type in ('image', 'media', 'font') or any(blocked in route.request.url for blocked in [
+                            'login', 'signin', 'signup', 'auth', 'oauth',
+                            'tracking', 'analytics', 'ads', 'advertising'
+                        ]) else route.continue_()
+                    ))
+                    # Navegar com estratégia específica por plataforma
+                    if platform == 'instagram':
+                        # Para Instagram, múltiplas estratégias para evitar login
+                        navigation_success = False
+                        strategies = [
+                            # Estratégia 1: Embed (sem login)
+                            lambda url: url + 'embed/' if ('/p/' in url or '/reel/' in url) else url,
+                            # Estratégia 2: URL normal com parâmetros para evitar login
+                            lambda url: url + '?__a=1&__d=dis',
+                            # Estratégia 3: URL normal
+                            lambda url: url
+                        ]
+
+                        for i, strategy in enumerate(strategies):
+                            try:
+                                target_url = strategy(post_url)
+                                await page.goto(target_url, wait_until='domcontentloaded', timeout=15000)
+                                logger.info(f"✅ Instagram navegação estratégia {i+1}: {target_url}")
+                                navigation_success = True
                                 break
-                        except:
-                            continue
-                    if not has_popup:
-                        logger.info(f"✅ Popups removidos na tentativa {attempt + 1}")
-                        break
+                            except Exception as e:
+                                logger.warning(f"Estratégia {i+1} falhou: {e}")
+                                continue
+
+                        if not navigation_success:
+                            logger.error("❌ Todas as estratégias de navegação falharam")
+                            return None
                     else:
-                        logger.warning(f"⚠️ Popup ainda presente, tentativa {attempt + 1}")
-                # Aguardar estabilização da página
-                await asyncio.sleep(2)
-                # Extrair dados específicos da plataforma
-                engagement_data = await self._extract_platform_data(page, platform)
-                await browser.close()
-                return engagement_data
+                        # Para outras plataformas, acesso normal
+                        await page.goto(post_url, wait_until='domcontentloaded', timeout=15000)
+                    # Aguardar carregamento inicial do conteúdo principal, no máximo 3s
+                    await self._wait_for_content(page, 'article, main, [role="main"]')
+                    # Múltiplas tentativas de fechar popups
+                    for attempt in range(3):
+                        await self._close_common_popups(page, platform)
+                        await asyncio.sleep(1)
+                        # Verificar se ainda há popups visíveis
+                        popup_indicators = [
+                            'div[role="dialog"]',
+                            '[data-testid="loginForm"]',
+                            'form[method="post"]',
+                            'input[name="username"]',
+                            'input[name="email"]'
+                        ]
+                        has_popup = False
+                        for indicator in popup_indicators:
+                            try:
+                                element = await page.query_selector(indicator)
+                                if element and await element.is_visible():
+                                    has_popup = True
+                                    break
+                            except:
+                                continue
+                        if not has_popup:
+                            logger.info(f"✅ Popups removidos na tentativa {attempt + 1}")
+                            break
+                        else:
+                            logger.warning(f"⚠️ Popup ainda presente, tentativa {attempt + 1}")
+                    # Aguardar estabilização da página
+                    await asyncio.sleep(2)
+                    # Extrair dados específicos da plataforma
+                    engagement_data = await self._extract_platform_data(page, platform)
+                    return engagement_data
+                finally:
+                    await context.close()
         except Exception as e:
             logger.error(f"❌ Erro na análise Playwright robusta: {e}")
             return None
@@ -2041,6 +2043,20 @@ class ViralImageFinder:
         })
         return platform_data
 
+    def _image_shard_dir(self, url: str) -> str:
+        """Subpasta de images_dir pelos 2 primeiros hex do hash da URL, para não acumular tudo num só diretório"""
+        shard_dir = os.path.join(self.config['images_dir'], hashlib.md5(url.encode()).hexdigest()[:2])
+        if shard_dir not in self._image_shards:
+            os.makedirs(shard_dir, exist_ok=True)
+            self._image_shards.add(shard_dir)
+        return shard_dir
+
+    def _prepare_image_filepath(self, image_url: str, content_type: str) -> str:
+        """Monta o caminho de destino da imagem (nome único dentro da subpasta da URL)"""
+        filename = os.path.basename(urlparse(image_url).path) or 'image'
+        filename = self._generate_unique_filename(filename, content_type, image_url)
+        return os.path.join(self._image_shard_dir(image_url), filename)
+
     def _generate_unique_filename(self, base_name: str, content_type: str, url: str) -> str:
         """Gera nome de arquivo único e seguro"""
         # Extensões válidas baseadas no content-type
@@ -2061,7 +2077,7 @@ class ViralImageFinder:
         clean_name = re.sub(r'[^\w\-_\.]', '_', base_name)
         # Garantir unicidade
         name_without_ext = os.path.splitext(clean_name)[0]
-        full_path = os.path.join(self.config['images_dir'], f"{name_without_ext}.{ext}")
+        full_path = os.path.join(self._image_shard_dir(url), f"{name_without_ext}.{ext}")
         if os.path.exists(full_path):
             hash_suffix = hashlib.md5(url.encode()).hexdigest()[:6]
             return f"{name_without_ext}_{hash_suffix}.{ext}"
@@ -2070,6 +2086,11 @@ class ViralImageFinder:
 
     async def extract_image_data(self, image_url: str, post_url: str, platform: str) -> Optional[str]:
         """Extrai imagem com múltiplas estratégias robustas"""
+        # As tentativas de download reaproveitam a mesma sessão keep-alive
+        async with self:
+            return await self._extract_image_data(image_url, post_url, platform)
+
+    async def _extract_image_data(self, image_url: str, post_url: str, platform: str) -> Optional[str]:
         if not self.config.get('extract_images', True) or not image_url:
             return await self.take_screenshot(post_url, platform)
         # Estratégia 1: Download direto com SSL bypass
@@ -2181,12 +2202,121 @@ class ViralImageFinder:
         logger.info(f"📸 Usando screenshot para {post_url}")
         return await self.take_screenshot(post_url, platform)
 
+    async def __aenter__(self):
+        """Abre um escopo em que sessão de download e Chromium são reaproveitados entre chamadas"""
+        recursos = self._recursos_por_loop.setdefault(asyncio.get_running_loop(), {
+            'nivel': 0, 'session': None, 'playwright': None, 'browser': None, 'lock': asyncio.Lock()
+        })
+        recursos['nivel'] += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        recursos = self._recursos_por_loop.get(asyncio.get_running_loop())
+        if recursos is not None:
+            recursos['nivel'] -= 1
+            if recursos['nivel'] <= 0:
+                await self.close()
+
+    def _new_image_session(self) -> 'aiohttp.ClientSession':
+        """Cria a sessão aiohttp de downloads (pool keep-alive, SSL permissivo)"""
+        ssl_context = ssl.create_default_context()
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+        connector = aiohttp.TCPConnector(
+            ssl=ssl_context,
+            limit=32,
+            limit_per_host=16,
+            ttl_dns_cache=300,
+            keepalive_timeout=30
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.config['timeout'])
+        )
+
+    @asynccontextmanager
+    async def _sessao_download(self):
+        """Sessão de download: a do escopo `async with finder` no loop atual, senão uma própria desta chamada"""
+        recursos = self._recursos_por_loop.get(asyncio.get_running_loop())
+        if recursos is None:
+            session = self._new_image_session()
+            try:
+                yield session
+            finally:
+                await session.close()
+            return
+        if recursos['session'] is None or recursos['session'].closed:
+            recursos['session'] = self._new_image_session()
+        yield recursos['session']
+
+    async def _launch_browser(self, playwright):
+        """Inicia o Chromium com as flags usadas pelas análises e screenshots"""
+        return await playwright.chromium.launch(
+            headless=self.config['headless'],
+            args=[
+                '--no-sandbox',
+                '--disable-setuid-sandbox',
+                '--disable-web-security',
+                '--disable-features=VizDisplayCompositor',
+                '--disable-extensions',
+                '--no-first-run',
+                '--disable-default-apps'
+            ]
+        )
+
+    @asynccontextmanager
+    async def _navegador(self):
+        """Chromium: o do escopo aberto por search_images/extract_image_data/analyze_post_engagement
+        no loop atual, senão um próprio desta chamada"""
+        from playwright.async_api import async_playwright
+        recursos = self._recursos_por_loop.get(asyncio.get_running_loop())
+        if recursos is None:
+            async with async_playwright() as p:
+                browser = await self._launch_browser(p)
+                try:
+                    yield browser
+                finally:
+                    await browser.close()
+            return
+        async with recursos['lock']:
+            if recursos['browser'] is None or not recursos['browser'].is_connected():
+                if recursos['playwright'] is None:
+                    recursos['playwright'] = await async_playwright().start()
+                recursos['browser'] = await self._launch_browser(recursos['playwright'])
+        yield recursos['browser']
+
+    async def _wait_for_content(self, page: 'Page', selector: Optional[str], timeout: int = 3000):
+        """Espera o seletor (ou o evento load, se None) em vez de uma pausa fixa; segue adiante no timeout"""
+        try:
+            if selector:
+                await page.wait_for_selector(selector, state='attached', timeout=timeout)
+            else:
+                await page.wait_for_load_state('load', timeout=timeout)
+        except Exception:
+            pass
+
+    async def close(self):
+        """Fecha a sessão HTTP de downloads e o Chromium compartilhados do loop atual"""
+        recursos = self._recursos_por_loop.pop(asyncio.get_running_loop(), None)
+        if recursos is None:
+            return
+        if recursos['session'] is not None:
+            await recursos['session'].close()
+        if recursos['browser'] is not None:
+            await recursos['browser'].close()
+        if recursos['playwright'] is not None:
+            await recursos['playwright'].stop()
+
     async def _download_image_robust(self, image_url: str, post_url: str) -> Optional[str]:
         """Download robusto de imagem com tratamento de SSL"""
         # Validação prévia da URL
         if not self._is_valid_image_url(image_url):
             logger.warning(f"URL não parece ser de imagem: {image_url}")
             return None
+        cached_path = self._downloaded_images.get(image_url)
+        if cached_path and os.path.exists(cached_path):
+            logger.debug("Imagem já baixada, reutilizando: %s", cached_path)
+            return cached_path
 
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
@@ -2197,57 +2327,44 @@ class ViralImageFinder:
         }
         try:
             if HAS_ASYNC_DEPS:
-                # Configurar SSL context permissivo
-                ssl_context = ssl.create_default_context()
-                ssl_context.check_hostname = False
-                ssl_context.verify_mode = ssl.CERT_NONE
-                connector = aiohttp.TCPConnector(ssl=ssl_context)
-                timeout = aiohttp.ClientTimeout(total=self.config['timeout'])
-                async with aiohttp.ClientSession(
-                    connector=connector,
-                    timeout=timeout,
-                    headers=headers
-                ) as session:
-                    async with session.get(image_url) as response:
-                        response.raise_for_status()
-                        content_type = response.headers.get('content-type', '').lower()
-                        # Limpar charset com aspas duplas do content-type
-                        content_type_clean = content_type.split(';')[0].strip()
-                        # Verificar se é realmente uma imagem
-                        if 'image' not in content_type_clean:
-                            # URLs especiais do Instagram podem retornar HTML/JSON válido
-                            if 'lookaside.instagram.com' in image_url or 'instagram.com/seo/' in image_url:
-                                # Para URLs do Instagram lookaside, tentar processar como dados estruturados
-                                if 'text/html' in content_type_clean or 'application/json' in content_type_clean:
-                                    logger.info(f"URL Instagram especial detectada: {image_url}")
-                                    # Não é uma imagem direta, mas pode conter dados úteis
-                                    return None
-                            # Se não é imagem mas é HTML, pode ser uma página de erro ou redirecionamento
-                            elif 'text/html' in content_type_clean:
-                                logger.warning(f"Recebido HTML em vez de imagem: {content_type}")
+                async with self._sessao_download() as session, session.get(image_url, headers=headers) as response:
+                    response.raise_for_status()
+                    content_type = response.headers.get('content-type', '').lower()
+                    # Limpar charset com aspas duplas do content-type
+                    content_type_clean = content_type.split(';')[0].strip()
+                    # Verificar se é realmente uma imagem
+                    if 'image' not in content_type_clean:
+                        # URLs especiais do Instagram podem retornar HTML/JSON válido
+                        if 'lookaside.instagram.com' in image_url or 'instagram.com/seo/' in image_url:
+                            # Para URLs do Instagram lookaside, tentar processar como dados estruturados
+                            if 'text/html' in content_type_clean or 'application/json' in content_type_clean:
+                                logger.info(f"URL Instagram especial detectada: {image_url}")
+                                # Não é uma imagem direta, mas pode conter dados úteis
                                 return None
-                            logger.warning(f"Content-Type inválido: {content_type}")
-                            return None
-                        # Verificar tamanho
-                        content_length = int(response.headers.get('content-length', 0))
-                        if content_length > 15 * 1024 * 1024:  # 15MB max
-                            logger.warning(f"Imagem muito grande: {content_length} bytes")
-                            return None
-                        # Gerar nome de arquivo
-                        parsed_url = urlparse(image_url)
-                        filename = os.path.basename(parsed_url.path) or 'image'
-                        filename = self._generate_unique_filename(filename, content_type, image_url)
-                        filepath = os.path.join(self.config['images_dir'], filename)
-                        # Salvar arquivo
-                        async with aiofiles.open(filepath, 'wb') as f:
-                            async for chunk in response.content.iter_chunked(8192):
-                                await f.write(chunk)
-                        # Verificar se screenshot foi criada
-                        if os.path.exists(filepath) and os.path.getsize(filepath) > 1024:
-                            return filepath
-                        else:
-                            logger.warning(f"Arquivo salvo incorretamente: {filepath}")
+                        # Se não é imagem mas é HTML, pode ser uma página de erro ou redirecionamento
+                        elif 'text/html' in content_type_clean:
+                            logger.warning(f"Recebido HTML em vez de imagem: {content_type}")
                             return None
+                        logger.warning(f"Content-Type inválido: {content_type}")
+                        return None
+                    # Verificar tamanho
+                    content_length = int(response.headers.get('content-length', 0))
+                    if content_length > 15 * 1024 * 1024:  # 15MB max
+                        logger.warning(f"Imagem muito grande: {content_length} bytes")
+                        return None
+                    # Gerar nome de arquivo fora do loop (makedirs/exists tocam o disco)
+                    filepath = await asyncio.to_thread(self._prepare_image_filepath, image_url, content_type)
+                    # Salvar arquivo
+                    async with aiofiles.open(filepath, 'wb') as f:
+                        async for chunk in response.content.iter_chunked(65536):
+                            await f.write(chunk)
+                    # Verificar se screenshot foi criada
+                    if os.path.exists(filepath) and os.path.getsize(filepath) > 1024:
+                        self._downloaded_images[image_url] = filepath
+                        return filepath
+                    else:
+                        logger.warning(f"Arquivo salvo incorretamente: {filepath}")
+                        return None
             else:
                 # Fallback síncrono com SSL bypass
                 import requests
@@ -2264,18 +2381,18 @@ class ViralImageFinder:
                 adapter = HTTPAdapter(max_retries=retry_strategy)
                 session.mount("http://", adapter)
                 session.mount("https://", adapter)
-                response = session.get(image_url, headers=headers, timeout=self.config['timeout'])
-                response.raise_for_status()
-                content_type = response.headers.get('content-type', '').lower()
-                if 'image' in content_type:
-                    parsed_url = urlparse(image_url)
-                    filename = os.path.basename(parsed_url.path) or 'image'
-                    filename = self._generate_unique_filename(filename, content_type, image_url)
-                    filepath = os.path.join(self.config['images_dir'], filename)
-                    with open(filepath, 'wb') as f:
-                        f.write(response.content)
-                    if os.path.exists(filepath) and os.path.getsize(filepath) > 1024:
-                        return filepath
+                with session.get(image_url, headers=headers, timeout=self.config['timeout'], stream=True) as response:
+                    response.raise_for_status()
+                    content_type = response.headers.get('content-type', '').lower()
+                    if 'image' in content_type:
+                        filepath = self._prepare_image_filepath(image_url, content_type)
+                        with open(filepath, 'wb') as f:
+                            # Gravar em blocos, sem carregar a imagem inteira em memória
+                            for chunk in response.iter_content(65536):
+                                f.write(chunk)
+                        if os.path.exists(filepath) and os.path.getsize(filepath) > 1024:
+                            self._downloaded_images[image_url] = filepath
+                            return filepath
                 return None
         except Exception as e:
             logger.error(f"❌ Erro no download robusto: {e}")
@@ -2286,50 +2403,68 @@ class ViralImageFinder:
         if not self.playwright_enabled:
             return None
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
+            async with self._navegador() as browser:
                 context = await browser.new_context()
-                page = await context.new_page()
-                await page.goto(post_url, wait_until='domcontentloaded')
-                await asyncio.sleep(3)
-                # Fechar popups
-                await self._close_common_popups(page, platform)
-                # Extrair URL da imagem baseado na plataforma
-                image_url = None
-                if platform == 'instagram':
-                    # Procurar pela imagem principal
-                    img_selectors = [
-                        'article img[src*="scontent"]',
-                        'div[role="button"] img',
-                        'img[alt*="Foto"]',
-                        'img[style*="object-fit"]'
-                    ]
-                    for selector in img_selectors:
-                        img_elem = await page.query_selector(selector)
-                        if img_elem:
-                            image_url = await img_elem.get_attribute('src')
-                            if image_url and 'scontent' in image_url:
-                                break
-                elif platform == 'facebook':
-                    # Procurar pela imagem do post
-                    img_selectors = [
-                        'img[data-scale]',
-                        'img[src*="scontent"]',
-                        'img[src*="fbcdn"]',
-                        'div[data-sigil="photo-image"] img'
-                    ]
-                    for selector in img_selectors:
-                        img_elem = await page.query_selector(selector)
-                        if img_elem:
-                            image_url = await img_elem.get_attribute('src')
-                            if image_url and ('scontent' in image_url or 'fbcdn' in image_url):
-                                break
-                await browser.close()
-                return image_url
+                try:
+                    # Só precisamos do atributo src: não baixar imagens, vídeos, fontes nem CSS
+                    await context.route('**/*', lambda route: (
+                        route.abort() if route.request.resource_type in ('image', 'media', 'font', 'stylesheet')
+                        else route.continue_()
+                    ))
+                    page = await context.new_page()
+                    await page.goto(post_url, wait_until='domcontentloaded')
+                    # Aguardar a imagem principal aparecer no DOM, no máximo 3s
+                    if platform == 'instagram':
+                        await self._wait_for_content(page, 'article img, img[src*="scontent"]')
+                    elif platform == 'facebook':
+                        await self._wait_for_content(page, 'img[data-scale], img[src*="scontent"], img[src*="fbcdn"]')
+                    else:
+                        await self._wait_for_content(page, 'img')
+                    # Fechar popups
+                    await self._close_common_popups(page, platform)
+                    # Extrair URL da imagem baseado na plataforma
+                    image_url = None
+                    if platform == 'instagram':
+                        # Procurar pela imagem principal
+                        img_selectors = [
+                            'article img[src*="scontent"]',
+                            'div[role="button"] img',
+                            'img[alt*="Foto"]',
+                            'img[style*="object-fit"]'
+                        ]
+                        image_url = await self._first_image_src(page, img_selectors, ['scontent'])
+                    elif platform == 'facebook':
+                        # Procurar pela imagem do post
+                        img_selectors = [
+                            'img[data-scale]',
+                            'img[src*="scontent"]',
+                            'img[src*="fbcdn"]',
+                            'div[data-sigil="photo-image"] img'
+                        ]
+                        image_url = await self._first_image_src(page, img_selectors, ['scontent', 'fbcdn'])
+                    return image_url
+                finally:
+                    await context.close()
         except Exception as e:
             logger.error(f"❌ Erro ao extrair URL real: {e}")
             return None
 
+    async def _first_image_src(self, page: 'Page', selectors: List[str], markers: List[str]) -> Optional[str]:
+        """Percorre os seletores numa única chamada ao navegador e devolve o src da primeira imagem válida"""
+        return await page.evaluate(
+            """([selectors, markers]) => {
+                let url = null;
+                for (const sel of selectors) {
+                    const el = document.querySelector(sel);
+                    if (!el) continue;
+                    url = el.getAttribute('src');
+                    if (url && markers.some(m => url.includes(m))) break;
+                }
+                return url;
+            }""",
+            [selectors, markers]
+        )
+
     async def take_screenshot(self, post_url: str, platform: str) -> Optional[str]:
         """Tira screenshot otimizada da página"""
         if not self.playwright_enabled:
@@ -2342,56 +2477,50 @@ class ViralImageFinder:
         screenshot_filename = f"screenshot_{safe_title}_{hash_suffix}_{timestamp}.png"
         screenshot_path = os.path.join(self.config['screenshots_dir'], screenshot_filename)
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(
-                    headless=self.config['headless'],
-                    args=['--no-sandbox', '--disable-setuid-sandbox']
-                )
+            async with self._navegador() as browser:
                 context = await browser.new_context(
                     viewport={'width': 1920, 'height': 1080},
                     user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
                 )
-                page = await context.new_page()
-                # Configurar timeouts mais robustos
-                page.set_default_timeout(self.config['playwright_timeout'])
-                page.set_default_navigation_timeout(30000)  # 30 segundos para navegação
-                # Navegar com múltiplas estratégias
                 try:
-                    await page.goto(post_url, wait_until='domcontentloaded', timeout=20000)
-                except Exception as e:
-                    logger.warning(f"Primeira tentativa de navegação falhou: {e}")
-                    # Fallback: tentar com networkidle
-                    try:
-                        await page.goto(post_url, wait_until='networkidle', timeout=15000)
-                    except Exception as e2:
-                        logger.warning(f"Segunda tentativa falhou: {e2}")
-                        # Último fallback: load básico
-                        await page.goto(post_url, wait_until='load', timeout=10000)
-                await asyncio.sleep(3)
-                # Fechar popups
-                await self._close_common_popups(page, platform)
-                await asyncio.sleep(1)
-                # Tirar screenshot da área principal
-                if platform == 'instagram':
-                    # Focar no post principal
+                    page = await context.new_page()
+                    # Configurar timeouts mais robustos
+                    page.set_default_timeout(self.config['playwright_timeout'])
+                    page.set_default_navigation_timeout(30000)  # 30 segundos para navegação
+                    # Navegar com múltiplas estratégias
                     try:
-                        main_element = await page.query_selector('article, main')
-                        if main_element:
-                            await main_element.screenshot(path=screenshot_path)
-                        else:
+                        await page.goto(post_url, wait_until='domcontentloaded', timeout=20000)
+                    except Exception as e:
+                        logger.warning(f"Primeira tentativa de navegação falhou: {e}")
+                        # Fallback: load básico (networkidle quase nunca dispara em redes sociais)
+                        await page.goto(post_url, wait_until='load', timeout=15000)
+                    # Aguardar as imagens carregarem, no máximo 3s
+                    await self._wait_for_content(page, None)
+                    # Fechar popups
+                    await self._close_common_popups(page, platform)
+                    await asyncio.sleep(1)
+                    # Tirar screenshot da área principal
+                    if platform == 'instagram':
+                        # Focar no post principal
+                        try:
+                            main_element = await page.query_selector('article, main')
+                            if main_element:
+                                await main_element.screenshot(path=screenshot_path)
+                            else:
+                                await page.screenshot(path=screenshot_path, full_page=False)
+                        except:
                             await page.screenshot(path=screenshot_path, full_page=False)
-                    except:
+                    else:
                         await page.screenshot(path=screenshot_path, full_page=False)
-                else:
-                    await page.screenshot(path=screenshot_path, full_page=False)
-                await browser.close()
-                # Verificar se screenshot foi criada
-                if os.path.exists(screenshot_path) and os.path.getsize(screenshot_path) > 5000:
-                    logger.info(f"✅ Screenshot salva: {screenshot_path}")
-                    return screenshot_path
-                else:
-                    logger.error(f"❌ Screenshot inválida: {screenshot_path}")
-                    return None
+                    # Verificar se screenshot foi criada
+                    if os.path.exists(screenshot_path) and os.path.getsize(screenshot_path) > 5000:
+                        logger.info(f"✅ Screenshot salva: {screenshot_path}")
+                        return screenshot_path
+                    else:
+                        logger.error(f"❌ Screenshot inválida: {screenshot_path}")
+                        return None
+                finally:
+                    await context.close()
         except Exception as e:
             logger.error(f"❌ Erro ao capturar screenshot: {e}")
             return None
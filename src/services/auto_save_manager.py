@@ -5,10 +5,14 @@ ARQV30 Enhanced v3.0 - Auto Save Manager
 Sistema de salvamento automático ultra-robusto
 """
 
+import atexit
 import os
 import json
+import queue
 import logging
 import asyncio
+import threading
+import struct
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
@@ -16,8 +20,190 @@ import re
 from collections import Counter
 import hashlib # Importado para hashing de URL
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
+
 logger = logging.getLogger(__name__)
 
+# Indentação dos JSONs gravados (AUTOSAVE_JSON_INDENT=false grava compacto, metade dos bytes)
+_JSON_INDENT = os.getenv('AUTOSAVE_JSON_INDENT', 'true').lower() == 'true'
+
+# Tabela única para limpar o nome do produto no arquivo RES_BUSCA (uma passada só)
+_SANITIZAR_PRODUTO = str.maketrans({' ': '_', '/': '_', '\\': '_'})
+
+def nome_arquivo_busca(produto: str) -> str:
+    """Nome do arquivo RES_BUSCA do produto (compartilhado com o MassiveSearchEngine)"""
+    return f"RES_BUSCA_{produto.translate(_SANITIZAR_PRODUTO).upper()}.json"
+
+def _json_bytes(dados: Any, indent: bool = None) -> bytes:
+    """Serializa em UTF-8; orjson quando disponível, json da stdlib como reserva"""
+    if indent is None:
+        indent = _JSON_INDENT
+    if HAS_ORJSON:
+        try:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+            return orjson.dumps(dados, option=option)
+        except TypeError:
+            # Tipos que só a stdlib aceita (ex.: inteiros > 64 bits) seguem pelo caminho antigo
+            pass
+    if indent:
+        return json.dumps(dados, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(dados, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _json_line(dados: Any) -> bytes:
+    """Serializa compacto, uma linha terminada em \\n (formato JSON Lines)"""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(dados, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass
+    return json.dumps(dados, ensure_ascii=False).encode('utf-8') + b"\n"
+
+# Diretórios já criados neste processo: evita um mkdir por gravação
+_diretorios_prontos = set()
+
+def _garantir_diretorio(diretorio: str) -> None:
+    """os.makedirs apenas na primeira vez que o diretório é usado"""
+    if diretorio not in _diretorios_prontos:
+        os.makedirs(diretorio, exist_ok=True)
+        _diretorios_prontos.add(diretorio)
+
+def _abrir(caminho: str, modo: str):
+    try:
+        return open(caminho, modo)
+    except FileNotFoundError:
+        # Diretório removido depois de entrar no cache (ex.: limpeza de arquivos antigos)
+        diretorio = os.path.dirname(caminho)
+        _diretorios_prontos.discard(diretorio)
+        _garantir_diretorio(diretorio)
+        return open(caminho, modo)
+
+def _gravar_bytes(caminho: str, payload: bytes, modo: str = 'wb') -> None:
+    """Grava bytes já serializados em uma única escrita; em 'wb' troca o arquivo de forma atômica"""
+    if modo != 'wb':
+        with _abrir(caminho, modo) as f:
+            f.write(payload)
+        return
+
+    # Leitores nunca veem um JSON pela metade: grava ao lado e renomeia por cima
+    tmp = f"{caminho}.tmp.{os.getpid()}.{threading.get_ident()}"
+    with _abrir(tmp, 'wb') as f:
+        f.write(payload)
+    try:
+        os.replace(tmp, caminho)
+    except PermissionError:
+        # Windows não substitui um arquivo aberto por outro leitor: grava no lugar
+        os.remove(tmp)
+        with open(caminho, 'wb') as f:
+            f.write(payload)
+
+def _gravar_json(caminho: str, dados: Any, indent: bool = None) -> int:
+    """Serializa e grava um JSON; devolve o tamanho gravado em bytes"""
+    payload = _json_bytes(dados, indent)
+    _gravar_bytes(caminho, payload)
+    return len(payload)
+
+# Gravações em segundo plano: o chamador só serializa; uma thread única grava na ordem de chegada.
+# A fila é limitada: se o disco não acompanha, o produtor espera em vez de acumular payloads
+_IO_QUEUE_MAX = int(os.getenv('AUTOSAVE_IO_QUEUE_MAX', '256'))
+_io_queue: "queue.Queue" = queue.Queue(maxsize=_IO_QUEUE_MAX)
+_writer_thread = None
+_writer_lock = threading.Lock()
+
+# Gravações ainda não concluídas por sessão (None = sem sessão), para o leitor esperar só as suas
+_pendentes: Dict[Optional[str], int] = {}
+_pendentes_cond = threading.Condition()
+
+def _writer_loop() -> None:
+    while True:
+        caminho, payload, session_id = _io_queue.get()
+        try:
+            _gravar_bytes(caminho, payload)
+        except Exception as e:
+            logger.error(f"❌ Erro na gravação em segundo plano de {caminho}: {e}")
+        finally:
+            with _pendentes_cond:
+                restantes = _pendentes[session_id] - 1
+                if restantes:
+                    _pendentes[session_id] = restantes
+                else:
+                    del _pendentes[session_id]
+                _pendentes_cond.notify_all()
+            _io_queue.task_done()
+
+def _gravar_em_segundo_plano(caminho: str, payload: bytes, session_id: Optional[str] = None) -> None:
+    """Enfileira bytes já serializados para a thread gravadora (bloqueia com a fila cheia)"""
+    global _writer_thread
+    if _writer_thread is None:
+        with _writer_lock:
+            if _writer_thread is None:
+                _writer_thread = threading.Thread(target=_writer_loop, name="autosave-writer", daemon=True)
+                _writer_thread.start()
+    with _pendentes_cond:
+        _pendentes[session_id] = _pendentes.get(session_id, 0) + 1
+    _io_queue.put((caminho, payload, session_id))
+
+# Erros sem sessão vão para um único erros.jsonl; o lock evita linhas intercaladas entre instâncias
+_erros_lock = threading.Lock()
+
+# Índice nome_etapa -> arquivo por sessão, montado na primeira listagem e descartado a cada gravação
+_indice_etapas: Dict[str, Dict[str, str]] = {}
+_indice_versao: Dict[str, int] = {}
+_indice_etapas_lock = threading.Lock()
+
+def _invalidar_indice_etapas(session_id: Optional[str]) -> None:
+    """Chamado depois de gravar (ou enfileirar) um arquivo no diretório da sessão"""
+    if session_id:
+        with _indice_etapas_lock:
+            _indice_etapas.pop(session_id, None)
+            _indice_versao[session_id] = _indice_versao.get(session_id, 0) + 1
+
+@atexit.register
+def aguardar_gravacoes(session_id: Optional[str] = None) -> None:
+    """Bloqueia até as gravações enfileiradas da sessão (sem sessão: de todas) chegarem ao disco"""
+    with _pendentes_cond:
+        if session_id is None:
+            _pendentes_cond.wait_for(lambda: not _pendentes)
+        else:
+            _pendentes_cond.wait_for(lambda: session_id not in _pendentes)
+
+def _ler_json(caminho: str) -> Any:
+    """Lê um JSON em modo binário e decodifica com orjson quando disponível"""
+    with open(caminho, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+# Snapshots binários de etapas: frame msgpack com prefixo de tamanho (>I)
+_FRAME_HEADER = struct.Struct('>I')
+
+def carregar_snapshot(caminho: str) -> Any:
+    """Lê e decodifica um frame msgpack gravado por salvar_etapa_bin"""
+    with open(caminho, 'rb') as f:
+        (tamanho,) = _FRAME_HEADER.unpack(f.read(_FRAME_HEADER.size))
+        return msgspec.msgpack.decode(f.read(tamanho))
+
+def expandir_snapshot(dados: Any) -> Any:
+    """Troca o registro leve de um snapshot msgpack pelo conteúdo completo da etapa"""
+    if not (isinstance(dados, dict) and dados.get("formato") == "msgpack" and dados.get("snapshot")):
+        return dados
+    if not HAS_MSGSPEC:
+        logger.warning(f"⚠️ msgspec indisponível, snapshot não carregado: {dados['snapshot']}")
+        return dados
+    try:
+        return carregar_snapshot(dados["snapshot"])
+    except (OSError, struct.error, msgspec.DecodeError) as e:
+        logger.warning(f"⚠️ Erro ao carregar snapshot {dados['snapshot']}: {e}")
+        return dados
+
 # Import do serviço preditivo (lazy loading para evitar circular imports)
 _predictive_service = None
 
@@ -55,16 +241,27 @@ def serializar_dados_seguros(dados: Any) -> Dict[str, Any]:
 class AutoSaveManager:
     """Gerenciador automático de salvamento de dados - CENTRALIZADO"""
 
-    def __init__(self):
+    def __init__(self, manter_copia_geral: bool = False):
         """Inicializa o gerenciador de salvamento automático"""
         self.enabled = True
         self.base_dir = "analyses_data"
         self.relatorios_dir = "relatorios_intermediarios"
 
+        # Trechos com sessão já ficam no diretório da sessão e no consolidado;
+        # a cópia extra em pesquisa_web/ só é gravada se pedida
+        self.manter_copia_geral = manter_copia_geral
+
         # Cria diretórios necessários
         os.makedirs(self.base_dir, exist_ok=True)
         os.makedirs(self.relatorios_dir, exist_ok=True)
 
+        # Manifesto por sessão (JSON Lines): leitores evitam varrer diretórios inteiros
+        self._manifest_lock = threading.Lock()
+
+        # Consolidado por sessão: trechos anexados em consolidado.jsonl, JSON gerado sob demanda
+        self._consolidado_lock = threading.Lock()
+        self._consolidado_criado: Dict[tuple, str] = {}
+
         logger.info("🔧 Auto Save Manager CENTRALIZADO inicializado")
 
     # === INTERFACE UNIFICADA PARA SALVAMENTO DE DADOS EXTRAÍDOS ===
@@ -121,7 +318,7 @@ class AutoSaveManager:
             if etapa_path:
                 results['etapa_file'] = etapa_path
 
-            logger.info(f"✅ Conteúdo salvo em {len(results)} locais - URL: {content_data['url'][:50]}...")
+            logger.info("✅ Conteúdo salvo em %d locais - URL: %.50s...", len(results), content_data['url'])
 
             return {
                 'success': True,
@@ -147,7 +344,8 @@ class AutoSaveManager:
         """
         try:
             # Gera nome do arquivo viral
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            agora = datetime.now()
+            timestamp = agora.strftime("%Y%m%d_%H%M%S")
             session_suffix = f"_{session_id[:8]}" if session_id else ""
             filename = f"viral_results{session_suffix}_{timestamp}.json"
 
@@ -162,7 +360,7 @@ class AutoSaveManager:
                 **viral_data,
                 'metadata': {
                     **viral_data.get('metadata', {}),
-                    'generated_at': datetime.now().isoformat(),
+                    'generated_at': agora.isoformat(),
                     'session_id': session_id,
                     'file_type': 'viral_analysis_report',
                     'agent': 'AutoSaveManager_Centralized'
@@ -170,11 +368,10 @@ class AutoSaveManager:
             }
 
             # Salva arquivo
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(viral_data_with_meta, f, ensure_ascii=False, indent=2)
+            bytes_gravados = _gravar_json(filepath, viral_data_with_meta)
 
-            file_size = os.path.getsize(filepath) / 1024  # KB
-            logger.info(f"✅ Relatório viral salvo: {filename} ({file_size:.1f}KB)")
+            file_size = bytes_gravados / 1024  # KB
+            logger.info("✅ Relatório viral salvo: %s (%.1fKB)", filename, file_size)
 
             return {
                 'success': True,
@@ -200,8 +397,7 @@ class AutoSaveManager:
         """
         try:
             # Gera nome do arquivo
-            produto_clean = produto.replace(' ', '_').replace('/', '_')
-            filename = f"RES_BUSCA_{produto_clean.upper()}.json"
+            filename = nome_arquivo_busca(produto)
             filepath = os.path.join(self.base_dir, filename)
 
             # Adiciona metadados finais
@@ -216,11 +412,10 @@ class AutoSaveManager:
             }
 
             # Salva arquivo final
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(massive_data_final, f, ensure_ascii=False, indent=2)
+            bytes_gravados = _gravar_json(filepath, massive_data_final)
 
-            file_size = os.path.getsize(filepath) / 1024  # KB
-            logger.info(f"✅ Resultado massivo salvo: {filename} ({file_size:.1f}KB)")
+            file_size = bytes_gravados / 1024  # KB
+            logger.info("✅ Resultado massivo salvo: %s (%.1fKB)", filename, file_size)
 
             return {
                 'success': True,
@@ -243,10 +438,11 @@ class AutoSaveManager:
             else:
                 dir_path = os.path.join(self.base_dir, category)
 
-            os.makedirs(dir_path, exist_ok=True)
+            _garantir_diretorio(dir_path)
 
             # Gera nome do arquivo
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+            agora = datetime.now()
+            timestamp = agora.strftime("%Y%m%d_%H%M%S_%f")[:-3]
             url_hash = hashlib.md5(content_data['url'].encode()).hexdigest()[:8]
             filename = f"trecho_{url_hash}_{timestamp}.json"
             filepath = os.path.join(dir_path, filename)
@@ -258,14 +454,16 @@ class AutoSaveManager:
                 'conteudo': content_data.get('conteudo', ''),
                 'metodo_extracao': content_data.get('metodo_extracao', ''),
                 'qualidade': content_data.get('qualidade', 0.0),
-                'timestamp_extracao': datetime.now().isoformat(),
+                'timestamp_extracao': agora.isoformat(),
                 'session_id': session_id,
                 'metadata': content_data.get('metadata', {})
             }
 
             # Salva arquivo
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, ensure_ascii=False, indent=2)
+            _gravar_em_segundo_plano(filepath, _json_bytes(save_data), session_id)
+
+            if session_id:
+                self.registrar_no_manifesto(session_id, category, filepath)
 
             return filepath
 
@@ -276,22 +474,6 @@ class AutoSaveManager:
     def _save_to_consolidated(self, content_data: Dict[str, Any], session_id: str, category: str) -> Optional[str]:
         """Adiciona conteúdo ao arquivo consolidado da sessão"""
         try:
-            # Caminho do arquivo consolidado
-            dir_path = os.path.join(self.base_dir, category, session_id)
-            os.makedirs(dir_path, exist_ok=True)
-            filepath = os.path.join(dir_path, "consolidado.json")
-
-            # Carrega arquivo existente ou cria novo
-            if os.path.exists(filepath):
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    consolidated_data = json.load(f)
-            else:
-                consolidated_data = {
-                    'session_id': session_id,
-                    'created_at': datetime.now().isoformat(),
-                    'trechos': []
-                }
-
             # Adiciona novo trecho
             new_entry = {
                 'url': content_data['url'],
@@ -302,15 +484,7 @@ class AutoSaveManager:
                 'timestamp_adicao': datetime.now().isoformat()
             }
 
-            consolidated_data['trechos'].append(new_entry)
-            consolidated_data['updated_at'] = datetime.now().isoformat()
-            consolidated_data['total_trechos'] = len(consolidated_data['trechos'])
-
-            # Salva arquivo consolidado
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(consolidated_data, f, ensure_ascii=False, indent=2)
-
-            return filepath
+            return self._anexar_ao_consolidado(category, session_id, new_entry)
 
         except Exception as e:
             logger.error(f"❌ Erro ao salvar no consolidado: {e}")
@@ -358,13 +532,14 @@ class AutoSaveManager:
                 logger.warning("⚠️ Dados insuficientes para salvamento de screenshot")
                 return {'success': False, 'error': 'Dados insuficientes'}
 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+            agora = datetime.now()
+            timestamp = agora.strftime("%Y%m%d_%H%M%S_%f")[:-3]
             url_hash = hashlib.md5(screenshot_data['url'].encode()).hexdigest()[:8]
             filename = f"screenshot_{url_hash}_{timestamp}.json"
 
             # Diretório para screenshots
             screenshots_dir = os.path.join(self.base_dir, 'screenshots', screenshot_data.get('metodo_captura', 'unknown'))
-            os.makedirs(screenshots_dir, exist_ok=True)
+            _garantir_diretorio(screenshots_dir)
             filepath = os.path.join(screenshots_dir, filename)
 
             # Preparar dados para salvamento
@@ -373,20 +548,19 @@ class AutoSaveManager:
                 'descricao': screenshot_data.get('descricao', ''),
                 'metodo_captura': screenshot_data.get('metodo_captura', ''),
                 'qualidade_imagem': screenshot_data.get('qualidade_imagem', 0.0),
-                'timestamp_captura': datetime.now().isoformat(),
+                'timestamp_captura': agora.isoformat(),
                 'session_id': session_id,
                 'metadata': screenshot_data.get('metadata', {})
             }
 
             # Salva o arquivo JSON com os metadados
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, ensure_ascii=False, indent=2)
+            bytes_gravados = _gravar_json(filepath, save_data)
 
             # Opcional: Salvar a imagem em si, se necessário (e se não for muito grande para o JSON)
             # Se a imagem for muito grande, é melhor mantê-la apenas no base64 dentro do JSON
 
-            file_size = os.path.getsize(filepath) / 1024  # KB
-            logger.info(f"📸 Screenshot salvo: {filename} ({file_size:.1f}KB)")
+            file_size = bytes_gravados / 1024  # KB
+            logger.info("📸 Screenshot salvo: %s (%.1fKB)", filename, file_size)
 
             return {
                 'success': True,
@@ -451,7 +625,8 @@ class AutoSaveManager:
         """Salva uma etapa do processo com timestamp"""
         try:
             # Gera timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+            agora = datetime.now()
+            timestamp = agora.strftime("%Y%m%d_%H%M%S_%f")[:-3]
 
             # Define diretório base
             if session_id:
@@ -459,7 +634,7 @@ class AutoSaveManager:
             else:
                 diretorio = f"{self.relatorios_dir}/{categoria}"
 
-            os.makedirs(diretorio, exist_ok=True)
+            _garantir_diretorio(diretorio)
 
             # Nome do arquivo
             nome_arquivo = f"{nome_etapa}_{timestamp}"
@@ -477,14 +652,16 @@ class AutoSaveManager:
                     dados_serializaveis = {
                         "status": "empty_data",
                         "message": "Dados não disponíveis no momento",
-                        "timestamp": datetime.now().isoformat(),
+                        "timestamp": agora.isoformat(),
                         "original_data": dados_serializaveis
                     }
 
-                with open(arquivo_json, 'w', encoding='utf-8') as f:
-                    json.dump(dados_serializaveis, f, ensure_ascii=False, indent=2)
+                # Serializa uma vez; a cópia em analyses_data reaproveita os mesmos bytes
+                payload = _json_bytes(dados_serializaveis)
+                _gravar_em_segundo_plano(arquivo_json, payload, session_id)
+                _invalidar_indice_etapas(session_id)
 
-                logger.info(f"💾 Etapa '{nome_etapa}' salva: {arquivo_json}")
+                logger.info("💾 Etapa '%s' salva: %s", nome_etapa, arquivo_json)
 
                 # INTEGRAÇÃO COM ANÁLISE PREDITIVA
                 self._trigger_predictive_analysis(nome_etapa, dados_serializaveis, categoria, session_id)
@@ -505,15 +682,14 @@ class AutoSaveManager:
                         nome_modulo_base = categoria
 
                         analyses_dir = f"{self.base_dir}/{categoria}"
-                        os.makedirs(analyses_dir, exist_ok=True)
+                        _garantir_diretorio(analyses_dir)
 
                         analyses_arquivo_nome = f"{nome_modulo_base}_{timestamp}.json" if session_id is None else f"{nome_modulo_base}_{session_id}_{timestamp}.json"
                         analyses_arquivo = os.path.join(analyses_dir, analyses_arquivo_nome)
 
-                        with open(analyses_arquivo, 'w', encoding='utf-8') as f:
-                            json.dump(dados_serializaveis, f, ensure_ascii=False, indent=2)
+                        _gravar_em_segundo_plano(analyses_arquivo, payload, session_id)
 
-                        logger.info(f"💾 Módulo também salvo em analyses_data: {analyses_arquivo}")
+                        logger.info("💾 Módulo também salvo em analyses_data: %s", analyses_arquivo)
 
                     except Exception as e:
                         logger.warning(f"⚠️ Não foi possível salvar em analyses_data para a etapa {nome_etapa} (categoria: {categoria}): {e}")
@@ -529,8 +705,9 @@ class AutoSaveManager:
                         f.write(dados)
                     else:
                         f.write(str(dados))
+                _invalidar_indice_etapas(session_id)
 
-                logger.info(f"💾 Etapa '{nome_etapa}' salva: {arquivo_txt}")
+                logger.info("💾 Etapa '%s' salva: %s", nome_etapa, arquivo_txt)
                 return arquivo_txt
 
         except Exception as e:
@@ -580,37 +757,49 @@ class AutoSaveManager:
         try:
             # 🔥 SALVA EM MÚLTIPLOS LOCAIS PARA GARANTIR CONSOLIDAÇÃO
             saved_paths = []
+            payload = _json_bytes(trecho_data)
 
             # 1. Diretório específico da sessão
             if session_id:
                 session_dir = os.path.join(self.base_dir, 'pesquisa_web', session_id) # Use analyses_path consistentemente
-                os.makedirs(session_dir, exist_ok=True)
+                _garantir_diretorio(session_dir)
                 session_path = os.path.join(session_dir, filename)
 
-                with open(session_path, 'w', encoding='utf-8') as f:
-                    json.dump(trecho_data, f, ensure_ascii=False, indent=2)
+                _gravar_em_segundo_plano(session_path, payload, session_id)
                 saved_paths.append(session_path)
+                self.registrar_no_manifesto(session_id, 'pesquisa_web', session_path)
 
-            # 2. Diretório geral de pesquisa web
-            general_dir = os.path.join(self.base_dir, 'pesquisa_web') # Use analyses_path consistentemente
-            os.makedirs(general_dir, exist_ok=True)
-            general_path = os.path.join(general_dir, filename)
+            # 2. Diretório geral de pesquisa web (única cópia quando não há sessão)
+            if not session_id or self.manter_copia_geral:
+                general_dir = os.path.join(self.base_dir, 'pesquisa_web') # Use analyses_path consistentemente
+                _garantir_diretorio(general_dir)
+                general_path = os.path.join(general_dir, filename)
 
-            with open(general_path, 'w', encoding='utf-8') as f:
-                json.dump(trecho_data, f, ensure_ascii=False, indent=2)
-            saved_paths.append(general_path)
+                _gravar_em_segundo_plano(general_path, payload, session_id)
+                saved_paths.append(general_path)
 
             # 3. 🔥 TAMBÉM SALVA EM ARQUIVO CONSOLIDADO DA SESSÃO
             if session_id:
                 self._adicionar_ao_arquivo_consolidado(session_id, trecho_data)
 
-            logger.info(f"🔍 Trecho CONSOLIDADO salvo em {len(saved_paths)} locais (Qualidade: {qualidade})")
+            logger.info("🔍 Trecho CONSOLIDADO salvo em %d locais (Qualidade: %s)", len(saved_paths), qualidade)
             return saved_paths[0] if saved_paths else ""
 
         except Exception as e:
             logger.error(f"❌ Erro ao salvar trecho consolidado: {e}")
             return ""
 
+    def registrar_no_manifesto(self, session_id: str, tipo: str, caminho: str) -> None:
+        """Acrescenta um artefato ao manifest.jsonl da sessão (uma linha por arquivo)"""
+        try:
+            session_dir = os.path.join(self.base_dir, session_id)
+            _garantir_diretorio(session_dir)
+            linha = _json_line({'tipo': tipo, 'caminho': caminho})
+            with self._manifest_lock:
+                _gravar_bytes(os.path.join(session_dir, 'manifest.jsonl'), linha, 'ab')
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao registrar no manifesto: {e}")
+
     def _extrair_palavras_chave(self, conteudo: str) -> List[str]:
         """Extrai palavras-chave do conteúdo"""
         try:
@@ -712,33 +901,74 @@ class AutoSaveManager:
     def _adicionar_ao_arquivo_consolidado(self, session_id: str, trecho_data: Dict[str, Any]):
         """Adiciona trecho ao arquivo consolidado da sessão"""
         try:
-            consolidado_path = os.path.join(self.base_dir, 'pesquisa_web', session_id, 'consolidado.json') # Use analyses_path consistently
+            consolidado_path = self._anexar_ao_consolidado('pesquisa_web', session_id, trecho_data)
+            logger.info("✅ Trecho adicionado ao arquivo consolidado: %s", consolidado_path)
 
-            # Carrega arquivo existente ou cria novo
-            if os.path.exists(consolidado_path):
-                with open(consolidado_path, 'r', encoding='utf-8') as f:
-                    consolidado = json.load(f)
-            else:
-                consolidado = {
-                    'session_id': session_id,
-                    'trechos': [],
-                    'created_at': datetime.now().isoformat(),
-                    'last_updated': datetime.now().isoformat()
-                }
+        except Exception as e:
+            logger.error(f"❌ Erro ao adicionar ao arquivo consolidado: {e}")
 
-            # Adiciona novo trecho
-            consolidado['trechos'].append(trecho_data)
-            consolidado['last_updated'] = datetime.now().isoformat()
-            consolidado['total_trechos'] = len(consolidado['trechos'])
+    def _anexar_ao_consolidado(self, categoria: str, session_id: str, entrada: Dict[str, Any]) -> str:
+        """Acrescenta um trecho ao consolidado.jsonl da sessão sem reescrever o que já existe"""
+        dir_path = os.path.join(self.base_dir, categoria, session_id)
+        _garantir_diretorio(dir_path)
+        log_path = os.path.join(dir_path, "consolidado.jsonl")
+        linha = _json_line(entrada)
+
+        with self._consolidado_lock:
+            if not os.path.exists(log_path):
+                self._consolidado_criado.setdefault((categoria, session_id), datetime.now().isoformat())
+                # Sessão iniciada antes do log: semeia com os trechos do consolidado.json existente
+                legado = os.path.join(dir_path, "consolidado.json")
+                if os.path.exists(legado):
+                    linha = b"".join(_json_line(t) for t in _ler_json(legado).get('trechos', [])) + linha
+            _gravar_bytes(log_path, linha, 'ab')
+
+        return log_path
+
+    def materializar_consolidado(self, session_id: str, categoria: str = 'pesquisa_web') -> Dict[str, Any]:
+        """Regrava consolidado.json a partir do consolidado.jsonl quando o log for mais novo"""
+        dir_path = os.path.join(self.base_dir, categoria, session_id)
+        json_path = os.path.join(dir_path, "consolidado.json")
+        log_path = os.path.join(dir_path, "consolidado.jsonl")
 
-            # Salva arquivo consolidado
-            with open(consolidado_path, 'w', encoding='utf-8') as f:
-                json.dump(consolidado, f, ensure_ascii=False, indent=2)
+        try:
+            log_mtime = os.stat(log_path).st_mtime_ns
+        except FileNotFoundError:
+            # Sem log: vale o consolidado.json (legado) se existir
+            try:
+                return _ler_json(json_path)
+            except FileNotFoundError:
+                return {}
 
-            logger.info(f"✅ Trecho adicionado ao arquivo consolidado: {consolidado_path}")
+        with self._consolidado_lock:
+            try:
+                if os.stat(json_path).st_mtime_ns > log_mtime:
+                    return _ler_json(json_path)
+            except (OSError, ValueError):
+                pass
+
+            loads = orjson.loads if HAS_ORJSON else json.loads
+            trechos = []
+            with open(log_path, 'rb') as f:
+                for linha in f:
+                    try:
+                        trechos.append(loads(linha))
+                    except ValueError:
+                        # Linha truncada por uma gravação interrompida
+                        continue
 
-        except Exception as e:
-            logger.error(f"❌ Erro ao adicionar ao arquivo consolidado: {e}")
+            agora = datetime.now().isoformat()
+            consolidado = {
+                'session_id': session_id,
+                'trechos': trechos,
+                'created_at': self._consolidado_criado.get((categoria, session_id), agora),
+                'last_updated': agora,
+                'total_trechos': len(trechos)
+            }
+            # Cópia regerável do log, lida só pelos carregadores: sempre compacta
+            _gravar_json(json_path, consolidado, indent=False)
+
+        return consolidado
 
     def salvar_erro(self, nome_erro: str, erro: Exception, contexto: Dict[str, Any] = None, session_id: str = None) -> str:
         """Salva um erro com contexto"""
@@ -750,7 +980,7 @@ class AutoSaveManager:
             else:
                 diretorio = f"{self.relatorios_dir}/erros"
 
-            os.makedirs(diretorio, exist_ok=True)
+            _garantir_diretorio(diretorio)
 
             erro_data = {
                 "erro": str(erro),
@@ -759,6 +989,14 @@ class AutoSaveManager:
                 "contexto": contexto or {}
             }
 
+            if not session_id:
+                # Sem sessão: um único log rotativo em vez de um arquivo por erro
+                arquivo_erro = f"{diretorio}/erros.jsonl"
+                with _erros_lock:
+                    _gravar_bytes(arquivo_erro, _json_line({"nome": nome_erro, **erro_data}), 'ab')
+                logger.error(f"💾 Erro '{nome_erro}' salvo: {arquivo_erro}")
+                return arquivo_erro
+
             arquivo_erro = f"{diretorio}/ERRO_{nome_erro}_{timestamp}.txt"
             with open(arquivo_erro, 'w', encoding='utf-8') as f:
                 f.write(f"ERRO: {nome_erro}\n")
@@ -767,6 +1005,7 @@ class AutoSaveManager:
                 f.write(f"Mensagem: {str(erro)}\n")
                 if contexto:
                     f.write(f"Contexto: {json.dumps(contexto, ensure_ascii=False, indent=2)}\n")
+            _invalidar_indice_etapas(session_id)
 
             logger.error(f"💾 Erro '{nome_erro}' salvo: {arquivo_erro}")
             return arquivo_erro
@@ -806,78 +1045,32 @@ class AutoSaveManager:
             arquivo_completo = f"{diretorio}/{nome_arquivo}"
 
             # Salva como JSON
-            with open(arquivo_completo, 'w', encoding='utf-8') as f:
-                if isinstance(dados, (dict, list)):
-                    json.dump(dados, f, ensure_ascii=False, indent=2)
-                else:
-                    json.dump({"modulo": nome_modulo, "dados": str(dados), "timestamp": timestamp}, f, ensure_ascii=False, indent=2)
+            if isinstance(dados, (dict, list)):
+                _gravar_json(arquivo_completo, dados)
+            else:
+                _gravar_json(arquivo_completo, {"modulo": nome_modulo, "dados": str(dados), "timestamp": timestamp})
 
-            logger.info(f"📁 Módulo '{nome_modulo}' salvo em analyses_data: {arquivo_completo}")
+            logger.info("📁 Módulo '%s' salvo em analyses_data: %s", nome_modulo, arquivo_completo)
             return arquivo_completo
 
         except Exception as e:
             logger.error(f"❌ Erro ao salvar módulo {nome_modulo} em analyses_data: {e}")
             return ""
 
-    def salvar_json_gigante(self, dados: Dict[str, Any], session_id: str) -> str:
-        """Salva JSON gigante com dados massivos"""
-        try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"dados_massivos_{session_id}_{timestamp}.json"
-            filepath = os.path.join(self.base_dir, "completas", filename)
-
-            # Garante que o diretório existe
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-
-            # Salva JSON com formatação
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(dados, f, ensure_ascii=False, indent=2)
-
-            # Calcula estatísticas
-            file_size = os.path.getsize(filepath)
-            content_length = len(json.dumps(dados, ensure_ascii=False))
-
-            logger.info(f"💾 JSON gigante salvo: {filepath}")
-            logger.info(f"📊 Tamanho: {file_size:,} bytes ({content_length:,} caracteres)")
-
-            return filepath
-
-        except Exception as e:
-            logger.error(f"❌ Erro ao salvar JSON gigante: {e}")
-            raise
-
-    def recuperar_etapa(self, nome_etapa: str, session_id: str = None) -> Dict[str, Any]:
-        """Recupera dados de uma etapa salva"""
-        try:
-            if session_id:
-                diretorio = f"{self.relatorios_dir}/{session_id}"
-            else:
-                diretorio = self.relatorios_dir
-
-            # Procura arquivo da etapa
-            import glob
-            pattern = f"{diretorio}/*{nome_etapa}*.json"
-            arquivos = glob.glob(pattern)
-
-            if not arquivos:
-                return {"status": "nao_encontrado", "dados": {}}
-
-            # Pega o arquivo mais recente
-            arquivo_mais_recente = max(arquivos, key=os.path.getctime)
-
-            with open(arquivo_mais_recente, 'r', encoding='utf-8') as f:
-                dados = json.load(f)
-
-            return {"status": "sucesso", "dados": dados, "arquivo": arquivo_mais_recente}
-
-        except Exception as e:
-            logger.error(f"❌ Erro ao recuperar etapa {nome_etapa}: {e}")
-            return {"status": "erro", "erro": str(e), "dados": {}}
-
     def listar_etapas_salvas(self, session_id: str = None) -> Dict[str, str]:
         """Lista todas as etapas salvas"""
         etapas = {}
 
+        if session_id:
+            with _indice_etapas_lock:
+                cached = _indice_etapas.get(session_id)
+                versao = _indice_versao.get(session_id, 0)
+            if cached is not None:
+                return dict(cached)
+
+        # Lê a versão antes de drenar a fila: gravações posteriores invalidam a varredura
+        aguardar_gravacoes(session_id)
+
         try:
             if session_id:
                 base_dir = f"{self.relatorios_dir}"
@@ -890,6 +1083,10 @@ class AutoSaveManager:
                                 if arquivo.endswith(('.json', '.txt')):
                                     nome_etapa = arquivo.split('_')[0]
                                     etapas[nome_etapa] = f"{session_path}/{arquivo}"
+                with _indice_etapas_lock:
+                    # Só guarda se nenhuma gravação aconteceu durante a varredura
+                    if _indice_versao.get(session_id, 0) == versao:
+                        _indice_etapas[session_id] = dict(etapas)
 
         except Exception as e:
             logger.error(f"❌ Erro ao listar etapas: {e}")
@@ -905,8 +1102,7 @@ class AutoSaveManager:
                 arquivo = etapas[nome_etapa]
 
                 if arquivo.endswith('.json'):
-                    with open(arquivo, 'r', encoding='utf-8') as f:
-                        dados = json.load(f)
+                    dados = expandir_snapshot(_ler_json(arquivo))
                     return {"status": "sucesso", "dados": dados}
                 else:
                     with open(arquivo, 'r', encoding='utf-8') as f:
@@ -929,10 +1125,9 @@ class AutoSaveManager:
 
             arquivo = f"{diretorio}/dados_massivos_{session_id}_{timestamp}.json"
 
-            with open(arquivo, 'w', encoding='utf-8') as f:
-                json.dump(dados_massivos, f, ensure_ascii=False, indent=2)
+            _gravar_json(arquivo, dados_massivos)
 
-            logger.info(f"🗂️ JSON gigante salvo: {arquivo}")
+            logger.info("🗂️ JSON gigante salvo: %s", arquivo)
             return arquivo
 
         except Exception as e:
@@ -957,7 +1152,7 @@ class AutoSaveManager:
             with open(arquivo_txt, 'w', encoding='utf-8') as f:
                 f.write(relatorio)
 
-            logger.info(f"📄 Relatório final salvo: {arquivo_md}")
+            logger.info("📄 Relatório final salvo: %s", arquivo_md)
             return arquivo_md
 
         except Exception as e:
@@ -1115,7 +1310,7 @@ class AutoSaveManager:
                         session_id
                     )
 
-                    logger.info(f"🔮 Score de qualidade calculado para {nome_etapa}: {qualidade_score:.1f}")
+                    logger.info("🔮 Score de qualidade calculado para %s: %.1f", nome_etapa, qualidade_score)
 
                 except Exception as e:
                     logger.warning(f"⚠️ Erro ao calcular qualidade para {nome_etapa}: {e}")
@@ -1152,7 +1347,7 @@ class AutoSaveManager:
                                 session_id
                             )
 
-                            logger.info(f"🔮 Insights parciais gerados para {nome_etapa}")
+                            logger.info("🔮 Insights parciais gerados para %s", nome_etapa)
 
                         finally:
                             loop.close()
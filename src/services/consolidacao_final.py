@@ -12,7 +12,7 @@ import json
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
-from services.auto_save_manager import auto_save_manager, salvar_etapa, salvar_erro
+from services.auto_save_manager import auto_save_manager, salvar_etapa, salvar_erro, aguardar_gravacoes
 
 logger = logging.getLogger(__name__)
 
@@ -434,6 +434,7 @@ class ConsolidacaoFinal:
         
         arquivos = []
         base_dir = Path("relatorios_intermediarios")
+        aguardar_gravacoes(session_id)
         
         try:
             # Busca em todos os subdiretórios
@@ -8,9 +8,9 @@ Gerenciador de IA com suporte a ferramentas e busca ativa
 import os
 import logging
 import asyncio
+import time
 import json
 from typing import Dict, List, Optional, Any, Union
-from datetime import datetime
 from dotenv import load_dotenv
 
 # Carregar variáveis de ambiente
@@ -183,8 +183,8 @@ class EnhancedAIManager:
         """
         logger.info(f"🔍 Iniciando geração com busca ativa (min_time: {min_processing_time}s)")
         
-        # Registrar tempo de início para garantir tempo mínimo
-        start_time = datetime.now()
+        # Registrar tempo de início para garantir tempo mínimo (relógio monotônico)
+        start_time = time.perf_counter()
 
         # Usar modelo preferido se especificado
         if preferred_model == "qwen" and "openrouter" in self.providers and self.providers["openrouter"]["available"]:
@@ -314,7 +314,7 @@ IMPORTANTE: Gere uma análise completa mesmo sem ferramentas de busca, baseando-
 
                     # Garantir tempo mínimo de processamento se especificado
                     if min_processing_time > 0:
-                        elapsed_time = (datetime.now() - start_time).total_seconds()
+                        elapsed_time = time.perf_counter() - start_time
                         if elapsed_time < min_processing_time:
                             remaining_time = min_processing_time - elapsed_time
                             logger.info(f"⏱️ Aguardando {remaining_time:.1f}s para completar tempo mínimo de especialização")
@@ -6,15 +6,18 @@ Cliente robusto para busca massiva em redes sociais usando Firecrwal
 """
 
 import os
+import re
 import logging
 import requests
 import time
 import json
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+_TAGS_HTML = re.compile(r'<[^>]+>')
+
 class FirecrwalSocialClient:
     """Cliente Firecrwal para busca massiva em redes sociais"""
 
@@ -279,6 +282,7 @@ class FirecrwalSocialClient:
         video_titles = re.findall(r'<h3[^>]*>(.*?)</h3>', content, re.DOTALL)
         view_counts = re.findall(r'(\d+(?:\.\d+)?[KMB]?) visualizações', content)
 
+        extracted_at = datetime.now().isoformat()  # um timestamp por lote
         for i, title in enumerate(video_titles[:20]):  # Máximo 20 resultados
             clean_title = re.sub(r'<[^>]+>', '', title).strip()
             if clean_title and len(clean_title) > 10:
@@ -287,136 +291,71 @@ class FirecrwalSocialClient:
                     'views': view_counts[i] if i < len(view_counts) else 'N/A',
                     'platform': 'youtube',
                     'type': 'video',
-                    'extracted_at': datetime.now().isoformat(),
+                    'extracted_at': extracted_at,
                     'relevance_score': self._calculate_relevance_score(clean_title)
                 })
 
         return results
 
-    def _process_twitter_data(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Processa dados do Twitter"""
+    def _extract_pattern_results(self, data: Dict[str, Any], pattern: str, max_items: int, min_length: int,
+                                 text_field: str, platform: str, item_type: str,
+                                 extra_fields: Optional[Callable[[str, str], Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """Motor comum dos processadores por plataforma: regex de blocos -> texto limpo -> resultado"""
 
         results = []
         content = data.get('markdown', '') + data.get('html', '')
 
-        # Extrai tweets usando padrões
-        import re
-
-        tweet_patterns = re.findall(r'<div[^>]*tweet[^>]*>(.*?)</div>', content, re.DOTALL)
-
-        for tweet in tweet_patterns[:25]:  # Máximo 25 tweets
-            clean_tweet = re.sub(r'<[^>]+>', '', tweet).strip()
-            if clean_tweet and len(clean_tweet) > 20:
-                results.append({
-                    'text': clean_tweet,
-                    'platform': 'twitter',
-                    'type': 'tweet',
-                    'extracted_at': datetime.now().isoformat(),
-                    'relevance_score': self._calculate_relevance_score(clean_tweet),
-                    'engagement_indicators': self._extract_engagement_indicators(tweet)
-                })
+        extracted_at = datetime.now().isoformat()  # um timestamp por lote
+        for raw in re.findall(pattern, content, re.DOTALL)[:max_items]:
+            clean_text = _TAGS_HTML.sub('', raw).strip()
+            if clean_text and len(clean_text) > min_length:
+                item = {
+                    text_field: clean_text,
+                    'platform': platform,
+                    'type': item_type,
+                    'extracted_at': extracted_at,
+                    'relevance_score': self._calculate_relevance_score(clean_text)
+                }
+                if extra_fields:
+                    item.update(extra_fields(raw, clean_text))
+                results.append(item)
 
         return results
 
+    def _process_twitter_data(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Processa dados do Twitter"""
+        return self._extract_pattern_results(
+            data, r'<div[^>]*tweet[^>]*>(.*?)</div>', 25, 20, 'text', 'twitter', 'tweet',
+            lambda raw, clean: {'engagement_indicators': self._extract_engagement_indicators(raw)}
+        )
+
     def _process_instagram_data(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Processa dados do Instagram"""
-
-        results = []
-        content = data.get('markdown', '') + data.get('html', '')
-
-        # Extrai posts do Instagram
-        import re
-
-        post_patterns = re.findall(r'<article[^>]*>(.*?)</article>', content, re.DOTALL)
-
-        for post in post_patterns[:20]:  # Máximo 20 posts
-            clean_post = re.sub(r'<[^>]+>', '', post).strip()
-            if clean_post and len(clean_post) > 15:
-                results.append({
-                    'caption': clean_post,
-                    'platform': 'instagram',
-                    'type': 'post',
-                    'extracted_at': datetime.now().isoformat(),
-                    'relevance_score': self._calculate_relevance_score(clean_post),
-                    'hashtags': re.findall(r'#\w+', clean_post)
-                })
-
-        return results
+        return self._extract_pattern_results(
+            data, r'<article[^>]*>(.*?)</article>', 20, 15, 'caption', 'instagram', 'post',
+            lambda raw, clean: {'hashtags': re.findall(r'#\w+', clean)}
+        )
 
     def _process_linkedin_data(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Processa dados do LinkedIn"""
-
-        results = []
-        content = data.get('markdown', '') + data.get('html', '')
-
-        # Extrai posts profissionais
-        import re
-
-        post_patterns = re.findall(r'<div[^>]*feed-update[^>]*>(.*?)</div>', content, re.DOTALL)
-
-        for post in post_patterns[:15]:  # Máximo 15 posts
-            clean_post = re.sub(r'<[^>]+>', '', post).strip()
-            if clean_post and len(clean_post) > 30:
-                results.append({
-                    'content': clean_post,
-                    'platform': 'linkedin',
-                    'type': 'professional_post',
-                    'extracted_at': datetime.now().isoformat(),
-                    'relevance_score': self._calculate_relevance_score(clean_post),
-                    'professional_indicators': self._extract_professional_indicators(clean_post)
-                })
-
-        return results
+        return self._extract_pattern_results(
+            data, r'<div[^>]*feed-update[^>]*>(.*?)</div>', 15, 30, 'content', 'linkedin', 'professional_post',
+            lambda raw, clean: {'professional_indicators': self._extract_professional_indicators(clean)}
+        )
 
     def _process_tiktok_data(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Processa dados do TikTok"""
-
-        results = []
-        content = data.get('markdown', '') + data.get('html', '')
-
-        # Extrai vídeos do TikTok
-        import re
-
-        video_patterns = re.findall(r'<div[^>]*video[^>]*>(.*?)</div>', content, re.DOTALL)
-
-        for video in video_patterns[:15]:  # Máximo 15 vídeos
-            clean_desc = re.sub(r'<[^>]+>', '', video).strip()
-            if clean_desc and len(clean_desc) > 10:
-                results.append({
-                    'description': clean_desc,
-                    'platform': 'tiktok',
-                    'type': 'video',
-                    'extracted_at': datetime.now().isoformat(),
-                    'relevance_score': self._calculate_relevance_score(clean_desc),
-                    'viral_indicators': self._extract_viral_indicators(video)
-                })
-
-        return results
+        return self._extract_pattern_results(
+            data, r'<div[^>]*video[^>]*>(.*?)</div>', 15, 10, 'description', 'tiktok', 'video',
+            lambda raw, clean: {'viral_indicators': self._extract_viral_indicators(raw)}
+        )
 
     def _process_facebook_data(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Processa dados do Facebook"""
-
-        results = []
-        content = data.get('markdown', '') + data.get('html', '')
-
-        # Extrai posts do Facebook
-        import re
-
-        post_patterns = re.findall(r'<div[^>]*userContent[^>]*>(.*?)</div>', content, re.DOTALL)
-
-        for post in post_patterns[:20]:  # Máximo 20 posts
-            clean_post = re.sub(r'<[^>]+>', '', post).strip()
-            if clean_post and len(clean_post) > 20:
-                results.append({
-                    'text': clean_post,
-                    'platform': 'facebook',
-                    'type': 'post',
-                    'extracted_at': datetime.now().isoformat(),
-                    'relevance_score': self._calculate_relevance_score(clean_post),
-                    'social_indicators': self._extract_social_indicators(post)
-                })
-
-        return results
+        return self._extract_pattern_results(
+            data, r'<div[^>]*userContent[^>]*>(.*?)</div>', 20, 20, 'text', 'facebook', 'post',
+            lambda raw, clean: {'social_indicators': self._extract_social_indicators(raw)}
+        )
 
     def _extract_insights_and_comments(self, all_results: Dict[str, Any]) -> Dict[str, Any]:
         """Extrai insights e comentários relevantes"""
@@ -67,15 +67,9 @@ class MassiveDataCollector:
             }
             
             # Chama o método assíncrono de forma síncrona
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                return loop.run_until_complete(
-                    self.execute_massive_collection(query, context, session_id)
-                )
-            finally:
-                loop.close()
+            return asyncio.run(
+                self.execute_massive_collection(query, context, session_id)
+            )
                 
         except Exception as e:
             logger.error(f"Erro na coleta de dados: {e}")
@@ -90,7 +84,7 @@ class MassiveDataCollector:
         """Executa coleta massiva de dados com novos serviços"""
 
         logger.info(f"🚀 INICIANDO COLETA MASSIVA APRIMORADA - Sessão: {session_id}")
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Estrutura de dados consolidados
         massive_data = {
@@ -266,7 +260,7 @@ class MassiveDataCollector:
             massive_data["extracted_content"] = all_results
 
             # Calcula estatísticas finais
-            collection_time = time.time() - start_time
+            collection_time = time.perf_counter() - start_time
             total_sources = len(all_results)
             total_content = sum(len(str(item)) for item in all_results)
 
@@ -16,13 +16,16 @@ import time
 # Importações de serviços
 from services.alibaba_websailor import alibaba_websailor
 from services.real_search_orchestrator import RealSearchOrchestrator
-from services.auto_save_manager import auto_save_manager # Importação movida para o topo
+from services.auto_save_manager import auto_save_manager, aguardar_gravacoes, expandir_snapshot, nome_arquivo_busca # Importação movida para o topo
 
 # Adicionar o diretório src ao path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 logger = logging.getLogger(__name__)
 
+# Buscas WebSailor simultâneas em execute_massive_search
+_MAX_BUSCAS_SIMULTANEAS = int(os.getenv('MASSIVE_SEARCH_MAX_CONCURRENCY', '3'))
+
 class MassiveSearchEngine:
     """Sistema de busca massiva com múltiplas APIs e rotação"""
 
@@ -37,7 +40,7 @@ class MassiveSearchEngine:
 
         os.makedirs(self.data_dir, exist_ok=True)
 
-        logger.info(f"🔍 Massive Search Engine inicializado - Mínimo: {self.min_size_kb}KB")
+        logger.info("🔍 Massive Search Engine inicializado - Mínimo: %sKB", self.min_size_kb)
 
     async def execute_massive_search(self, produto: str, publico_alvo: str, session_id: str, **kwargs) -> Dict[str, Any]:
         """
@@ -51,11 +54,11 @@ class MassiveSearchEngine:
             logger.warning(f"⚠️ Argumentos inesperados recebidos e ignorados: {list(kwargs.keys())}")
 
         try:
-            logger.info(f"🚀 INICIANDO BUSCA MASSIVA: {produto}")
+            logger.info("🚀 INICIANDO BUSCA MASSIVA: %s", produto)
 
             # Arquivo de resultado
-            produto_clean = produto.replace(' ', '_').replace('/', '_')
-            resultado_file = os.path.join(self.data_dir, f"RES_BUSCA_{produto_clean.upper()}.json")
+            # Mesmo nome que AutoSaveManager.save_massive_search_result grava
+            resultado_file = os.path.join(self.data_dir, nome_arquivo_busca(produto))
 
             # Estrutura de dados massiva
             massive_data = {
@@ -84,40 +87,43 @@ class MassiveSearchEngine:
             # Queries de busca massiva
             search_queries = self._generate_search_queries(produto, publico_alvo)
 
-            logger.info(f"📋 {len(search_queries)} queries geradas para busca massiva")
+            logger.info("📋 %s queries geradas para busca massiva", len(search_queries))
 
             # Executar buscas com limite fixo para evitar loop infinito
-            current_size = 0
-            search_count = 0
-            max_searches = min(len(search_queries), 10)  # Máximo 10 buscas para evitar loop
+            queries = search_queries[:10]  # Máximo 10 buscas para evitar loop
+            search_count = len(queries)
 
-            for query in search_queries[:max_searches]:  # Processa apenas as primeiras queries
-                search_count += 1
-                logger.info(f"🔍 Busca {search_count}: {query[:50]}...")
+            # Queries independentes rodam em paralelo, limitadas pelo semáforo
+            sem = asyncio.Semaphore(_MAX_BUSCAS_SIMULTANEAS)
 
-                # ALIBABA WebSailor - PRINCIPAL
-                try:
-                    websailor_result = await self._search_alibaba_websailor(query, session_id)
-                    if websailor_result:
-                        massive_data['busca_massiva']['alibaba_websailor_results'].append(websailor_result)
-                        massive_data['metadata']['apis_used'].append('alibaba_websailor')
-                        logger.info(f"✅ ALIBABA WebSailor: dados coletados")
-                except Exception as e:
-                    logger.warning(f"⚠️ ALIBABA WebSailor falhou: {e}")
+            async def _buscar(numero: int, query: str):
+                async with sem:
+                    logger.info("🔍 Busca %s: %s...", numero, query[:50])
+                    return await self._search_alibaba_websailor(query, session_id)
+
+            resultados = await asyncio.gather(
+                *(_buscar(i, q) for i, q in enumerate(queries, 1)),
+                return_exceptions=True
+            )
 
-                # REAL SEARCH ORCHESTRATOR JÁ FOI EXECUTADO NO WORKFLOW - EVITAR LOOP
-                # Apenas registra que os dados já foram coletados
-                # massive_data['metadata']['apis_used'].append('real_search_orchestrator_already_executed') # Removido para evitar poluição de metadados
-                logger.info(f"✅ Real Search Orchestrator: dados já coletados no workflow principal (se aplicável)")
+            # ALIBABA WebSailor - PRINCIPAL (mantém a ordem das queries)
+            for websailor_result in resultados:
+                if isinstance(websailor_result, Exception):
+                    logger.warning(f"⚠️ ALIBABA WebSailor falhou: {websailor_result}")
+                elif websailor_result:
+                    massive_data['busca_massiva']['alibaba_websailor_results'].append(websailor_result)
+                    massive_data['metadata']['apis_used'].append('alibaba_websailor')
+                    logger.info("✅ ALIBABA WebSailor: dados coletados")
 
-                # Verificar tamanho atual
-                current_json = json.dumps(massive_data, ensure_ascii=False, indent=2)
-                current_size = len(current_json.encode('utf-8'))
+            # REAL SEARCH ORCHESTRATOR JÁ FOI EXECUTADO NO WORKFLOW - EVITAR LOOP
+            # Apenas registra que os dados já foram coletados
+            logger.info("✅ Real Search Orchestrator: dados já coletados no workflow principal (se aplicável)")
 
-                logger.info(f"📊 Tamanho atual: {current_size/1024:.1f}KB / {self.min_size_kb}KB")
+            # Verificar tamanho atual
+            current_json = json.dumps(massive_data, ensure_ascii=False, indent=2)
+            current_size = len(current_json.encode('utf-8'))
 
-                # Pequena pausa entre buscas
-                await asyncio.sleep(1)
+            logger.info("📊 Tamanho atual: %.1fKB / %sKB", current_size/1024, self.min_size_kb)
 
             # Finalizar dados
             massive_data['timestamp_fim'] = datetime.now().isoformat()
@@ -133,7 +139,7 @@ class MassiveSearchEngine:
             save_result = self.auto_save_manager.save_massive_search_result(massive_data, produto)
 
             if save_result.get('success'):
-                logger.info(f"✅ Resultado massivo CONSOLIDADO salvo: {save_result['filename']} ({save_result['size_kb']:.1f}KB)")
+                logger.info("✅ Resultado massivo CONSOLIDADO salvo: %s (%.1fKB)", save_result['filename'], save_result['size_kb'])
                 return massive_data # Retorna o massive_data consolidado
             else:
                 logger.error(f"❌ Erro ao salvar resultado massivo: {save_result.get('error')}")
@@ -205,7 +211,7 @@ class MassiveSearchEngine:
     async def _search_alibaba_websailor(self, query: str, session_id: str) -> Optional[Dict[str, Any]]:
         """Busca usando ALIBABA WebSailor - FOCO EM TEXTO"""
         try:
-            logger.info(f"🌐 ALIBABA WebSailor executando busca TEXTUAL: {query}")
+            logger.info("🌐 ALIBABA WebSailor executando busca TEXTUAL: %s", query)
 
             # FOCO PRINCIPAL: NAVEGAÇÃO PARA EXTRAIR TEXTO
             navigation_result = await self.websailor.navigate_and_research_deep(
@@ -244,7 +250,7 @@ class MassiveSearchEngine:
     async def _search_real_orchestrator(self, query: str, session_id: str) -> Optional[Dict[str, Any]]:
         """Busca usando Real Search Orchestrator - SISTEMA PRINCIPAL"""
         try:
-            logger.info(f"🎯 Real Search Orchestrator executando busca: {query}")
+            logger.info("🎯 Real Search Orchestrator executando busca: %s", query)
 
             # Usa o método CORRETO que existe no RealSearchOrchestrator
             result = await self.real_search.execute_massive_real_search(
@@ -315,28 +321,29 @@ class MassiveSearchEngine:
             caracteres_totais = 0
             urls_unicas = set()
 
+            trechos_navegacao = dados_consolidados['trechos_navegacao']
+
             def _extract_and_add_text(data_item: Any, source_type: str, url: Optional[str] = None):
                 nonlocal textos_processados, caracteres_totais, urls_unicas
+                # Monta os trechos do item de uma vez e estende a lista numa única chamada
                 if isinstance(data_item, dict):
-                    for key, value in data_item.items():
-                        if isinstance(value, str) and len(value) > 50:
-                            dados_consolidados['trechos_navegacao'].append({
-                                'fonte': f"{source_type}_{key}",
-                                'texto': value,
-                                'caracteres': len(value)
-                            })
-                            caracteres_totais += len(value)
-                            textos_processados += 1
+                    novos = [
+                        {'fonte': f"{source_type}_{key}", 'texto': value, 'caracteres': len(value)}
+                        for key, value in data_item.items()
+                        if isinstance(value, str) and len(value) > 50
+                    ]
                 elif isinstance(data_item, list):
-                    for item in data_item:
-                        if isinstance(item, str) and len(item) > 50:
-                            dados_consolidados['trechos_navegacao'].append({
-                                'fonte': source_type,
-                                'texto': item,
-                                'caracteres': len(item)
-                            })
-                            caracteres_totais += len(item)
-                            textos_processados += 1
+                    novos = [
+                        {'fonte': source_type, 'texto': item, 'caracteres': len(item)}
+                        for item in data_item
+                        if isinstance(item, str) and len(item) > 50
+                    ]
+                else:
+                    novos = []
+                if novos:
+                    trechos_navegacao.extend(novos)
+                    textos_processados += len(novos)
+                    caracteres_totais += sum(novo['caracteres'] for novo in novos)
                 if url and url != 'N/A':
                     urls_unicas.add(url)
 
@@ -350,28 +357,26 @@ class MassiveSearchEngine:
                                 conteudo = nav_data.get('conteudo_consolidado', {})
                                 
                                 # Textos principais
-                                for texto in conteudo.get('textos_principais', []):
-                                    dados_consolidados['textos_pesquisa_web'].append({
-                                        'fonte': 'websailor_navegacao',
-                                        'url': result.get('query', 'N/A'),
-                                        'texto': str(texto),
-                                        'caracteres': len(str(texto))
-                                    })
-                                    caracteres_totais += len(str(texto))
-                                    textos_processados += 1
-                                    if result.get('query') and result.get('query') != 'N/A':
-                                        urls_unicas.add(result['query'])
+                                query_result = result.get('query', 'N/A')
+                                textos = [str(texto) for texto in conteudo.get('textos_principais', [])]
+                                dados_consolidados['textos_pesquisa_web'].extend(
+                                    {'fonte': 'websailor_navegacao', 'url': query_result, 'texto': texto, 'caracteres': len(texto)}
+                                    for texto in textos
+                                )
+                                caracteres_totais += sum(map(len, textos))
+                                textos_processados += len(textos)
+                                if textos and query_result and query_result != 'N/A':
+                                    urls_unicas.add(query_result)
                                 
                                 # Insights extraídos
-                                for insight in conteudo.get('insights_principais', []):
-                                    dados_consolidados['insights_extraidos'].append({
-                                        'fonte': 'websailor_insights',
-                                        'insight': str(insight),
-                                        'caracteres': len(str(insight))
-                                    })
-                                    caracteres_totais += len(str(insight))
+                                insights = [str(insight) for insight in conteudo.get('insights_principais', [])]
+                                dados_consolidados['insights_extraidos'].extend(
+                                    {'fonte': 'websailor_insights', 'insight': insight, 'caracteres': len(insight)}
+                                    for insight in insights
+                                )
+                                caracteres_totais += sum(map(len, insights))
                 
-                logger.info(f"✅ Coletados {textos_processados} textos da pesquisa web (WebSailor)")
+                logger.info("✅ Coletados %s textos da pesquisa web (WebSailor)", textos_processados)
             except Exception as e:
                 logger.error(f"❌ Erro ao coletar textos web (WebSailor): {e}")
 
@@ -386,7 +391,7 @@ class MassiveSearchEngine:
                             _extract_and_add_text(step_data, f"etapa_extracao_{step.get('nome', 'step')}")
                         except Exception as e:
                             logger.warning(f"⚠️ Erro ao processar step do auto_save_manager: {e}")
-                logger.info(f"✅ Processados steps salvos do auto_save_manager")
+                logger.info("✅ Processados steps salvos do auto_save_manager")
             except Exception as e:
                 logger.error(f"❌ Erro ao coletar etapas salvas do auto_save_manager: {e}")
 
@@ -399,6 +404,13 @@ class MassiveSearchEngine:
                 'pesquisa_web': 'trechos_pesquisa_web'
             }
 
+            # consolidado.json de pesquisa_web é gerado sob demanda a partir do consolidado.jsonl
+            try:
+                aguardar_gravacoes(session_id)
+                self.auto_save_manager.materializar_consolidado(session_id)
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao materializar consolidado: {e}")
+
             for category_dir, target_list_name in data_categories.items():
                 try:
                     base_path = os.path.join(self.data_dir, category_dir)
@@ -410,7 +422,8 @@ class MassiveSearchEngine:
                                     arquivo_path = os.path.join(session_path, arquivo)
                                     try:
                                         with open(arquivo_path, 'r', encoding='utf-8') as f:
-                                            dados_arquivo = json.load(f)
+                                            # Registros de snapshot msgpack apontam para o conteúdo da etapa
+                                            dados_arquivo = expandir_snapshot(json.load(f))
                                             
                                             # Adiciona ao massive_data['dados_consolidados_texto'] diretamente
                                             dados_consolidados[target_list_name].append({
@@ -422,7 +435,7 @@ class MassiveSearchEngine:
 
                                     except Exception as e:
                                         logger.warning(f"⚠️ Erro ao ler {arquivo_path} na categoria {category_dir}: {e}")
-                    logger.info(f"✅ Coletados dados da categoria: {category_dir}")
+                    logger.info("✅ Coletados dados da categoria: %s", category_dir)
                 except Exception as e:
                     logger.error(f"❌ Erro ao coletar dados da categoria {category_dir}: {e}")
 
@@ -441,7 +454,7 @@ class MassiveSearchEngine:
             # Adiciona dados consolidados ao massive_data (APENAS TEXTO)
             massive_data['dados_consolidados_texto'] = dados_consolidados
 
-            logger.info(f"✅ CONSOLIDAÇÃO TEXTUAL CONCLUÍDA: {textos_processados} textos processados")
+            logger.info("✅ CONSOLIDAÇÃO TEXTUAL CONCLUÍDA: %s textos processados", textos_processados)
             logger.info(f"📝 Total: {caracteres_totais:,} caracteres para análise da IA")
 
             return massive_data
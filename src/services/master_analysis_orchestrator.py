@@ -7,6 +7,7 @@ Orquestrador mestre que implementa a nova metodologia aprimorada
 """
 
 import os
+import asyncio
 import logging
 import time
 from datetime import datetime
@@ -45,7 +46,7 @@ class MasterAnalysisOrchestrator:
         """Executa análise completa com nova metodologia aprimorada"""
         
         logger.info("🚀 INICIANDO ANÁLISE COMPLETA COM METODOLOGIA APRIMORADA")
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Salva início da análise
         analysis_metadata = {
@@ -89,7 +90,7 @@ class MasterAnalysisOrchestrator:
             detailed_report = self._execute_phase_4_report_generation(massive_data, modules_results, context, session_id, progress_callback)
             
             # Finalização
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             
             final_results = {
                 "success": True,
@@ -209,15 +210,9 @@ class MasterAnalysisOrchestrator:
                 progress_callback(3.1, "🔧 Iniciando processamento dos módulos...")
             
             # Executa processamento de módulos usando dados massivos
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                modules_results = loop.run_until_complete(
-                    enhanced_module_processor.generate_all_modules(session_id)
-                )
-            finally:
-                loop.close()
+            modules_results = asyncio.run(
+                enhanced_module_processor.generate_all_modules(session_id)
+            )
             
             if progress_callback:
                 progress_callback(3.9, "✅ Todos os módulos processados")
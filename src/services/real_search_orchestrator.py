@@ -9,11 +9,14 @@ import os
 import logging
 import asyncio
 import time
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote_plus
 import json
+import re
 import requests
 
 # Optional aiohttp import with fallback
@@ -32,6 +35,28 @@ logger = logging.getLogger(__name__)
 if not AIOHTTP_AVAILABLE:
     logger.warning("aiohttp não instalado – usando fallback síncrono com requests para Real Search Orchestrator")
 
+# Máximo de provedores consultados ao mesmo tempo em execute_massive_real_search
+_MAX_PROVEDORES_SIMULTANEOS = int(os.getenv('REAL_SEARCH_MAX_CONCURRENCY', '8'))
+
+# Validade (s) e tamanho máximo do cache de resultados por provedor
+_CACHE_TTL = float(os.getenv('REAL_SEARCH_CACHE_TTL', '300'))
+_CACHE_MAX = 256
+
+# Abas abertas ao mesmo tempo na captura de screenshots com Playwright
+_MAX_PARALLEL_PAGES = int(os.getenv('SCREENSHOT_MAX_PARALLEL_PAGES', '3'))
+
+# Marcadores de dado simulado/exemplo, compilados uma vez (uma varredura por campo)
+_PALAVRAS_SIMULACAO = re.compile(
+    r'exemplo|sample|test|mock|demo|placeholder|lorem ipsum|fake|dummy|template', re.IGNORECASE
+)
+_PALAVRAS_TITULO_INVALIDO = re.compile(r'exemplo|sample|test|mock|demo', re.IGNORECASE)
+_PALAVRAS_SNIPPET_INVALIDO = re.compile(r'exemplo|sample|test|mock', re.IGNORECASE)
+_PALAVRAS_NICHO = re.compile(r'patchwork|costura|quilting|artesanato', re.IGNORECASE)
+
+def _url_canonica(url: Optional[str]) -> str:
+    """Chave de comparação de URLs: sem espaços, minúscula e sem barra final"""
+    return (url or '').strip().lower().rstrip('/')
+
 class RealSearchOrchestrator:
     """Orquestrador de busca REAL massiva - ZERO SIMULAÇÃO"""
 
@@ -63,6 +88,11 @@ class RealSearchOrchestrator:
             'SUPADATA': os.getenv('SUPADATA_API_URL', 'https://server.smithery.ai/@supadata-ai/mcp/mcp')
         }
 
+        # Resultados recentes por (provedor, query normalizada[, sessão]) -> (instante, resultado)
+        # (a instância é compartilhada por loops de threads diferentes, daí o lock)
+        self._cache_resultados: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+
         self.session_stats = {
             'total_searches': 0,
             'successful_searches': 0,
@@ -72,7 +102,7 @@ class RealSearchOrchestrator:
             'screenshots_captured': 0
         }
 
-        logger.info(f"🚀 Real Search Orchestrator inicializado com {sum(len(keys) for keys in self.api_keys.values())} chaves totais")
+        logger.info("🚀 Real Search Orchestrator inicializado com %s chaves totais", sum(len(keys) for keys in self.api_keys.values()))
         logger.info("🔥 MODO: 100% DADOS REAIS - ZERO SIMULAÇÃO - ZERO EXEMPLOS")
 
     def _salvar_erro(self, error_type: str, error_data: Dict[str, Any]):
@@ -107,7 +137,7 @@ class RealSearchOrchestrator:
 
             if keys:
                 api_keys[provider] = keys
-                logger.info(f"✅ {provider}: {len(keys)} chaves carregadas")
+                logger.info("✅ %s: %s chaves carregadas", provider, len(keys))
 
         return api_keys
 
@@ -130,7 +160,7 @@ class RealSearchOrchestrator:
             self.session_stats['api_rotations'][provider] = 0
         self.session_stats['api_rotations'][provider] += 1
 
-        logger.debug(f"🔄 {provider}: Usando chave {current_index + 1}/{len(keys)}")
+        logger.debug("🔄 %s: Usando chave %s/%s", provider, current_index + 1, len(keys))
         return key
 
     async def execute_massive_real_search(
@@ -141,8 +171,8 @@ class RealSearchOrchestrator:
     ) -> Dict[str, Any]:
         """Executa busca REAL massiva com todos os provedores"""
 
-        logger.info(f"🚀 INICIANDO BUSCA REAL MASSIVA para: {query}")
-        start_time = time.time()
+        logger.info("🚀 INICIANDO BUSCA REAL MASSIVA para: %s", query)
+        start_time = time.perf_counter()
 
         # Estrutura de resultados
         search_results = {
@@ -165,78 +195,82 @@ class RealSearchOrchestrator:
         }
 
         try:
-            # FASE 1: Busca com Alibaba WebSailor (prioritária)
-            logger.info("🔍 FASE 1: Busca com Alibaba WebSailor")
-            websailor_results = await self._search_alibaba_websailor(query, context, session_id)
-
-            if websailor_results.get('success'):
-                search_results['web_results'].extend(websailor_results['results'])
-                search_results['providers_used'].append('ALIBABA_WEBSAILOR')
-                logger.info(f"✅ Alibaba WebSailor retornou {len(websailor_results['results'])} resultados")
-
-            # FASE 2: Busca Web Massiva Simultânea (provedores restantes)
-            logger.info("🌐 FASE 2: Busca web massiva simultânea")
+            # FASES 1-3: WebSailor, provedores web e redes sociais em paralelo
+            logger.info("🌐 FASES 1-3: WebSailor, busca web e redes sociais simultâneas")
             web_tasks = []
 
+            # Cache por query normalizada; Firecrawl e Jina salvam trechos na sessão, então a chave inclui a sessão
+            q = ' '.join(query.lower().split())
+
             # Firecrawl
             if 'FIRECRAWL' in self.api_keys:
-                web_tasks.append(self._search_firecrawl(query, session_id))
+                web_tasks.append(self._com_cache(('FIRECRAWL', q, session_id), lambda: self._search_firecrawl(query, session_id)))
 
             # Jina
             if 'JINA' in self.api_keys:
-                web_tasks.append(self._search_jina(query, session_id))
+                web_tasks.append(self._com_cache(('JINA', q, session_id), lambda: self._search_jina(query, session_id)))
 
             # Google
             if 'GOOGLE' in self.api_keys:
-                web_tasks.append(self._search_google(query))
+                web_tasks.append(self._com_cache(('GOOGLE', q), lambda: self._search_google(query)))
 
             # Exa
             if 'EXA' in self.api_keys:
-                web_tasks.append(self._search_exa(query))
+                web_tasks.append(self._com_cache(('EXA', q), lambda: self._search_exa(query)))
 
             # Serper
             if 'SERPER' in self.api_keys:
-                web_tasks.append(self._search_serper(query))
-
-            # Executa todas as buscas web simultaneamente
-            if web_tasks:
-                web_results = await asyncio.gather(*web_tasks, return_exceptions=True)
-
-                for result in web_results:
-                    if isinstance(result, Exception):
-                        logger.error(f"❌ Erro na busca web: {result}")
-                        continue
+                web_tasks.append(self._com_cache(('SERPER', q), lambda: self._search_serper(query)))
 
-                    if result.get('success') and result.get('results'):
-                        search_results['web_results'].extend(result['results'])
-                        search_results['providers_used'].append(result.get('provider', 'unknown'))
-
-            # FASE 3: Busca em Redes Sociais
-            logger.info("📱 FASE 3: Busca massiva em redes sociais")
             social_tasks = []
 
             # YouTube
             if 'YOUTUBE' in self.api_keys:
-                social_tasks.append(self._search_youtube(query))
+                social_tasks.append(self._com_cache(('YOUTUBE', q), lambda: self._search_youtube(query)))
 
             # Supadata (Instagram, Facebook, TikTok)
             # if 'SUPADATA' in self.api_keys:
             #     social_tasks.append(self._search_supadata(query))
 
-            # Executa buscas sociais
-            if social_tasks:
-                social_results = await asyncio.gather(*social_tasks, return_exceptions=True)
+            # Tempo total passa a ser o do provedor mais lento, não a soma de todos
+            sem = asyncio.Semaphore(_MAX_PROVEDORES_SIMULTANEOS)
+            todas = [self._search_alibaba_websailor(query, context, session_id)] + web_tasks + social_tasks
+            resultados = await asyncio.gather(
+                *(self._com_limite(sem, task) for task in todas),
+                return_exceptions=True
+            )
+            websailor_results = resultados[0]
+            web_results = resultados[1:1 + len(web_tasks)]
+            social_results = resultados[1 + len(web_tasks):]
+
+            # URLs já incorporadas por categoria: duplicatas entre provedores são descartadas ao juntar
+            vistos = {'web_results': set(), 'social_results': set(), 'youtube_results': set()}
+
+            # WebSailor (prioritário: seus resultados vêm primeiro)
+            if isinstance(websailor_results, Exception):
+                logger.error(f"❌ Erro Alibaba WebSailor: {websailor_results}")
+            elif websailor_results.get('success'):
+                self._anexar_sem_duplicatas(search_results, 'web_results', websailor_results['results'], vistos)
+                search_results['providers_used'].append('ALIBABA_WEBSAILOR')
+                logger.info("✅ Alibaba WebSailor retornou %s resultados", len(websailor_results['results']))
 
-                for result in social_results:
-                    if isinstance(result, Exception):
-                        logger.error(f"❌ Erro na busca social: {result}")
-                        continue
+            for result in web_results:
+                if isinstance(result, Exception):
+                    logger.error(f"❌ Erro na busca web: {result}")
+                    continue
 
-                    if result.get('success'):
-                        if result.get('platform') == 'youtube':
-                            search_results['youtube_results'].extend(result.get('results', []))
-                        else:
-                            search_results['social_results'].extend(result.get('results', []))
+                if result.get('success') and result.get('results'):
+                    self._anexar_sem_duplicatas(search_results, 'web_results', result['results'], vistos)
+                    search_results['providers_used'].append(result.get('provider', 'unknown'))
+
+            for result in social_results:
+                if isinstance(result, Exception):
+                    logger.error(f"❌ Erro na busca social: {result}")
+                    continue
+
+                if result.get('success'):
+                    chave = 'youtube_results' if result.get('platform') == 'youtube' else 'social_results'
+                    self._anexar_sem_duplicatas(search_results, chave, result.get('results', []), vistos)
 
             # FASE 4: Identificação de Conteúdo Viral
             logger.info("🔥 FASE 4: Identificando conteúdo viral")
@@ -252,46 +286,48 @@ class RealSearchOrchestrator:
                 search_results['screenshots_captured'] = screenshots
                 self.session_stats['screenshots_captured'] = len(screenshots)
 
-            # Calcula estatísticas finais
-            search_duration = time.time() - start_time
-            all_results = search_results['web_results'] + search_results['social_results'] + search_results['youtube_results']
-            unique_urls = list(set(r.get('url', '') for r in all_results if r.get('url')))
+            # Calcula estatísticas finais e aplica a VALIDAÇÃO ANTI-SIMULAÇÃO numa única passada
+            search_duration = time.perf_counter() - start_time
+            total_sources = 0
+            content_extracted = 0
+            unique_urls = set()
+            final_count = 0
+
+            for chave in ('web_results', 'social_results', 'youtube_results'):
+                reais = []
+                for result in search_results[chave]:
+                    url = result.get('url', '')
+                    content = result.get('content', '')
+                    unique_urls.add(_url_canonica(url))
+                    content_extracted += len(content)
+
+                    # Remove qualquer resultado que pareça ser exemplo/simulação (sem copiar o conteúdo com lower())
+                    if not (_PALAVRAS_SIMULACAO.search(result.get('title', '')) or
+                            _PALAVRAS_SIMULACAO.search(url) or
+                            _PALAVRAS_SIMULACAO.search(content)):
+                        reais.append(result)
+
+                total_sources += len(search_results[chave])
+                final_count += len(reais)
+                search_results[chave] = reais
+
+            unique_urls.discard('')
 
             search_results['statistics'].update({
-                'total_sources': len(all_results),
+                'total_sources': total_sources,
                 'unique_urls': len(unique_urls),
-                'content_extracted': sum(len(r.get('content', '')) for r in all_results),
+                'content_extracted': content_extracted,
                 'api_calls_made': sum(self.session_stats['api_rotations'].values()),
                 'search_duration': search_duration
             })
 
-            # VALIDAÇÃO ANTI-SIMULAÇÃO: Remove qualquer resultado que pareça ser exemplo
-            real_results = []
-            for result in all_results:
-                title = result.get('title', '').lower()
-                content = result.get('content', '').lower()
-                url = result.get('url', '').lower()
-
-                # Filtra dados que parecem ser exemplos/simulação
-                if not any(word in title + content + url for word in [
-                    'exemplo', 'sample', 'test', 'mock', 'demo', 'placeholder',
-                    'lorem ipsum', 'fake', 'dummy', 'template'
-                ]):
-                    real_results.append(result)
-
-            # Atualiza com apenas dados reais
-            search_results['web_results'] = [r for r in search_results['web_results'] if r in real_results]
-            search_results['social_results'] = [r for r in search_results['social_results'] if r in real_results]
-            search_results['youtube_results'] = [r for r in search_results['youtube_results'] if r in real_results]
-
-            final_count = len(real_results)
-            filtered_count = len(all_results) - final_count
-
-            logger.info(f"✅ BUSCA 100% REAL CONCLUÍDA em {search_duration:.2f}s")
-            logger.info(f"📊 {final_count} resultados REAIS de {len(search_results['providers_used'])} provedores")
-            logger.info(f"🗑️ {filtered_count} resultados simulados/exemplo REMOVIDOS")
-            logger.info(f"📸 {len(search_results['screenshots_captured'])} screenshots REAIS capturados")
-            logger.info(f"🔥 GARANTIA: 100% DADOS REAIS - ZERO SIMULAÇÃO")
+            filtered_count = total_sources - final_count
+
+            logger.info("✅ BUSCA 100%% REAL CONCLUÍDA em %.2fs", search_duration)
+            logger.info("📊 %s resultados REAIS de %s provedores", final_count, len(search_results['providers_used']))
+            logger.info("🗑️ %s resultados simulados/exemplo REMOVIDOS", filtered_count)
+            logger.info("📸 %s screenshots REAIS capturados", len(search_results['screenshots_captured']))
+            logger.info("🔥 GARANTIA: 100% DADOS REAIS - ZERO SIMULAÇÃO")
 
             return search_results
 
@@ -300,6 +336,44 @@ class RealSearchOrchestrator:
             self._salvar_erro('massive_search_error', {'error': str(e)})
             raise
 
+    @staticmethod
+    async def _com_limite(sem: asyncio.Semaphore, coro):
+        """Aguarda a corrotina de um provedor ocupando uma vaga do semáforo"""
+        async with sem:
+            return await coro
+
+    async def _com_cache(self, chave: tuple, buscar) -> Dict[str, Any]:
+        """Reaproveita o resultado bem-sucedido de um provedor para a mesma chave dentro do TTL"""
+        with self._cache_lock:
+            item = self._cache_resultados.get(chave)
+            if item and time.monotonic() - item[0] < _CACHE_TTL:
+                self._cache_resultados.move_to_end(chave)
+                logger.debug("♻️ Cache de busca reaproveitado: %s", chave[0])
+                return item[1]
+
+        resultado = await buscar()
+
+        if isinstance(resultado, dict) and resultado.get('success'):
+            with self._cache_lock:
+                self._cache_resultados[chave] = (time.monotonic(), resultado)
+                self._cache_resultados.move_to_end(chave)
+                while len(self._cache_resultados) > _CACHE_MAX:
+                    self._cache_resultados.popitem(last=False)
+        return resultado
+
+    @staticmethod
+    def _anexar_sem_duplicatas(search_results: Dict[str, Any], chave: str, resultados: List[Dict[str, Any]], vistos: Dict[str, set]):
+        """Anexa resultados à categoria pulando URLs já vistas nela (itens sem URL são mantidos)"""
+        destino = search_results[chave]
+        vistas = vistos[chave]
+        for result in resultados:
+            url = _url_canonica(result.get('url'))
+            if url:
+                if url in vistas:
+                    continue
+                vistas.add(url)
+            destino.append(result)
+
     async def _search_alibaba_websailor(self, query: str, context: Dict[str, Any], session_id: str = None) -> Dict[str, Any]:
         """Busca REAL usando Alibaba WebSailor Agent"""
         try:
@@ -342,7 +416,7 @@ class RealSearchOrchestrator:
                     'insights': fonte.get('insights_extraidos', [])  # INSIGHTS REAIS
                 })
 
-            logger.info(f"✅ Alibaba WebSailor processado com {len(results)} resultados")
+            logger.info("✅ Alibaba WebSailor processado com %s resultados", len(results))
 
             return {
                 'success': True,
@@ -421,9 +495,9 @@ class RealSearchOrchestrator:
                                         # Extrai e salva o conteúdo
                                         results = self._extract_search_results_from_content(content, 'firecrawl', session_id, url)
                                         all_results.extend(results)
-                                        logger.info(f"✅ FIRECRAWL extraiu {len(content)} chars de {url}")
+                                        logger.info("✅ FIRECRAWL extraiu %s chars de %s", len(content), url)
                                     else:
-                                        logger.debug(f"⚠️ Conteúdo insuficiente de {url}: {len(content) if content else 0} chars")
+                                        logger.debug("⚠️ Conteúdo insuficiente de %s: %s chars", url, len(content) if content else 0)
                                 else:
                                     logger.warning(f"⚠️ Erro ao fazer scrape de {url}: {scrape_response.status}")
                         except Exception as e:
@@ -941,9 +1015,10 @@ class RealSearchOrchestrator:
             logger.warning(f"⚠️ Conteúdo vazio recebido de {provider}")
             return results
 
-        # Divide o conteúdo em seções reais
+        # Divide o conteúdo em seções reais; títulos inválidos são descartados já ao fechar a seção
         lines = content.split('\n')
         current_result = {}
+        titulo_valido = False
 
         for line in lines:
             line = line.strip()
@@ -960,10 +1035,11 @@ class RealSearchOrchestrator:
                 'exemplo' not in line.lower()):
 
                 # Salva resultado anterior se existir
-                if current_result.get('title'):
+                if titulo_valido:
                     results.append(current_result)
 
-                # Inicia novo resultado com dados reais
+                # Inicia novo resultado com dados reais (a seção segue absorvendo URL/descrição mesmo se inválida)
+                titulo_valido = not _PALAVRAS_TITULO_INVALIDO.search(line)
                 current_result = {
                     'title': line,
                     'url': '',
@@ -980,20 +1056,15 @@ class RealSearchOrchestrator:
 
             # Detecta descrições reais (linhas médias)
             elif 50 <= len(line) <= 200 and current_result:
-                if not any(word in line.lower() for word in ['exemplo', 'sample', 'test', 'mock']):
+                if not _PALAVRAS_SNIPPET_INVALIDO.search(line):
                     current_result['snippet'] = line
 
         # Adiciona último resultado real
-        if current_result.get('title'):
+        if titulo_valido:
             results.append(current_result)
 
-        # Filtra APENAS resultados reais válidos
-        valid_results = []
-        for result in results:
-            title = result.get('title', '')
-            if (title and len(title) > 10 and
-                not any(word in title.lower() for word in ['exemplo', 'sample', 'test', 'mock', 'demo'])):
-                valid_results.append(result)
+        # Títulos têm mais de 20 caracteres e já foram validados na extração
+        valid_results = results
 
         # NOVA FUNCIONALIDADE: Salva trechos de conteúdo extraído (com deduplicação)
         if session_id and valid_results:
@@ -1008,18 +1079,18 @@ class RealSearchOrchestrator:
                         unique_results.append(result)
 
                 if unique_results:
-                    logger.info(f"🔍 Salvando {len(unique_results)} resultados únicos de {provider} (removidas {len(valid_results) - len(unique_results)} duplicatas)")
+                    logger.info("🔍 Salvando %s resultados únicos de %s (removidas %s duplicatas)", len(unique_results), provider, len(valid_results) - len(unique_results))
                     for i, result in enumerate(unique_results):
                         # Calcula score de qualidade baseado no tamanho e completude do conteúdo
                         title = result.get('title', '')
                         snippet = result.get('snippet', '')
                         url = result.get('url', '') or source_url or ''
 
-                        logger.info(f"📝 Resultado {i+1}: title={len(title)} chars, snippet={len(snippet)} chars, url={url[:50]}...")
+                        logger.info("📝 Resultado %s: title=%s chars, snippet=%s chars, url=%s...", i+1, len(title), len(snippet), url[:50])
 
                         # Apenas salva se tiver URL real - NÃO GERA URLs DE EXEMPLO
                         if not url or not url.startswith('http') or 'example.com' in url:
-                            logger.debug(f"🔍 URL inválida ignorada (evitando spam): {url[:30]}...")
+                            logger.debug("🔍 URL inválida ignorada (evitando spam): %s...", url[:30])
                             continue
 
                         # Conteúdo completo para salvar
@@ -1035,12 +1106,12 @@ class RealSearchOrchestrator:
                             quality_score += 30.0
 
                         # Bonus por relevância ao nicho
-                        if any(keyword in (title + snippet).lower() for keyword in ['patchwork', 'costura', 'quilting', 'artesanato']):
+                        if _PALAVRAS_NICHO.search(title) or _PALAVRAS_NICHO.search(snippet):
                             quality_score += 20.0
 
                         # Log apenas se score for significativo
                         if quality_score >= 50.0:
-                            logger.info(f"💯 Quality score: {quality_score} - {title[:50]}...")
+                            logger.info("💯 Quality score: %s - %s...", quality_score, title[:50])
 
                         # Salva APENAS se for dados reais válidos - ZERO SIMULAÇÃO
                         if (quality_score >= 30.0 and url and url.startswith('http') and
@@ -1071,7 +1142,7 @@ class RealSearchOrchestrator:
                             except Exception as save_error:
                                 logger.error(f"❌ Erro ao salvar resultado REAL {i+1}: {save_error}")
                         else:
-                            logger.debug(f"🔍 Dados rejeitados (qualidade baixa): título={len(title)} chars")
+                            logger.debug("🔍 Dados rejeitados (qualidade baixa): título=%s chars", len(title))
 
             except Exception as e:
                 logger.error(f"❌ Erro ao salvar trechos de {provider}: {e}")
@@ -1102,11 +1173,85 @@ class RealSearchOrchestrator:
                 viral_content.append(content)
                 seen_urls.add(url)
 
-        logger.info(f"🔥 {len(viral_content)} conteúdos virais identificados")
+        logger.info("🔥 %s conteúdos virais identificados", len(viral_content))
         return viral_content
 
     async def _capture_viral_screenshots(self, viral_content: List[Dict[str, Any]], session_id: str) -> List[Dict[str, Any]]:
-        """Captura screenshots do conteúdo viral usando Selenium"""
+        """Captura screenshots do conteúdo viral com Playwright, várias abas em paralelo"""
+
+        try:
+            from playwright.async_api import async_playwright
+        except ImportError:
+            # Selenium é síncrono: roda numa thread para não travar o loop
+            return await asyncio.to_thread(self._capture_viral_screenshots_selenium, viral_content, session_id)
+
+        screenshots_dir = f"analyses_data/files/{session_id}"
+        os.makedirs(screenshots_dir, exist_ok=True)
+
+        try:
+            sem = asyncio.Semaphore(_MAX_PARALLEL_PAGES)
+            async with async_playwright() as p:
+                browser = await p.chromium.launch(
+                    headless=True,
+                    args=['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu']
+                )
+                try:
+                    # Um único contexto compartilhado por todas as abas da sessão
+                    context = await browser.new_context(viewport={'width': 1920, 'height': 1080})
+                    capturas = await asyncio.gather(*(
+                        self._capturar_pagina(context, sem, i, content, screenshots_dir)
+                        for i, content in enumerate(viral_content, 1)
+                    ))
+                finally:
+                    await browser.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Playwright indisponível para screenshots ({e}) - usando Selenium")
+            return await asyncio.to_thread(self._capture_viral_screenshots_selenium, viral_content, session_id)
+
+        return [captura for captura in capturas if captura]
+
+    async def _capturar_pagina(self, context, sem: asyncio.Semaphore, i: int, content: Dict[str, Any], screenshots_dir: str) -> Optional[Dict[str, Any]]:
+        """Captura o screenshot de um conteúdo viral numa aba própria do contexto compartilhado"""
+        url = content.get('url', '')
+        if not url:
+            return None
+
+        async with sem:
+            page = await context.new_page()
+            try:
+                logger.info("📸 Capturando screenshot %s/10: %s", i, content.get('title', 'Sem título'))
+
+                await page.goto(url, wait_until='domcontentloaded', timeout=15000)
+
+                # Aguarda renderização completa
+                await asyncio.sleep(3)
+
+                screenshot_path = f"{screenshots_dir}/viral_content_{i:02d}.png"
+                await page.screenshot(path=screenshot_path)
+
+                if os.path.exists(screenshot_path) and os.path.getsize(screenshot_path) > 0:
+                    logger.info("✅ Screenshot %s capturado: %s", i, screenshot_path)
+                    return {
+                        'content_data': content,
+                        'screenshot_path': screenshot_path,
+                        'filename': f"viral_content_{i:02d}.png",
+                        'url': url,
+                        'title': content.get('title', ''),
+                        'platform': content.get('platform', ''),
+                        'viral_score': content.get('viral_score', 0),
+                        'captured_at': datetime.now().isoformat()
+                    }
+
+                logger.warning(f"⚠️ Falha ao capturar screenshot {i}")
+            except Exception as e:
+                logger.error(f"❌ Erro ao capturar screenshot {i}: {e}")
+            finally:
+                await page.close()
+
+        return None
+
+    def _capture_viral_screenshots_selenium(self, viral_content: List[Dict[str, Any]], session_id: str) -> List[Dict[str, Any]]:
+        """Captura screenshots do conteúdo viral usando Selenium (reserva sem Playwright)"""
 
         screenshots = []
 
@@ -1158,7 +1303,7 @@ class RealSearchOrchestrator:
                         if not url:
                             continue
 
-                        logger.info(f"📸 Capturando screenshot {i}/10: {content.get('title', 'Sem título')}")
+                        logger.info("📸 Capturando screenshot %s/10: %s", i, content.get('title', 'Sem título'))
 
                         # Acessa a URL
                         driver.get(url)
@@ -1188,7 +1333,7 @@ class RealSearchOrchestrator:
                                 'captured_at': datetime.now().isoformat()
                             })
 
-                            logger.info(f"✅ Screenshot {i} capturado: {screenshot_path}")
+                            logger.info("✅ Screenshot %s capturado: %s", i, screenshot_path)
                         else:
                             logger.warning(f"⚠️ Falha ao capturar screenshot {i}")
 
@@ -242,7 +242,7 @@ class VisualContentCapture:
                 # Download com validação de tamanho
                 total_size = 0
                 with open(image_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
+                    for chunk in response.iter_content(chunk_size=65536):
                         if chunk:  # Filter out keep-alive chunks
                             f.write(chunk)
                             total_size += len(chunk)